@@ -1,6 +1,6 @@
 import { getRequestConfig } from 'next-intl/server';
 import { cookies } from 'next/headers';
-import { locales, defaultLocale, type Locale } from '@/lib/i18n-config';
+import { locales, defaultLocale, mergeMessages, type Locale } from '@/lib/i18n-config';
 
 export default getRequestConfig(async () => {
   const cookieStore = await cookies();
@@ -10,8 +10,14 @@ export default getRequestConfig(async () => {
       ? (cookieLocale as Locale)
       : defaultLocale;
 
+  // Shared core strings plus this portal's own (generated by web-portal/_i18n_core.py)
+  const [core, own] = await Promise.all([
+    import(`../messages/core/${locale}.json`),
+    import(`../messages/${locale}.json`),
+  ]);
+
   return {
     locale,
-    messages: (await import(`../messages/${locale}.json`)).default,
+    messages: mergeMessages(core.default, own.default),
   };
 });
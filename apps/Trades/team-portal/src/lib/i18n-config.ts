@@ -29,3 +29,16 @@ export const localeFlags: Record<Locale, string> = {
   vi: 'VN',
   tl: 'PH',
 };
+
+export type Messages = { [key: string]: string | Messages };
+
+// Deep-merges a portal's own messages over the shared core (messages/core, see _i18n_core.py)
+export function mergeMessages(core: Messages, overlay: Messages): Messages {
+  const merged: Messages = { ...core };
+  for (const [key, value] of Object.entries(overlay)) {
+    const base = merged[key];
+    merged[key] =
+      typeof value === 'object' && typeof base === 'object' ? mergeMessages(base, value) : value;
+  }
+  return merged;
+}
@@ -0,0 +1,111 @@
+/**
+ * Translation lookup benchmark — replays real per-route key traces.
+ *
+ * Fixtures come from `python _i18n_bench.py` (.i18n-cache/bench/lookup.json):
+ * every t() call site of each web-portal route, in render order, plus the
+ * nested catalogs and the compiled flat / split / delta bundles for one
+ * locale. Run with `npm run i18n:bench`; without fixtures the suite is skipped.
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { bench, describe } from 'vitest';
+import {
+  type FlatDict,
+  type TranslationDict,
+  applyDelta,
+  compileDict,
+  flattenDict,
+  format,
+  interpolate,
+  lookup,
+  resolve,
+  withFallback,
+} from '@/lib/translations/runtime';
+
+interface RouteTrace {
+  route: string;
+  files: number;
+  calls: number;
+  keys: string[];
+}
+
+interface LookupFixture {
+  version: number;
+  locale: string;
+  shaken: boolean;
+  routes: RouteTrace[];
+  catalogs: Record<string, TranslationDict>;
+  flat: FlatDict;
+  split: Record<string, FlatDict>;
+  base: FlatDict;
+  delta: FlatDict;
+}
+
+const FIXTURE = path.resolve(__dirname, '../.i18n-cache/bench/lookup.json');
+const fixture: LookupFixture | null = fs.existsSync(FIXTURE)
+  ? JSON.parse(fs.readFileSync(FIXTURE, 'utf-8'))
+  : null;
+
+// ── One t() call per strategy ──
+type Lookup = (key: string) => string;
+
+function strategies(f: LookupFixture): Record<string, Lookup> {
+  const en = f.catalogs.en;
+  const loc = f.catalogs[f.locale];
+  const full = applyDelta(f.base, f.delta);
+  return {
+    // Pre-bundle runtime: walk the nested locale, then English, then regex interpolation
+    'nested resolve() + fallback': key => interpolate(resolve(loc, key) || resolve(en, key) || key),
+    'flat bundle': key => format(lookup(f.flat, key)),
+    'split per namespace': key => {
+      const chunk = f.split[key.slice(0, key.indexOf('.'))];
+      return format(chunk?.[key] ?? key);
+    },
+    'delta folded once (applyDelta)': key => format(lookup(full, key)),
+    'delta over base, per lookup': key => format(f.delta[key] ?? f.base[key] ?? key),
+  };
+}
+
+function replay(keys: string[], t: Lookup): number {
+  let n = 0;
+  for (const key of keys) n += t(key).length;
+  return n;
+}
+
+describe.skipIf(!fixture)('translation lookup (run `python _i18n_bench.py` first)', () => {
+  const f = fixture as LookupFixture;
+  const all = f.routes.flatMap(r => r.keys);
+  const heaviest = f.routes[0];
+  const t = strategies(f);
+
+  describe(`all routes: ${all.length} lookups, ${f.locale}`, () => {
+    for (const [name, fn] of Object.entries(t)) bench(name, () => void replay(all, fn));
+  });
+
+  describe(`heaviest route ${heaviest.route}: ${heaviest.calls} lookups`, () => {
+    for (const [name, fn] of Object.entries(t)) bench(name, () => void replay(heaviest.keys, fn));
+  });
+
+  // What each shape costs once per locale load, before the first lookup
+  describe(`load ${f.locale}`, () => {
+    const flatText = JSON.stringify(f.flat);
+    const baseText = JSON.stringify(f.base);
+    const deltaText = JSON.stringify(f.delta);
+    const enText = JSON.stringify(f.catalogs.en);
+    const locText = JSON.stringify(f.catalogs[f.locale]);
+
+    bench('nested catalogs: flatten + fallback + compile', () => {
+      compileDict(withFallback(flattenDict(JSON.parse(locText)), flattenDict(JSON.parse(enText))));
+    });
+    bench('flat bundle: parse', () => {
+      JSON.parse(flatText);
+    });
+    bench('delta bundle: parse + applyDelta (English cached)', () => {
+      applyDelta(f.base, JSON.parse(deltaText));
+    });
+    bench('delta bundle: parse both + applyDelta', () => {
+      applyDelta(JSON.parse(baseText), JSON.parse(deltaText));
+    });
+  });
+});
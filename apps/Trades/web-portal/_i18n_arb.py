@@ -0,0 +1,256 @@
+"""
+Generate the Flutter app's ARB files (apps/Trades/lib/l10n/app_*.arb) from
+the shared catalog.
+
+The ARB files used to be maintained by hand, apart from the web catalogs,
+although most of their strings ("Save", "Cancel", "Something went wrong")
+already exist there in every locale. Each ARB file now has two parts:
+
+  hand-written  the original messages (save, cancel, nItems, ...) whose names
+                do not map to a catalog key with the same English text
+                (navJobs does: nav.jobs is "Jobs" too). They are kept
+                verbatim with their metadata. A locale that lacks one gets the catalog's
+                translation of the same English text, if there is one.
+  catalog       every message name Dart code reads through
+                AppLocalizations.of(context)!.name, plus names already in
+                app_en.arb, when the name is arb_key() of a catalog key
+                (common.save -> commonSave; _i18n_wire.py writes these). The
+                template gets "@name" metadata: the catalog key as
+                description, and placeholders for {name} arguments. A locale
+                keeps the value its ARB file already has, so the mobile
+                translations are never replaced by the web wording (es
+                navJobs stays "Trabajos"). Only a missing message is filled
+                from the catalog for the locale; without a translation with
+                matching placeholders it is omitted and gen-l10n falls back
+                to English.
+
+ARB file suffixes map to catalog locales (pt -> pt-BR).
+
+Files are rewritten only when their bytes change. The hash of every input
+(catalogs, referenced names, ARB files) is stored in .i18n-cache/arb.json,
+so a run whose inputs match the last one stops after hashing. The ARB
+files then keep their mtimes, and Flutter's build sees no l10n change.
+
+--gen runs `flutter gen-l10n` only when the ARB files differ from the last
+generation.
+
+Usage:
+  python _i18n_arb.py             # update lib/l10n/app_*.arb
+  python _i18n_arb.py --check     # exit 1 if an ARB file is out of date
+  python _i18n_arb.py --gen       # update, then `flutter gen-l10n` if anything changed
+  python _i18n_arb.py --force     # ignore the input hash
+"""
+import argparse, hashlib, json, os, re, subprocess, sys, time
+
+from _i18n_bundles import PLACEHOLDER
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, locale_path, read_text, write_if_changed
+from _i18n_dart import ARB_DIR, arb_key
+
+# ARB file suffix -> catalog locale
+ARB_LOCALES = {'en': 'en', 'es': 'es', 'pt': 'pt-BR', 'pl': 'pl', 'zh': 'zh', 'ht': 'ht', 'ru': 'ru', 'ko': 'ko',
+               'vi': 'vi', 'tl': 'tl'}
+APP_DIR = os.path.dirname(ARB_DIR)
+STAMP_PATH = os.path.join('.i18n-cache', 'arb.json')
+STAMP_VERSION = 1
+DESCRIPTION = 'Catalog key {key}'
+MESSAGE_NAME = re.compile(r'^[a-z][A-Za-z0-9]*$')
+DART_REF = re.compile(r'AppLocalizations\.of\(\s*\w+\s*\)!?\.(\w+)')
+
+
+def arb_path(suffix, arb_dir=ARB_DIR):
+    return os.path.join(arb_dir, f'app_{suffix}.arb')
+
+
+def dart_refs(root=APP_DIR):
+    """Message names the Dart sources read through AppLocalizations.of(...)."""
+    names = set()
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d != 'l10n']
+        for fname in files:
+            if not fname.endswith('.dart'):
+                continue
+            with open(os.path.join(dirpath, fname), encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            if 'AppLocalizations' in text:
+                names.update(DART_REF.findall(text))
+    return names
+
+
+def catalog_names(en_flat):
+    """{ARB message name: catalog key} for every catalog key with a valid name."""
+    names = {}
+    for key in sorted(en_flat):
+        name = arb_key(key)
+        if MESSAGE_NAME.match(name):
+            names.setdefault(name, key)
+    return names
+
+
+def placeholder_meta(value):
+    meta = {}
+    for name in PLACEHOLDER.findall(value):
+        meta.setdefault(name, {'type': 'String'})
+    for name in re.findall(r'\{(\w+),\s*plural\s*,', value):
+        meta[name] = {'type': 'num'}
+    return meta
+
+
+def project(arbs, catalogs, refs):
+    """{suffix: ARB dict} from the current ARB files, catalogs and referenced names."""
+    template = arbs.get(SOURCE_LOCALE, {})
+    en_flat = catalogs[SOURCE_LOCALE]
+    by_name = catalog_names(en_flat)
+    # A hand-written name that happens to equal a catalog name is shared only if the English agrees
+    hand = [k for k in template if not k.startswith('@') and (k not in by_name or template[k] != en_flat[by_name[k]])]
+    shared = sorted(n for n in refs | set(template) if n in by_name and n not in hand)
+    by_text = {}
+    for key in sorted(en_flat, key=lambda k: (not k.startswith('common.'), len(k), k)):
+        by_text.setdefault(en_flat[key], key)
+
+    out = {}
+    for suffix, locale in ARB_LOCALES.items():
+        if suffix not in arbs and suffix != SOURCE_LOCALE:
+            continue
+        current, flat = arbs.get(suffix, {}), catalogs.get(locale, {})
+        data = {'@@locale': suffix}
+        for name in hand:
+            value = current.get(name)
+            if value is None and suffix != SOURCE_LOCALE:
+                key = by_text.get(template[name])
+                translated = flat.get(key) if key else None
+                if translated and translated != template[name]:
+                    value = translated
+            if value is not None:
+                data[name] = value
+            meta = template.get(f'@{name}') if suffix == SOURCE_LOCALE else None
+            if meta and str(meta.get('description', '')).startswith(DESCRIPTION.format(key='')):
+                meta = {k: v for k, v in meta.items() if k != 'description'}  # its catalog key is gone
+            if meta:
+                data[f'@{name}'] = meta
+        for name in shared:
+            key = by_name[name]
+            source = en_flat[key]
+            if suffix == SOURCE_LOCALE:
+                data[name] = source
+                meta = {'description': DESCRIPTION.format(key=key)}
+                placeholders = placeholder_meta(source)
+                if placeholders:
+                    meta['placeholders'] = placeholders
+                data[f'@{name}'] = meta
+                continue
+            value = current.get(name)  # an existing translation always wins
+            if not value:
+                value = flat.get(key)
+                if value and set(PLACEHOLDER.findall(value)) != set(PLACEHOLDER.findall(source)):
+                    value = None
+            if value:
+                data[name] = value
+        out[suffix] = data
+    return out
+
+
+def plan_files(refs, catalogs, arb_dir=ARB_DIR):
+    """{ARB path: text} for the given referenced names and flat catalogs."""
+    arbs = {}
+    for suffix in ARB_LOCALES:
+        text = read_text(arb_path(suffix, arb_dir))
+        if text is not None:
+            arbs[suffix] = json.loads(text)
+    return {arb_path(suffix, arb_dir): render(data) for suffix, data in project(arbs, catalogs, refs).items()}
+
+
+def render(data):
+    return json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+
+
+def _digest(parts):
+    h = hashlib.sha256(f'arb-v{STAMP_VERSION}'.encode('utf-8'))
+    for part in parts:
+        h.update(part.encode('utf-8') if isinstance(part, str) else part)
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+def inputs_digest(refs, trans_dir=TRANS_DIR, arb_dir=ARB_DIR):
+    parts = sorted(refs)
+    for loc in LOCALES:
+        parts.append(read_text(locale_path(loc, trans_dir)) or '')
+    return _digest(parts + [arbs_digest(arb_dir)])
+
+
+def arbs_digest(arb_dir=ARB_DIR):
+    return _digest([read_text(arb_path(s, arb_dir)) or '' for s in ARB_LOCALES])
+
+
+def load_stamp(path=STAMP_PATH):
+    stamp = json.loads(read_text(path) or '{}')
+    return stamp if stamp.get('version') == STAMP_VERSION else {'version': STAMP_VERSION}
+
+
+def export(check=False, force=False, trans_dir=TRANS_DIR, arb_dir=ARB_DIR, stamp_path=STAMP_PATH):
+    """Bring the ARB files up to date. Returns (paths changed or stale, skipped by hash)."""
+    refs = dart_refs(os.path.dirname(arb_dir))
+    stamp = load_stamp(stamp_path)
+    digest = inputs_digest(refs, trans_dir, arb_dir)
+    if not force and stamp.get('inputs') == digest:
+        return [], True
+
+    catalogs = {loc: flatten(load_locale(loc, trans_dir)) for loc in set(ARB_LOCALES.values())}
+    changed = []
+    for path, text in plan_files(refs, catalogs, arb_dir).items():
+        if check:
+            if read_text(path) != text:
+                changed.append(path)
+        elif write_if_changed(path, text):
+            changed.append(path)
+    if not check:
+        stamp['inputs'] = inputs_digest(refs, trans_dir, arb_dir)
+        write_if_changed(stamp_path, json.dumps(stamp, indent=2) + '\n', durable=False)
+    return changed, False
+
+
+def generate(app_dir=os.path.dirname(APP_DIR), arb_dir=ARB_DIR, stamp_path=STAMP_PATH, force=False):
+    """Run `flutter gen-l10n` unless the ARB files match the last generation. Returns (ran, returncode)."""
+    stamp = load_stamp(stamp_path)
+    digest = arbs_digest(arb_dir)
+    if not force and stamp.get('generated') == digest:
+        return False, 0
+    try:
+        result = subprocess.run(['flutter', 'gen-l10n'], cwd=app_dir)
+    except OSError as e:
+        print(f'flutter gen-l10n: {e}', file=sys.stderr)
+        return True, 1
+    if result.returncode == 0:
+        stamp['generated'] = digest
+        write_if_changed(stamp_path, json.dumps(stamp, indent=2) + '\n', durable=False)
+    return True, result.returncode
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Generate lib/l10n/app_*.arb from the shared catalog.')
+    ap.add_argument('--check', action='store_true', help='report stale ARB files instead of writing them')
+    ap.add_argument('--gen', action='store_true', help='run flutter gen-l10n when the ARB files changed')
+    ap.add_argument('--force', action='store_true', help='ignore the stored input and generation hashes')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    changed, skipped = export(check=args.check, force=args.force)
+    elapsed = time.perf_counter() - started
+    if skipped:
+        print(f'ARB inputs unchanged; nothing to do ({elapsed:.2f}s)')
+    else:
+        verb = 'out of date' if args.check else 'written'
+        print(f'{len(changed)} ARB file(s) {verb} in {elapsed:.2f}s')
+        for path in changed:
+            print(f'  {path}')
+    if args.check:
+        return 1 if changed else 0
+    if args.gen:
+        ran, code = generate(force=args.force)
+        print('flutter gen-l10n ' + ('failed' if code else 'done' if ran else 'skipped: ARB files unchanged'))
+        return code
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
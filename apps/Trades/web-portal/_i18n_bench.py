@@ -0,0 +1,121 @@
+"""
+Fixtures for the translation lookup benchmark
+(__tests__/translations-lookup.bench.ts).
+
+A loader or lookup change (nested vs flat vs per-namespace vs delta bundles)
+should be decided on the portal's real workload, not on synthetic keys.
+This writes .i18n-cache/bench/lookup.json with:
+
+  routes    one access trace per web-portal route: the layouts above the
+            page, the page and every component they import (the same
+            closure as _i18n_routes.py), in that order, and per file every
+            t('key') call site in line order. A key called from three places
+            is looked up three times. Keys only reached through a dynamic
+            t(x) appear once per file that spells them out. Missing keys stay
+            in the trace, since the runtime has to handle them too.
+            Heaviest route first.
+  catalogs  the nested en and <locale> catalogs (legacy resolve() path)
+  flat      the compiled full map for the locale (manifest "format": "flat")
+  split     the same map split per top-level namespace, as the chunks are
+  base,     the compiled English bundle and the locale's delta against it
+  delta     (manifest "format": "delta"; the loader runs applyDelta once)
+
+Values go through the same compilation as `_i18n_bundles.py` (English for
+placeholder mismatches, {name} templates pre-split). The fixtures are
+rebuilt from the key index in well under a second; the file is gitignored.
+
+Usage:
+  python _i18n_bench.py                  # es fixtures
+  python _i18n_bench.py --locale ru
+  python _i18n_bench.py --shake          # bundles without unreferenced keys
+  npm run i18n:bench                     # fixtures, then vitest bench
+"""
+import argparse, json, os, sys, time
+
+from _i18n_bundles import compile_value, delta_against, runtime_map, split_namespaces
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, write_if_changed
+from _i18n_index import KeyIndex
+from _i18n_refs import used_keys
+from _i18n_routes import pages, route_of, route_files
+
+BENCH_PATH = os.path.join('.i18n-cache', 'bench', 'lookup.json')
+FIXTURE_VERSION = 1
+
+
+def file_trace(refs, strings, catalog_keys):
+    """Keys one file looks up while rendering: call sites in line order, then indirect keys."""
+    literal = sorted((r for r in refs if r.kind == 'literal'), key=lambda r: r.line)
+    keys = [r.key for r in literal]
+    called = set(keys)
+    keys += sorted(s for s in strings if s in catalog_keys and s not in called)
+    return keys
+
+
+def route_traces(index, catalog_keys):
+    """[{route, files, calls, keys}] for every web-portal page, most calls first."""
+    per_file = index.by_file(['web'])
+    imports = index.imports()
+    traces = []
+    for page in pages(per_file):
+        files = route_files(page, per_file, imports)
+        keys = []
+        for path in files:
+            refs, strings = per_file.get(path, ((), ()))
+            keys += file_trace(refs, strings, catalog_keys)
+        if keys:
+            traces.append({'route': route_of(page), 'files': len(files), 'calls': len(keys), 'keys': keys})
+    traces.sort(key=lambda t: (-t['calls'], t['route']))
+    return traces
+
+
+def variants(locale, trans_dir=TRANS_DIR, keep=None):
+    """The nested catalogs and the compiled flat / split / delta bundles for one locale."""
+    nested = {SOURCE_LOCALE: load_locale(SOURCE_LOCALE, trans_dir), locale: load_locale(locale, trans_dir)}
+    en_flat, flat = flatten(nested[SOURCE_LOCALE]), flatten(nested[locale])
+    if keep is not None:
+        en_flat = {k: v for k, v in en_flat.items() if k in keep}
+        flat = {k: v for k, v in flat.items() if k in keep}
+    merged, _ = runtime_map(flat, en_flat)
+    compiled = {k: compile_value(v) for k, v in merged.items()}
+    return {
+        'catalogs': nested,
+        'flat': compiled,
+        'split': split_namespaces(compiled),
+        'base': {k: compile_value(v) for k, v in en_flat.items()},
+        'delta': {k: compile_value(v) for k, v in delta_against(merged, en_flat).items()},
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Write lookup benchmark fixtures from real key-usage traces.')
+    ap.add_argument('--locale', default='es', choices=[l for l in LOCALES if l != SOURCE_LOCALE])
+    ap.add_argument('--shake', action='store_true', help='drop unreferenced keys from the bundles, like --shake')
+    ap.add_argument('--out', default=BENCH_PATH)
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    catalog_keys = set(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+    index = KeyIndex()
+    index.update(['web'])
+    traces = route_traces(index, catalog_keys)
+    keep = used_keys(catalog_keys, *index.refs(['web'])) if args.shake else None
+    index.close()
+
+    fixture = {'version': FIXTURE_VERSION, 'locale': args.locale, 'shaken': keep is not None, 'routes': traces}
+    fixture.update(variants(args.locale, keep=keep))
+    write_if_changed(args.out, json.dumps(fixture, ensure_ascii=False, separators=(',', ':')), durable=False)
+
+    calls = sum(t['calls'] for t in traces)
+    distinct = {k for t in traces for k in t['keys']}
+    missing = len(distinct - set(fixture['flat']))
+    print(f"{len(traces)} route traces, {calls} lookups of {len(distinct)} distinct keys "
+          f"({missing} not in the bundle) -> {args.out}")
+    for t in traces[:5]:
+        print(f"  {t['calls']:5d}  {t['route']} ({t['files']} files)")
+    print(f"{args.locale}: flat {len(fixture['flat'])} keys, {len(fixture['split'])} namespaces, "
+          f"delta {len(fixture['delta'])} of {len(fixture['base'])} ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
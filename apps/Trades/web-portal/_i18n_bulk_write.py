@@ -0,0 +1,128 @@
+"""
+Apply one change set to any subset of the locale catalogs in a single pass.
+
+Generalizes _translate_round7_es.py (which merged hand-written dicts into
+es.json only). A change set maps locale -> keys, either flat dot-paths or
+nested namespaces, and a null value deletes the key:
+
+  {
+    "es":    {"common": {"own": "Propio"}, "settings.displayName": "Nombre visible"},
+    "pt-BR": {"common.own": "Proprio"},
+    "pl":    {"estimates.mat": null}
+  }
+
+Each affected locale file is parsed once, all of its changes are applied, and
+it is written atomically (temp file + rename) only if its bytes changed.
+Locales not named in the change set are never opened. By default the file is
+patched in place (see _i18n_json.py) so the diff is exactly the changed keys;
+--canonical rewrites it in sorted order instead.
+
+Usage:
+  python _i18n_bulk_write.py changes.json [more.json ...]
+  python _i18n_bulk_write.py - < changes.json
+  python _i18n_bulk_write.py changes.json --dry-run
+"""
+import argparse, json, sys
+
+from _i18n_catalog import LOCALES, TRANS_DIR, delete_path, get_path, locale_path, read_text, set_path, write_if_changed
+from _i18n_json import canonical_dumps, patch_text
+
+
+def flatten_changes(d, prefix=''):
+    """Like flatten(), but keeps None leaves (deletions) and rejects non-string values."""
+    flat = {}
+    for k, v in d.items():
+        path = f'{prefix}{k}'
+        if isinstance(v, dict):
+            flat.update(flatten_changes(v, path + '.'))
+        elif v is None or isinstance(v, str):
+            flat[path] = v
+        else:
+            raise ValueError(f"'{path}': expected a string, null or namespace, got {type(v).__name__}")
+    return flat
+
+
+def merge_change_sets(change_sets):
+    """Combine change sets into {locale: {key: value}}; later sets win."""
+    merged = {}
+    for cs in change_sets:
+        for loc, changes in cs.items():
+            if loc not in LOCALES:
+                raise ValueError(f"unknown locale '{loc}'")
+            merged.setdefault(loc, {}).update(flatten_changes(changes))
+    return merged
+
+
+def apply_changes(changes, trans_dir=TRANS_DIR, dry_run=False, canonical=False, staged=None):
+    """Apply {locale: {key: value-or-None}} and return per-locale results.
+
+    With a `staged` dict, new file texts are collected there ({path: text})
+    instead of written, for a caller that writes them in one transaction.
+    """
+    results = {}
+    for loc, flat in changes.items():
+        path = locale_path(loc, trans_dir)
+        old_text = read_text(path)
+        data = json.loads(old_text) if old_text else {}
+        r = {'set': 0, 'deleted': 0, 'unchanged': 0, 'written': False}
+        effective = {}
+        for key, value in flat.items():
+            if value is None:
+                if not delete_path(data, key):
+                    r['unchanged'] += 1
+                    continue
+                r['deleted'] += 1
+            elif get_path(data, key) == value:
+                r['unchanged'] += 1
+                continue
+            else:
+                set_path(data, key, value)
+                r['set'] += 1
+            effective[key] = value
+        if effective and not dry_run:
+            if canonical or old_text is None:
+                text = canonical_dumps(data)
+            else:
+                text = patch_text(old_text, effective)[0]
+            if staged is not None:
+                r['written'] = text != old_text
+                if r['written']:
+                    staged[path] = text
+            else:
+                r['written'] = write_if_changed(path, text)
+        results[loc] = r
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Apply a multi-locale change set to src/lib/translations.')
+    ap.add_argument('files', nargs='+', help="change-set JSON files ('-' for stdin)")
+    ap.add_argument('--dry-run', action='store_true')
+    ap.add_argument('--canonical', action='store_true', help='rewrite touched files in sorted key order')
+    args = ap.parse_args(argv)
+
+    change_sets = []
+    for path in args.files:
+        if path == '-':
+            change_sets.append(json.load(sys.stdin))
+        else:
+            with open(path, encoding='utf-8') as f:
+                change_sets.append(json.load(f))
+    try:
+        changes = merge_change_sets(change_sets)
+        results = apply_changes(changes, dry_run=args.dry_run, canonical=args.canonical)
+    except ValueError as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+
+    for loc in LOCALES:
+        if loc not in results:
+            continue
+        r = results[loc]
+        state = 'written' if r['written'] else ('dry run' if args.dry_run and (r['set'] or r['deleted']) else 'unchanged')
+        print(f"{loc:6s} set {r['set']:4d}  deleted {r['deleted']:3d}  same {r['unchanged']:4d}  -> {state}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
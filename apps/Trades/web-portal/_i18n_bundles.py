@@ -0,0 +1,361 @@
+"""
+Locale bundle compiler.
+
+Compiles src/lib/translations/<locale>.json into flat, dot-keyed bundles
+({"books.cashBalance": "Cash Balance"}), so the runtime t() is a single
+property lookup. Each bundle is also split per top-level namespace (common,
+books, jobs, propertyManagement, ...) so a loader can fetch only the
+namespaces a route needs.
+
+The English bundle is complete. Every other locale is written as a delta
+against it: only entries whose text differs from English are shipped. Keys
+the locale has not translated, and keys whose translation is the English
+text (product names, codes, or whatever else _same-as-en.json marks as
+intentional), are left out. Loader contract (manifest "format": "delta"):
+the full map for a locale is {...en, ...delta}, built once per locale load,
+after which t() is again one lookup. --no-delta writes the old merged
+bundles ("format": "flat") instead.
+
+Values are pre-parsed so the runtime never runs a regex: strings without
+placeholders stay strings, and "Hello {name}!" becomes the token array
+["Hello ", "name", "!"] (literal, param, literal, ... always odd length).
+Every translation must use the same {placeholder} set as English. A value
+that does not is reported and replaced by the English text in the bundle, and
+--strict turns any mismatch into a failed build.
+
+Output goes to public/locales (gitignored, rebuilt by `npm run i18n:build`):
+
+  public/locales/manifest.json                      asset manifest, never hashed
+  public/locales/<locale>.<hash>.json               whole flat bundle
+  public/locales/<locale>/<namespace>.<hash>.json   flat chunk, keys still "ns.key"
+  public/locales/routes.json                        route -> keys (_i18n_routes.py)
+
+Bundles and chunks are minified JSON, named by a hash of their bytes and
+accompanied by a gzip -9 sibling (<name>.json.gz) for servers and CDNs that
+serve precompressed files. A changed bundle gets a new name, so next.config.js
+marks /locales/* immutable and only manifest.json and routes.json revalidate.
+
+manifest.json:
+
+  {
+    "version": 4,
+    "format": "delta",
+    "shaken": false,
+    "defaultLocale": "en",
+    "locales": ["en", "es", ...],
+    "bundles": {"es": {"path": "es.1c9e0f3a2b.json", "bytes": 137512, "gzip": 41230, "keys": 3519}, ...},
+    "namespaces": {
+      "common": {
+        "en": {"path": "en/common.5be01d77c4.json", "bytes": 27012, "gzip": 8841, "keys": 1003},
+        "es": {...}
+      },
+      ...
+    }
+  }
+
+Every locale has every namespace; a delta chunk may be {}.
+
+--shake drops keys that no web-portal source references from the shipped
+bundles and chunks (see _i18n_refs.py; read through the incremental index in
+_i18n_index.py). src/lib/translations keeps every key, and the manifest
+records "shaken": true.
+
+Byte budgets in i18n-budgets.json cap the gzipped size of each locale bundle
+and of each namespace chunk ("*" is the default, named entries override it).
+A build that exceeds one prints the offenders and exits 1. `npm run build`
+runs i18n:build as its prebuild step, so an over-budget bundle fails the
+Next.js build in CI and deploys, which also ship the bundles. The budgets
+describe the `npm run i18n:build` output, so pass --no-budgets for ad-hoc
+builds with other flags.
+
+Pseudo-locale catalogs generated by _i18n_pseudo.py (en-XA, ar-XB) are
+only compiled with --pseudo (`npm run i18n:pseudo`), and are exempt from the
+budgets. A plain build, such as the prebuild step, leaves them out even when
+the catalogs are on disk, and removes pseudo bundles an earlier --pseudo
+build wrote, so they never ship.
+
+--history also appends the catalogs' sizes to the tracked
+i18n-size-history.jsonl when they changed (see _i18n_sizes.py). Plain builds
+never touch it, so a local build leaves no diff; record deliberately, e.g.
+with a catalog change.
+
+Only files whose bytes changed are rewritten, and bundles and chunks that no
+longer belong to the build are removed: those the previous manifest listed
+and hash-named files of a known locale. Anything else under --out is left
+alone. src/lib/translations/index.ts reads this manifest
+and falls back to the nested catalogs when it has not been built.
+
+Usage:
+  python _i18n_bundles.py
+  python _i18n_bundles.py --strict
+  python _i18n_bundles.py --shake
+  python _i18n_bundles.py --no-delta
+  python _i18n_bundles.py --shake --pseudo      # also en-XA / ar-XB, for local testing
+  python _i18n_bundles.py --out /tmp/locales --no-budgets
+"""
+import argparse, gzip, hashlib, json, os, re, sys, time
+
+from _i18n_catalog import LOCALES, PSEUDO_LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, locale_path, read_text, write_if_changed
+from _i18n_index import KeyIndex
+from _i18n_refs import used_keys
+from _i18n_sizes import record
+
+OUT_DIR = os.path.join('public', 'locales')
+MANIFEST = 'manifest.json'
+ROUTES = 'routes.json'  # written by _i18n_routes.py, kept by remove_stale
+BUDGETS = 'i18n-budgets.json'
+HASH_LEN = 10
+# <locale>.<hash>.json and <locale>/<namespace>.<hash>.json, plus .gz siblings
+HASHED = re.compile(r'^([\w-]+)(?:/[\w-]+)?\.[0-9a-f]{%d}\.json(?:\.gz)?$' % HASH_LEN)
+
+# Same pattern as interpolate() in src/lib/translations/runtime.ts
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+def compile_value(text):
+    """'Hi {name}!' -> ['Hi ', 'name', '!']; strings without placeholders are returned as-is."""
+    parts = PLACEHOLDER.split(text)
+    return text if len(parts) == 1 else parts
+
+
+def check_placeholders(flat, en_flat):
+    """[(key, english placeholders, locale placeholders)] for every mismatching value."""
+    issues = []
+    for key, value in flat.items():
+        source = en_flat.get(key)
+        if source is None:
+            continue
+        expected, found = set(PLACEHOLDER.findall(source)), set(PLACEHOLDER.findall(value))
+        if expected != found:
+            issues.append((key, sorted(expected), sorted(found)))
+    return issues
+
+
+def runtime_map(flat, en_flat):
+    """(full map the runtime serves, placeholder issues): English over mismatches, then as fallback."""
+    issues = check_placeholders(flat, en_flat)
+    if issues:
+        flat = dict(flat)
+        for key, _, _ in issues:
+            flat[key] = en_flat[key]
+    return merge_fallback(flat, en_flat), issues
+
+
+def merge_fallback(flat, en_flat):
+    """Locale values over English ones, in English key order (extra locale keys last).
+
+    Empty strings count as untranslated, matching the runtime's old
+    `resolve(dict) || resolve(enDict)` behaviour.
+    """
+    merged = dict(en_flat)
+    merged.update((k, v) for k, v in flat.items() if v)
+    return merged
+
+
+def delta_against(flat, en_flat):
+    """Entries of a merged locale map whose text differs from English."""
+    return {k: v for k, v in flat.items() if en_flat.get(k) != v}
+
+
+def split_namespaces(flat):
+    chunks = {}
+    for key, value in flat.items():
+        chunks.setdefault(key.split('.', 1)[0], {})[key] = value
+    return chunks
+
+
+def chunk_text(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def hashed_name(rel, data):
+    """'es/books.json' -> 'es/books.<sha256 prefix>.json'"""
+    stem, ext = os.path.splitext(rel)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LEN]}{ext}'
+
+
+def gzip_bytes(data):
+    # mtime=0 keeps the output byte-identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def check_budgets(manifest, budgets):
+    """[(what, gzip bytes, limit)] for every bundle or chunk over its budget (pseudo-locales exempt)."""
+    over = []
+    limits = budgets.get('bundles', {})
+    for loc, entry in manifest['bundles'].items():
+        if loc in PSEUDO_LOCALES:
+            continue
+        limit = limits.get(loc, limits.get('*'))
+        if limit is not None and entry['gzip'] > limit:
+            over.append((f'{loc} bundle', entry['gzip'], limit))
+    limits = budgets.get('namespaces', {})
+    for ns, per_loc in manifest['namespaces'].items():
+        limit = limits.get(ns, limits.get('*'))
+        for loc, entry in per_loc.items():
+            if limit is not None and entry['gzip'] > limit and loc not in PSEUDO_LOCALES:
+                over.append((f'{loc}/{ns}', entry['gzip'], limit))
+    return over
+
+
+def manifest_paths(out_dir):
+    """Bundle and chunk paths (with their .gz siblings) listed by the manifest in out_dir."""
+    try:
+        manifest = json.loads(read_text(os.path.join(out_dir, MANIFEST)) or '{}')
+    except ValueError:
+        return set()
+    entries = list(manifest.get('bundles', {}).values())
+    entries += [e for per_loc in manifest.get('namespaces', {}).values() for e in per_loc.values()]
+    return {p for e in entries for p in (e['path'], e['path'] + '.gz')}
+
+
+def remove_stale(out_dir, produced, previous=()):
+    """Delete bundles and chunks of earlier builds that this build did not produce.
+
+    --out can name any directory, so only build outputs are candidates: files
+    the previous manifest listed (`previous`) and files named like a bundle or
+    chunk of a known locale (HASHED). Directories emptied here go too.
+    """
+    known = set(LOCALES) | set(PSEUDO_LOCALES)
+    removed = 0
+    for root, dirs, files in os.walk(out_dir, topdown=False):
+        emptied = False
+        for fname in files:
+            path = os.path.join(root, fname)
+            rel = os.path.relpath(path, out_dir).replace(os.sep, '/')
+            m = HASHED.match(rel)
+            if rel not in produced and (rel in previous or (m and m.group(1) in known)):
+                os.unlink(path)
+                removed += 1
+                emptied = True
+        if emptied and root != out_dir and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+
+def referenced_keys(en_flat, portal='web'):
+    """(keys the portal's sources can reach, number of non-literal t() calls)."""
+    index = KeyIndex()
+    index.update([portal])
+    refs, strings = index.refs([portal])
+    index.close()
+    return used_keys(en_flat, refs, strings), sum(1 for r in refs if r.kind != 'literal')
+
+
+def build(locales=LOCALES, trans_dir=TRANS_DIR, out_dir=OUT_DIR, keep=None, delta=True):
+    """Write every bundle, chunk and the manifest. Returns (manifest, stats).
+
+    keep, when given, is the set of keys to ship; everything else is shaken out.
+    delta=False merges English into every locale bundle instead.
+    """
+    flats = {loc: flatten(load_locale(loc, trans_dir)) for loc in locales}
+    en_flat = flats.get(SOURCE_LOCALE) or flatten(load_locale(SOURCE_LOCALE, trans_dir))
+
+    stats = {'chunks': 0, 'written': 0, 'removed': 0, 'bytes': {}, 'placeholders': {}, 'shaken': 0, 'omitted': {}}
+    if keep is not None:
+        stats['shaken'] = sum(1 for k in en_flat if k not in keep)
+        en_flat = {k: v for k, v in en_flat.items() if k in keep}
+        flats = {loc: {k: v for k, v in flat.items() if k in keep} for loc, flat in flats.items()}
+    previous = manifest_paths(out_dir)
+    produced = {MANIFEST, ROUTES}
+    bundles, namespaces = {}, {}
+
+    def emit(rel, value):
+        data = chunk_text(value).encode('utf-8')
+        rel = hashed_name(rel, data)
+        packed = gzip_bytes(data)
+        for name, blob in ((rel, data), (rel + '.gz', packed)):
+            if write_if_changed(os.path.join(out_dir, *name.split('/')), blob, durable=False):
+                stats['written'] += 1
+            produced.add(name)
+        return {'path': rel, 'bytes': len(data), 'gzip': len(packed), 'keys': len(value)}
+
+    en_namespaces = list(dict.fromkeys(k.split('.', 1)[0] for k in en_flat))
+    for loc in locales:
+        merged, issues = runtime_map(flats[loc], en_flat)
+        if issues:
+            stats['placeholders'][loc] = issues
+        if delta and loc != SOURCE_LOCALE:
+            shipped = delta_against(merged, en_flat)
+            stats['omitted'][loc] = len(merged) - len(shipped)
+        else:
+            shipped = merged
+        compiled = {k: compile_value(v) for k, v in shipped.items()}
+        bundles[loc] = emit(f'{loc}.json', compiled)
+        stats['bytes'][loc] = (bundles[loc]['bytes'], bundles[loc]['gzip'])
+        chunks = split_namespaces(compiled)
+        for ns in en_namespaces:
+            namespaces.setdefault(ns, {})[loc] = emit(f'{loc}/{ns}.json', chunks.get(ns, {}))
+            stats['chunks'] += 1
+
+    manifest = {
+        'version': 4 if delta else 3,
+        'format': 'delta' if delta else 'flat',
+        'shaken': keep is not None,
+        'defaultLocale': SOURCE_LOCALE,
+        'locales': list(locales),
+        'bundles': bundles,
+        'namespaces': {ns: namespaces[ns] for ns in sorted(namespaces)},
+    }
+    if write_if_changed(os.path.join(out_dir, MANIFEST), chunk_text(manifest), durable=False):
+        stats['written'] += 1
+    stats['removed'] = remove_stale(out_dir, produced, previous)
+    return manifest, stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Compile locale catalogs into flat runtime bundles.')
+    ap.add_argument('--out', default=OUT_DIR)
+    ap.add_argument('--strict', action='store_true', help='fail on placeholder mismatches')
+    ap.add_argument('--shake', action='store_true', help='ship only keys referenced from src/')
+    ap.add_argument('--no-delta', dest='delta', action='store_false', help='merge English into every bundle')
+    ap.add_argument('--budgets', default=BUDGETS, help='gzip byte budgets (JSON)')
+    ap.add_argument('--no-budgets', dest='budgets', action='store_const', const=None, help='skip the budget check')
+    ap.add_argument('--pseudo', action='store_true', help='also compile the pseudo-locale catalogs present on disk')
+    ap.add_argument('--history', action='store_true', help='append to the size history (i18n-size-history.jsonl)')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    keep = None
+    if args.shake:
+        keep, dynamic = referenced_keys(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+    locales = list(LOCALES)
+    if args.pseudo:
+        locales += [p for p in PSEUDO_LOCALES if os.path.exists(locale_path(p, TRANS_DIR))]
+    manifest, stats = build(locales, out_dir=args.out, keep=keep, delta=args.delta)
+    elapsed = time.perf_counter() - started
+
+    sizes = [entry['gzip'] for per_loc in manifest['namespaces'].values() for entry in per_loc.values()]
+    print(f"{stats['chunks']} chunks across {len(manifest['namespaces'])} namespaces -> {args.out}")
+    print(f"  median chunk {sorted(sizes)[len(sizes) // 2] / 1024:.1f} KB gzip, "
+          f"largest {max(sizes) / 1024:.1f} KB gzip")
+    for loc, (raw, packed) in stats['bytes'].items():
+        omitted = stats['omitted'].get(loc)
+        note = f', {omitted} entries same as English omitted' if omitted is not None else ''
+        print(f"  {loc:6s} {raw / 1024:7.1f} KB {manifest['format']} bundle, {packed / 1024:5.1f} KB gzip{note}")
+    if args.shake:
+        print(f"  shook out {stats['shaken']} unreferenced keys "
+              f"({dynamic} non-literal t() calls, see `python _i18n_refs.py --dynamic`)")
+    print(f"{stats['written']} written, {stats['removed']} removed in {elapsed:.2f}s")
+    if args.history:
+        entry, appended = record()
+        if appended:
+            print(f"size history: recorded {entry['id']} (python _i18n_sizes.py diff -2 to compare)")
+
+    for loc, issues in stats['placeholders'].items():
+        print(f'\n{loc}: {len(issues)} placeholder mismatch(es), English used instead', file=sys.stderr)
+        for key, expected, found in issues[:20]:
+            print(f"  {key}: en {{{', '.join(expected)}}} vs {loc} {{{', '.join(found)}}}", file=sys.stderr)
+    over = []
+    if args.budgets and os.path.exists(args.budgets):
+        with open(args.budgets, encoding='utf-8') as f:
+            over = check_budgets(manifest, json.load(f))
+    if over:
+        print(f'\n{len(over)} artifact(s) over budget in {args.budgets} (gzip bytes):', file=sys.stderr)
+        for what, size, limit in over:
+            print(f'  {what}: {size} > {limit} (+{(size - limit) / limit:.1%})', file=sys.stderr)
+    return 1 if over or (args.strict and stats['placeholders']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Tests for the locale bundle compiler (_i18n_bundles.py).
+
+Usage (from apps/Trades/web-portal):
+  python -m unittest _i18n_bundles_test     # all tests: npm run i18n:test
+"""
+
+import json, os, tempfile, unittest
+
+from _i18n_bundles import MANIFEST, build
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class RemoveStaleTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.trans = os.path.join(self.tmp.name, 'translations')
+        self.out = os.path.join(self.tmp.name, 'out')
+        write(os.path.join(self.trans, 'en.json'), json.dumps({'common': {'save': 'Save'}}))
+        write(os.path.join(self.trans, 'es.json'), json.dumps({'common': {'save': 'Guardar'}}))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def files(self):
+        return sorted(os.path.relpath(os.path.join(r, f), self.out).replace(os.sep, '/')
+                      for r, _, fs in os.walk(self.out) for f in fs)
+
+    def test_unrelated_files_survive(self):
+        for rel in ('package.json', 'data/export.json', 'notes.json.gz', 'vendor.0123456789.json'):
+            write(os.path.join(self.out, *rel.split('/')), '{}')
+        build(['en', 'es'], trans_dir=self.trans, out_dir=self.out)
+        files = self.files()
+        for rel in ('package.json', 'data/export.json', 'notes.json.gz', 'vendor.0123456789.json'):
+            self.assertIn(rel, files)
+
+    def test_outputs_of_earlier_builds_are_removed(self):
+        build(['en', 'es'], trans_dir=self.trans, out_dir=self.out)
+        old = json.loads(open(os.path.join(self.out, MANIFEST), encoding='utf-8').read())['bundles']['es']['path']
+        write(os.path.join(self.out, 'es', 'gone.abcdef0123.json'), '{}')
+        write(os.path.join(self.trans, 'es.json'), json.dumps({'common': {'save': 'Guardar ya'}}))
+        _, stats = build(['en'], trans_dir=self.trans, out_dir=self.out)
+        files = self.files()
+        self.assertNotIn(old, files)
+        self.assertFalse(any(f.startswith('es') for f in files), files)
+        self.assertFalse(os.path.isdir(os.path.join(self.out, 'es')))
+        self.assertGreater(stats['removed'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
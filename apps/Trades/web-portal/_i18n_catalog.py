@@ -0,0 +1,153 @@
+"""
+Shared helpers for the translation tooling: the locale list, catalog paths and
+nested <-> flat key conversion for src/lib/translations/*.json.
+
+Every _i18n_*.py script runs from the web-portal directory, like the older
+_wire_*.py / _5lang_batch*.py scripts.
+"""
+import json, os, tempfile
+
+from _i18n_json import minimal_dumps
+
+TRANS_DIR = os.path.join('src', 'lib', 'translations')
+DASHBOARD_DIR = os.path.join('src', 'app', 'dashboard')
+
+# Keys whose translation is deliberately the English text (brand names, codes):
+# {"*": [keys for every locale], "tl": [keys for Tagalog only], ...}
+SAME_AS_EN = '_same-as-en.json'
+
+# Must match `locales` in src/lib/i18n-config.ts
+LOCALES = ['en', 'es', 'pt-BR', 'pl', 'zh', 'ht', 'ru', 'ko', 'vi', 'tl']
+SOURCE_LOCALE = 'en'
+# Generated stress-test catalogs (_i18n_pseudo.py, gitignored); must match
+# `pseudoLocales` in src/lib/i18n-config.ts. Not in LOCALES: nothing translates,
+# checks or counts them, only `_i18n_bundles.py --pseudo` compiles them.
+PSEUDO_LOCALES = ['en-XA', 'ar-XB']
+
+
+def locale_path(locale, trans_dir=TRANS_DIR):
+    return os.path.join(trans_dir, f'{locale}.json')
+
+
+def load_locale(locale, trans_dir=TRANS_DIR):
+    """Load a nested locale dict; a missing file is an empty catalog."""
+    path = locale_path(locale, trans_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_same_as_en(locales=None, trans_dir=TRANS_DIR):
+    """{locale: set of keys intentionally identical to English}."""
+    text = read_text(os.path.join(trans_dir, SAME_AS_EN))
+    marked = json.loads(text) if text else {}
+    shared = set(marked.get('*', ()))
+    return {loc: shared | set(marked.get(loc, ())) for loc in (locales or LOCALES)}
+
+
+def flatten(d, prefix=''):
+    """{'nav': {'jobs': 'Jobs'}} -> {'nav.jobs': 'Jobs'} (string leaves only)."""
+    flat = {}
+    for k, v in d.items():
+        path = f'{prefix}{k}'
+        if isinstance(v, dict):
+            flat.update(flatten(v, path + '.'))
+        elif isinstance(v, str):
+            flat[path] = v
+    return flat
+
+
+def unflatten(flat):
+    nested = {}
+    for key, value in flat.items():
+        set_path(nested, key, value)
+    return nested
+
+
+def delete_path(d, key):
+    """Remove a dot-path key and any namespaces it leaves empty. Returns True if removed."""
+    parts = key.split('.')
+    trail = [d]
+    for part in parts[:-1]:
+        node = trail[-1].get(part)
+        if not isinstance(node, dict):
+            return False
+        trail.append(node)
+    if parts[-1] not in trail[-1]:
+        return False
+    del trail[-1][parts[-1]]
+    for i in range(len(parts) - 1, 0, -1):
+        if trail[i]:
+            break
+        del trail[i - 1][parts[i - 1]]
+    return True
+
+
+def get_path(d, key):
+    node = d
+    for part in key.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def set_path(d, key, value):
+    """Set a dot-path key, creating intermediate namespaces as needed."""
+    parts = key.split('.')
+    node = d
+    for part in parts[:-1]:
+        child = node.setdefault(part, {})
+        if not isinstance(child, dict):
+            raise ValueError(f"cannot set '{key}': '{part}' is a string, not a namespace")
+        node = child
+    node[parts[-1]] = value
+
+
+def read_text(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def write_if_changed(path, text, durable=True):
+    """Atomically replace `path` with `text` (temp file + rename), skipping identical bytes.
+
+    `text` may be str or bytes. durable=False skips the fsync, for generated
+    build output that can always be rebuilt. Returns True if the file was written.
+    """
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    mode = 0o644
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+        mode = os.stat(path).st_mode & 0o777
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return True
+
+
+def save_locale(locale, data, trans_dir=TRANS_DIR, canonical=False):
+    """Write a catalog as a minimal edit of the file on disk, or fully canonical.
+
+    Returns True if the file changed.
+    """
+    path = locale_path(locale, trans_dir)
+    old = None if canonical else read_text(path)
+    return write_if_changed(path, minimal_dumps(old, data))
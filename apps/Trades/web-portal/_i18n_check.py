@@ -0,0 +1,230 @@
+"""
+Consistency gate for the translation catalogs, fast enough for pre-commit.
+
+A malformed catalog only shows up at runtime, as a raw key or a literal
+{name} on screen. This reads the 10 locale files once and checks them
+against each other and against every t() call in the four portals:
+
+  shape         a key that is a string in one locale and a namespace in
+                another (es has "jobs.status": "..." where en has
+                jobs.status.active), or a value that is not a string at all
+  placeholders  a translation whose {name} set differs from English
+  orphaned      t('key') / t(`prefix${...}`) / useTranslations('ns') that
+                resolves to nothing. Web keys resolve against en.json; for
+                client/team they resolve against the portal's next-intl
+                messages (core + overlay, see _i18n_core.py).
+  duplicates    a key written twice in the same JSON object. json.load keeps
+                the last one silently, so one of the two translations is
+                dead text.
+
+Each locale is parsed and walked once into a flat {path: kind} map, and the
+checks are lookups in those maps. The references come from the persistent
+index (_i18n_index.py), which only re-tokenizes files that changed since the
+last run. A warm run takes well under a second.
+
+Exits 1 when anything is found, so it can block a commit:
+
+  # .git/hooks/pre-commit
+  cd apps/Trades/web-portal && python _i18n_check.py -q
+
+Usage:
+  python _i18n_check.py                    # all checks, up to 20 lines each
+  python _i18n_check.py --only orphaned    # one check (repeatable)
+  python _i18n_check.py --limit 0          # list everything
+  python _i18n_check.py -q                 # counts only
+"""
+import argparse, json, sys, time
+
+from _i18n_bundles import check_placeholders
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, locale_path, read_text
+from _i18n_core import portal_messages, targets
+from _i18n_index import KeyIndex
+
+CHECKS = ['shape', 'placeholders', 'orphaned', 'duplicates']
+NAMESPACE = 'namespace'
+
+
+def parse_catalog(text):
+    """(tree, [(path, key)] of keys repeated within one object)."""
+    repeated = []
+
+    def pairs_hook(pairs):
+        d = {}
+        for k, v in pairs:
+            if k in d:
+                repeated.append((d, k))
+            d[k] = v
+        return d
+
+    tree = json.loads(text, object_pairs_hook=pairs_hook)
+    if not repeated:
+        return tree, []
+    paths = {id(tree): ''}
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for k, v in node.items():
+            if isinstance(v, dict):
+                paths[id(v)] = f'{paths[id(node)]}{k}.'
+                stack.append(v)
+    return tree, [(paths.get(id(d), '?'), k) for d, k in repeated]
+
+
+def shapes(tree):
+    """({dot path: 'namespace' | JSON type name} for every node, {dot path: str} leaves)."""
+    kinds, flat = {}, {}
+    stack = [('', tree)]
+    while stack:
+        prefix, node = stack.pop()
+        for k, v in node.items():
+            path = prefix + k
+            if isinstance(v, dict):
+                kinds[path] = NAMESPACE
+                stack.append((path + '.', v))
+            elif isinstance(v, str):
+                kinds[path] = 'string'
+                flat[path] = v
+            else:
+                kinds[path] = type(v).__name__ if v is not None else 'null'
+    return kinds, flat
+
+
+def load_catalogs(locales=LOCALES, trans_dir=TRANS_DIR):
+    """{locale: (kinds, flat, duplicates)}; a locale whose file does not parse maps to its error."""
+    out = {}
+    for loc in locales:
+        text = read_text(locale_path(loc, trans_dir))
+        if text is None:
+            continue
+        try:
+            tree, dupes = parse_catalog(text)
+        except ValueError as e:
+            out[loc] = e
+            continue
+        out[loc] = shapes(tree) + (dupes,)
+    return out
+
+
+def check_shape(catalogs):
+    en_kinds = catalogs[SOURCE_LOCALE][0]
+    issues = []
+    for loc, (kinds, _, _) in catalogs.items():
+        for path, kind in kinds.items():
+            expected = en_kinds.get(path)
+            if kind not in ('string', NAMESPACE):
+                issues.append(f'{loc} {path}: {kind} value, expected a string')
+            elif expected is not None and expected != kind:
+                issues.append(f'{loc} {path}: {kind} here, {expected} in {SOURCE_LOCALE}')
+    return issues
+
+
+def check_placeholder_sets(catalogs):
+    en_flat = catalogs[SOURCE_LOCALE][1]
+    issues = []
+    for loc, (_, flat, _) in catalogs.items():
+        if loc == SOURCE_LOCALE:
+            continue
+        for key, expected, found in check_placeholders(flat, en_flat):
+            issues.append(f"{loc} {key}: {{{', '.join(found)}}} but {SOURCE_LOCALE} has {{{', '.join(expected)}}}")
+    return issues
+
+
+def check_duplicates(catalogs):
+    return [f'{loc} {prefix}{key}: written more than once, the last one wins'
+            for loc, (_, _, dupes) in catalogs.items() for prefix, key in dupes]
+
+
+def check_orphaned(en_kinds, index):
+    """t() references that reach no key of the catalog the portal reads."""
+    known = {'web': en_kinds}
+    for portal in targets():
+        known[portal] = _all_kinds(portal_messages(portal, [SOURCE_LOCALE])[SOURCE_LOCALE])
+    issues = []
+    for portal, kinds in known.items():
+        refs, _ = index.refs([portal])
+        prefix_cache = {}
+        for ref in refs:
+            if ref.kind == 'dynamic' and ref.key is None:
+                continue
+            if ref.kind == 'literal':
+                ok = kinds.get(ref.key) == 'string'
+            else:
+                ok = prefix_cache.get(ref.key)
+                if ok is None:
+                    ok = prefix_cache[ref.key] = _has_prefix(kinds, ref.key)
+            if not ok:
+                what = ref.key if ref.kind == 'literal' else f'{ref.kind} {ref.key}'
+                issues.append(f'{portal} {ref.path}:{ref.line}: {what} not in the catalog')
+    return issues
+
+
+def _all_kinds(flat):
+    """check_orphaned() wants namespaces too; rebuild them from a flat map."""
+    kinds = {}
+    for key in flat:
+        parts = key.split('.')
+        for i in range(1, len(parts)):
+            kinds['.'.join(parts[:i])] = NAMESPACE
+        kinds[key] = 'string'
+    return kinds
+
+
+def _has_prefix(kinds, prefix):
+    if prefix.endswith('.'):
+        return kinds.get(prefix[:-1]) == NAMESPACE
+    return any(k.startswith(prefix) for k in kinds)
+
+
+def run(only=None, trans_dir=TRANS_DIR):
+    """{check: [issue lines]} plus parse errors under 'parse'."""
+    only = only or CHECKS
+    catalogs = load_catalogs(trans_dir=trans_dir)
+    results = {}
+    broken = [f'{loc}: {err}' for loc, err in catalogs.items() if isinstance(err, Exception)]
+    if broken:
+        results['parse'] = broken
+    catalogs = {loc: c for loc, c in catalogs.items() if not isinstance(c, Exception)}
+    if SOURCE_LOCALE not in catalogs:
+        results.setdefault('parse', []).append(f'{SOURCE_LOCALE}: missing or unreadable')
+        return results
+    if 'shape' in only:
+        results['shape'] = check_shape(catalogs)
+    if 'placeholders' in only:
+        results['placeholders'] = check_placeholder_sets(catalogs)
+    if 'duplicates' in only:
+        results['duplicates'] = check_duplicates(catalogs)
+    if 'orphaned' in only:
+        index = KeyIndex()
+        index.update()
+        results['orphaned'] = check_orphaned(catalogs[SOURCE_LOCALE][0], index)
+        index.close()
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Check the translation catalogs and t() references for consistency.')
+    ap.add_argument('--only', action='append', choices=CHECKS, help='run only this check (repeatable)')
+    ap.add_argument('--limit', type=int, default=20, help='issues listed per check, 0 = all (default 20)')
+    ap.add_argument('-q', '--quiet', action='store_true', help='print counts only')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run(args.only)
+    elapsed = time.perf_counter() - started
+    total = 0
+    for check, issues in results.items():
+        total += len(issues)
+        print(f'{check}: {len(issues)} issue(s)')
+        if args.quiet:
+            continue
+        shown = issues if args.limit <= 0 else issues[:args.limit]
+        for line in shown:
+            print(f'  {line}')
+        if len(shown) < len(issues):
+            print(f'  ... {len(issues) - len(shown)} more (--limit 0 lists all)')
+    print(f"{'FAIL' if total else 'ok'}: {total} issue(s) in {elapsed:.2f}s")
+    return 1 if total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Shared core messages for the next-intl portals, plus per-portal overlays.
+
+client-portal and team-portal (and ops-portal, once it has messages) each
+keep their own messages/<locale>.json, and most of what they share with
+each other and with the web catalog ("Save", "Sign In", nav.schedule) is
+translated separately in every portal, sometimes differently.
+
+This tool splits them:
+
+  core      messages/core/<locale>.json, byte-identical in every portal:
+            each key that at least two portals (web counts, through
+            src/lib/translations) have with the same English text. Each
+            locale's value is the translation most of those portals use,
+            with ties going to web, then client, team, ops. When no portal
+            has a translation, the English text is used (next-intl has no
+            fallback of its own).
+  overlay   messages/<locale>.json, the portal's own keys. A core key stays
+            in the overlay when the portal's English differs from the
+            core's, and per locale when the portal's translation differs
+            from the core's: only the English has to agree for a key to be
+            shared, and the split never changes what a portal shows.
+
+src/i18n.ts in each portal loads both and deep-merges the overlay over the
+core (mergeMessages in src/lib/i18n-config.ts). A portal's effective
+messages are read back as core + overlay, so running the tool again is a
+no-op until a source changes. The web catalog is only read. Web keeps its
+own bundles, but it anchors the core keys and the tie-breaks.
+
+--report prints the deduplication report and writes nothing. It shows, per
+portal, how many keys come from the core and the overlay bytes before and
+after. It lists core keys whose translations disagree between portals (the
+core takes the majority, the others stay in their overlays) and English texts that portals spell under
+different keys (candidates for a shared key).
+
+Usage:
+  python _i18n_core.py              # write core + overlays for client/team/ops
+  python _i18n_core.py --report     # dedup report only
+  python _i18n_core.py --check      # exit 1 if any portal's files are out of date
+"""
+import argparse, json, os, sys, time
+from collections import Counter
+
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, load_same_as_en, read_text, unflatten, write_if_changed
+from _i18n_json import canonical_dumps
+from _i18n_messages import messages_dir
+
+SOURCE_ORDER = ['web', 'client', 'team', 'ops']
+TARGETS = ['client', 'team', 'ops']
+CORE_DIR = 'core'
+MIN_PORTALS = 2
+
+
+def _read_flat(path):
+    text = read_text(path)
+    return flatten(json.loads(text)) if text else {}
+
+
+def core_path(portal, loc):
+    return os.path.join(messages_dir(portal), CORE_DIR, f'{loc}.json')
+
+
+def overlay_path(portal, loc):
+    return os.path.join(messages_dir(portal), f'{loc}.json')
+
+
+def targets():
+    """next-intl portals that have a messages directory."""
+    return [p for p in TARGETS if os.path.isdir(messages_dir(p))]
+
+
+def load_sources(locales=LOCALES, trans_dir=TRANS_DIR):
+    """{portal: {locale: flat}}: the web catalog, and core + overlay for every target portal."""
+    sources = {'web': {loc: flatten(load_locale(loc, trans_dir)) for loc in locales}}
+    for portal in targets():
+        sources[portal] = portal_messages(portal, locales)
+    return sources
+
+
+def portal_messages(portal, locales=LOCALES):
+    """{locale: flat} a next-intl portal actually serves: its overlay merged over the core."""
+    return {loc: {**_read_flat(core_path(portal, loc)), **_read_flat(overlay_path(portal, loc))} for loc in locales}
+
+
+def pick_core(sources, locales=LOCALES, same_as_en=None, min_portals=MIN_PORTALS):
+    """({locale: flat core}, {key: [(locale, {portal: text})]} translation disagreements)."""
+    same_as_en = same_as_en or {}
+    en_by_portal = {p: data[SOURCE_LOCALE] for p, data in sources.items()}
+    agree = {}
+    for portal in SOURCE_ORDER:
+        for key, text in en_by_portal.get(portal, {}).items():
+            agree.setdefault((key, text), []).append(portal)
+    core_en = {}
+    for (key, text), portals in agree.items():
+        if len(portals) >= min_portals and any(p in TARGETS for p in portals) and key not in core_en:
+            core_en[key] = text
+
+    core, conflicts = {SOURCE_LOCALE: core_en}, {}
+    for loc in locales:
+        if loc == SOURCE_LOCALE:
+            continue
+        flat = {}
+        for key, text in core_en.items():
+            votes = {}
+            for portal in agree[(key, text)]:
+                value = sources[portal][loc].get(key)
+                if value and (value != text or key in same_as_en.get(loc, ())):
+                    votes[portal] = value
+            if not votes:
+                flat[key] = text
+                continue
+            counts = Counter(votes.values())
+            best = max(counts.values())
+            flat[key] = next(v for p, v in votes.items() if counts[v] == best)
+            if len(counts) > 1:
+                conflicts.setdefault(key, []).append((loc, votes))
+        core[loc] = flat
+    return core, conflicts
+
+
+def overlays(sources, core, locales=LOCALES):
+    """{portal: {locale: flat overlay}}: own keys, plus core keys the portal translates differently."""
+    core_en = core[SOURCE_LOCALE]
+    out = {}
+    for portal in targets():
+        en = sources[portal][SOURCE_LOCALE]
+        own = {k for k, v in en.items() if core_en.get(k) != v}
+        out[portal] = {loc: {k: v for k, v in sources[portal][loc].items() if k in own or core[loc].get(k) != v}
+                       for loc in locales}
+    return out
+
+
+def plan(sources=None, locales=LOCALES):
+    """{path: text} for every core and overlay file, plus the report inputs."""
+    sources = sources or load_sources(locales)
+    core, conflicts = pick_core(sources, locales, load_same_as_en(locales))
+    over = overlays(sources, core, locales)
+    files = {}
+    for portal, per_locale in over.items():
+        for loc in locales:
+            files[core_path(portal, loc)] = canonical_dumps(unflatten(core[loc]))
+            files[overlay_path(portal, loc)] = canonical_dumps(unflatten(per_locale[loc]))
+    return files, core, over, conflicts, sources
+
+
+def _size(flat):
+    return len(json.dumps(unflatten(flat), ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def print_report(sources, core, over, conflicts, top=15):
+    core_en = core[SOURCE_LOCALE]
+    print(f'core: {len(core_en)} key(s), {_size(core_en) / 1024:.1f} KB en')
+    for portal, per_locale in over.items():
+        en = sources[portal][SOURCE_LOCALE]
+        before = sum(_size(sources[portal][loc]) for loc in sources[portal])
+        after = sum(_size(per_locale[loc]) for loc in per_locale)
+        shared = sum(1 for k in en if core_en.get(k) == en[k])
+        print(f'  {portal:6s} {len(en):4d} keys: {shared:4d} from core, {len(per_locale[SOURCE_LOCALE]):4d} own; '
+              f'overlay files {before / 1024:.1f} KB -> {after / 1024:.1f} KB')
+    units = sum(len(sources[p][SOURCE_LOCALE]) for p in over)
+    own = sum(len(per_locale[SOURCE_LOCALE]) for per_locale in over.values())
+    print(f'strings to translate in {", ".join(over)}: {units} before, {own + len(core_en)} after (core once)')
+
+    print(f'\n{len(conflicts)} core key(s) translated differently across portals (majority in core, rest in overlays):')
+    for key, cases in sorted(conflicts.items())[:top]:
+        loc, votes = cases[0]
+        detail = '; '.join(f'{p}={v!r}' for p, v in votes.items())
+        more = f' (+{len(cases) - 1} locale(s))' if len(cases) > 1 else ''
+        print(f'  {key} [{loc}] {detail}{more}')
+
+    by_text = {}
+    for portal, data in sources.items():
+        for key, text in data[SOURCE_LOCALE].items():
+            by_text.setdefault(text, set()).add((portal, key))
+    split = [(text, sorted(pairs)) for text, pairs in by_text.items()
+             if len({k for _, k in pairs}) > 1 and len({p for p, _ in pairs}) > 1 and any(p != 'web' for p, _ in pairs)]
+    print(f'\n{len(split)} English text(s) under different keys in different portals:')
+    for text, pairs in sorted(split)[:top]:
+        print(f"  {text[:40]!r}: {', '.join(f'{p}:{k}' for p, k in pairs[:4])}{' ...' if len(pairs) > 4 else ''}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Split next-intl portal messages into a shared core and overlays.')
+    ap.add_argument('--report', action='store_true', help='print the deduplication report, write nothing')
+    ap.add_argument('--check', action='store_true', help='report stale files instead of writing them')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    files, core, over, conflicts, sources = plan()
+    if args.report:
+        print_report(sources, core, over, conflicts)
+        print(f'\n({time.perf_counter() - started:.2f}s)')
+        return 0
+    stale = []
+    for path, text in files.items():
+        if args.check:
+            if read_text(path) != text:
+                stale.append(path)
+        elif write_if_changed(path, text):
+            stale.append(path)
+    verb = 'out of date' if args.check else 'written'
+    print(f"core of {len(core[SOURCE_LOCALE])} key(s) for {', '.join(over) or 'no portals'}; "
+          f'{len(stale)} file(s) {verb} in {time.perf_counter() - started:.2f}s')
+    for path in stale:
+        print(f'  {path}')
+    return 1 if args.check and stale else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Namespace x locale translation coverage for src/lib/translations.
+
+Loads the 10 locale files once, numbers every flattened key, and turns each
+locale into bitsets over that key space (present, identical to English).
+Every cell of the matrix is then a few AND/NOT operations plus a popcount:
+
+  translated  key in en, present in the locale, different from English
+  identical   key in en, present, same text as English (often untranslated)
+              unless listed in _same-as-en.json, which counts as translated
+  missing     key in en, absent from the locale
+  stale       key present in the locale but no longer in en
+
+Counts are over keys of en.json, not over dictionary entries like the
+"{loc} dict: N entries" lines the _5lang_batch*.py scripts print.
+
+Usage:
+  python _i18n_coverage.py                        # every namespace, % translated
+  python _i18n_coverage.py --ns 'books*' ko       # books* namespaces, Korean only
+  python _i18n_coverage.py --detail --ns jobs
+  python _i18n_coverage.py --json > coverage.json
+"""
+import argparse, fnmatch, json, sys, time
+
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, load_same_as_en
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(x):
+        return bin(x).count('1')
+
+
+def _bitset(indices, size):
+    bits = bytearray((size + 7) // 8)
+    for i in indices:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class KeySpace:
+    """All flattened keys of all locales, numbered once, with per-locale bitsets."""
+
+    def __init__(self, catalogs, same_as_en=None):
+        self.flat = {loc: flatten(data) for loc, data in catalogs.items()}
+        en = self.flat.get(SOURCE_LOCALE, {})
+        keys = list(en)
+        seen = set(keys)
+        for loc, flat in self.flat.items():
+            for k in flat:
+                if k not in seen:
+                    seen.add(k)
+                    keys.append(k)
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        size = len(keys)
+
+        self.present, self.same = {}, {}
+        for loc, flat in self.flat.items():
+            self.present[loc] = _bitset((self.index[k] for k in flat), size)
+            intended = (same_as_en or {}).get(loc, ())
+            self.same[loc] = _bitset((self.index[k] for k, v in flat.items()
+                                      if en.get(k) == v and k not in intended), size)
+        self.en = self.present.get(SOURCE_LOCALE, 0)
+
+        by_ns = {}
+        for i, k in enumerate(keys):
+            by_ns.setdefault(k.split('.', 1)[0], []).append(i)
+        self.namespaces = {ns: _bitset(idx, size) for ns, idx in by_ns.items()}
+
+    @classmethod
+    def load(cls, locales=LOCALES, trans_dir=TRANS_DIR):
+        return cls({loc: load_locale(loc, trans_dir) for loc in locales}, load_same_as_en(locales, trans_dir))
+
+    def cell(self, mask, locale):
+        present, same, en = self.present.get(locale, 0), self.same.get(locale, 0), self.en
+        return {
+            'total': popcount(en & mask),
+            'translated': popcount(en & mask & present & ~same),
+            'identical': popcount(en & mask & present & same),
+            'missing': popcount(en & mask & ~present),
+            'stale': popcount(mask & present & ~en),
+        }
+
+    def keys_of(self, mask):
+        return [self.keys[i] for i in range(len(self.keys)) if mask >> i & 1]
+
+
+def coverage_matrix(space, locales, patterns=None):
+    """{namespace: {locale: cell}} plus an '*' row aggregating the selected namespaces."""
+    names = sorted(space.namespaces)
+    if patterns:
+        names = [ns for ns in names if any(fnmatch.fnmatchcase(ns, p) for p in patterns)]
+    matrix, union = {}, 0
+    for ns in names:
+        mask = space.namespaces[ns]
+        union |= mask
+        matrix[ns] = {loc: space.cell(mask, loc) for loc in locales}
+    matrix['*'] = {loc: space.cell(union, loc) for loc in locales}
+    return matrix
+
+
+def _pct(cell):
+    return f"{100 * cell['translated'] / cell['total']:.0f}%" if cell['total'] else '-'
+
+
+def print_table(matrix, locales, detail=False):
+    width = max([len('namespace')] + [len(ns) for ns in matrix])
+    col = 19 if detail else 6
+    print(f"{'namespace':{width}s} {'keys':>5s} " + ' '.join(f'{loc:>{col}s}' for loc in locales))
+    for ns, row in matrix.items():
+        if ns == '*':
+            print('-' * (width + 7 + (col + 1) * len(locales)))
+        total = next(iter(row.values()))['total'] if row else 0
+        if detail:
+            cells = [f"{c['translated']}/{c['identical']}/{c['missing']}/{c['stale']}" for c in row.values()]
+        else:
+            cells = [_pct(c) for c in row.values()]
+        label = 'TOTAL' if ns == '*' else ns
+        print(f'{label:{width}s} {total:5d} ' + ' '.join(f'{c:>{col}s}' for c in cells))
+    if detail:
+        print('\ncells: translated/identical/missing/stale')
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Per-namespace translation coverage.')
+    ap.add_argument('locales', nargs='*', help='locales to show (default: all but en)')
+    ap.add_argument('--ns', action='append', help="namespace glob, e.g. 'books*' (repeatable)")
+    ap.add_argument('--detail', action='store_true', help='show translated/identical/missing/stale counts')
+    ap.add_argument('--json', action='store_true', help='print the matrix as JSON')
+    args = ap.parse_args(argv)
+
+    locales = args.locales or [l for l in LOCALES if l != SOURCE_LOCALE]
+    unknown = [l for l in locales if l not in LOCALES]
+    if unknown:
+        ap.error(f"unknown locales: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    space = KeySpace.load()
+    matrix = coverage_matrix(space, locales, args.ns)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump({'locales': locales, 'namespaces': matrix}, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_table(matrix, locales, args.detail)
+        print(f'\n{len(space.keys)} keys, {len(space.namespaces)} namespaces in {elapsed * 1000:.0f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
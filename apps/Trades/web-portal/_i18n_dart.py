@@ -0,0 +1,362 @@
+"""
+Dart backend for the wiring engine (_i18n_wire.py): lexer, extraction, rewrite.
+
+tokenize() is a single-pass Dart tokenizer in the style of _i18n_lexer.py. It
+understands every string form ('x', "x", '''x''', r'x', interpolation
+with $name and ${expr}, strings nested inside ${...}) and nested /* */
+comments, so an apostrophe in a comment or a quote inside ${...} never
+derails it. Tokens reuse _i18n_lexer.Token:
+
+  ident   identifier or keyword
+  num     numeric literal
+  str     string without interpolation    value = unescaped text
+  istr    string with $name / ${expr}     value = raw source of the body
+  punct   operator / punctuation
+
+extract() finds the user-facing literals a Flutter screen hardcodes:
+
+  Text('Save')            Text.rich / SelectableText too
+  hintText: 'Search...'   labelText: 'Name'   (InputDecoration and friends)
+
+and records, per literal, whether it can be wired mechanically: a
+`context` must be in scope (a State subclass, or an enclosing function with a
+parameter named context), and the literal must not sit inside a const
+expression other than its own constructor's `const`, which the rewrite
+drops.
+
+rewrite() replaces each wired literal with AppLocalizations.of(context)!.key
+and adds the app_localizations.dart import. Catalog keys map to ARB message
+names by arb_key() (common.save -> commonSave).
+"""
+import os, re
+from collections import namedtuple
+
+from _i18n_lexer import Token, unescape
+
+# Leading whitespace, then one token start
+_CODE = re.compile(
+    r'\s*(?:'
+    r'(?P<lc>//[^\n]*)'
+    r'|(?P<bc>/\*)'
+    r"|(?P<str>r?(?:'''|\"\"\"|'|\"))"
+    r'|(?P<ident>[A-Za-z_$][\w$]*)'
+    r'|(?P<num>\d[\w.]*(?:[eE][+-]?\d+)?)'
+    r'|(?P<punct>=>|\?\?=|\?\?|\?\.|\.\.\.?|[=!<>]=|&&|\|\||\+\+|--|[^\s\w])'
+    r')'
+)
+_BLOCK_PART = re.compile(r'/\*|\*/')
+# String bodies up to the next quote, `$` or end of line (single-line forms)
+_BODY = {
+    "'": re.compile(r"(?:[^'\\\n$]|\\.)*"),
+    '"': re.compile(r'(?:[^"\\\n$]|\\.)*'),
+    "'''": re.compile(r"(?:[^'\\$]|\\.|'(?!''))*", re.S),
+    '"""': re.compile(r'(?:[^"\\$]|\\.|"(?!""))*', re.S),
+}
+_RAW_BODY = {
+    "'": re.compile(r"[^'\n]*"),
+    '"': re.compile(r'[^"\n]*'),
+    "'''": re.compile(r"(?:[^']|'(?!''))*"),
+    '"""': re.compile(r'(?:[^"]|"(?!""))*'),
+}
+_SIMPLE_INTERP = re.compile(r'\$[A-Za-z_][\w]*')
+
+
+def tokenize(text):
+    tokens = []
+    append = tokens.append
+    n = len(text)
+    line, line_pos = 1, 0
+    pos = 0
+    # Open ${...} interpolations: [quote, string start, brace depth]
+    interp = []
+
+    def emit(kind, value, start, end):
+        nonlocal line, line_pos
+        if interp:
+            return  # strings nested inside ${...} belong to the enclosing string
+        line += text.count('\n', line_pos, start)
+        line_pos = start
+        append(Token(kind, value, start, end, line))
+
+    def string_body(pos, quote, start, interpolated):
+        """Scan from inside a (non-raw) string; returns the position after it or after `${`."""
+        body = _BODY[quote]
+        while True:
+            pos = body.match(text, pos).end()
+            if pos >= n or text[pos] == '\n':  # unterminated single-line string
+                emit('istr' if interpolated else 'str', text[start:pos], start, pos)
+                return pos
+            if text[pos] == '$':
+                if text.startswith('${', pos):
+                    interp.append([quote, start, 0])
+                    return pos + 2
+                m = _SIMPLE_INTERP.match(text, pos)
+                interpolated = True
+                pos = m.end() if m else pos + 1
+                continue
+            end = pos + len(quote)
+            raw = text[start:end]
+            body_start = start + (len(quote) if raw[0] != 'r' else len(quote) + 1)
+            if interpolated:
+                emit('istr', text[body_start:pos], start, end)
+            else:
+                emit('str', unescape(text[body_start:pos]), start, end)
+            return end
+
+    while pos < n:
+        m = _CODE.match(text, pos)
+        if m is None or m.lastgroup is None:
+            break  # only trailing whitespace left
+        kind = m.lastgroup
+        start = m.start(kind)
+        if kind == 'lc':
+            pos = m.end()
+        elif kind == 'bc':
+            depth, pos = 1, m.end()
+            while depth and pos < n:  # Dart block comments nest
+                c = _BLOCK_PART.search(text, pos)
+                if c is None:
+                    pos = n
+                    break
+                depth += 1 if c.group(0) == '/*' else -1
+                pos = c.end()
+        elif kind == 'str':
+            opener = m.group('str')
+            quote = opener.lstrip('r')
+            if opener[0] == 'r':
+                body_end = _RAW_BODY[quote].match(text, m.end()).end()
+                end = min(n, body_end + len(quote))
+                emit('str', text[m.end():body_end], start, end)
+                pos = end
+            else:
+                pos = string_body(m.end(), quote, start, False)
+        elif kind == 'punct':
+            value = m.group('punct')
+            pos = m.end()
+            if interp:
+                if value == '{':
+                    interp[-1][2] += 1
+                elif value == '}':
+                    if interp[-1][2] == 0:
+                        quote, str_start, _ = interp.pop()
+                        pos = string_body(pos, quote, str_start, True)
+                        continue
+                    interp[-1][2] -= 1
+                continue  # tokens inside ${...} are not emitted
+            emit('punct', value, start, pos)
+        else:
+            pos = m.end()
+            emit(kind, m.group(kind), start, pos)
+    return tokens
+
+
+# ── extraction ──
+
+Candidate = namedtuple('Candidate', 'text kind line start end const_start wireable reason')
+
+TEXT_WIDGETS = {'Text', 'SelectableText'}
+TEXT_PARAMS = {'hintText', 'labelText'}
+_USER_FACING = re.compile(r'[A-Za-z]{2,}')
+_CONTEXT_TYPES = {'State', 'ConsumerState'}  # both expose `context`
+
+
+def _find_const_owner(tokens, i):
+    """If tokens[i] is '(' of `const Name(` / `const Name.named(` / `const Name<T>(`, the const token index."""
+    j = i - 1
+    if j >= 0 and tokens[j].value == '>':  # generic arguments
+        depth = 0
+        while j >= 0:
+            if tokens[j].value == '>':
+                depth += 1
+            elif tokens[j].value == '<':
+                depth -= 1
+                if depth == 0:
+                    break
+            j -= 1
+        j -= 1
+    while j >= 2 and tokens[j].kind == 'ident' and tokens[j - 1].value == '.':
+        j -= 2
+    if j >= 1 and tokens[j].kind == 'ident' and tokens[j - 1].value == 'const':
+        return j - 1
+    return None
+
+
+def _params_have_context(tokens, open_idx, close_idx):
+    return any(t.kind == 'ident' and t.value == 'context' for t in tokens[open_idx + 1:close_idx])
+
+
+def _member_head(tokens, i):
+    """Depth-0 token values of the class member or statement that tokens[i] continues."""
+    head, depth, j = [], 0, i - 1
+    while j >= 0:
+        v = tokens[j].value
+        if v in (')', ']', '}') and (depth or v != '}'):
+            depth += 1
+        elif v in ('(', '[', '{'):
+            if depth == 0:
+                break
+            depth -= 1
+        elif depth == 0 and v in (';', '}'):
+            break
+        elif depth == 0:
+            head.append(v)
+        j -= 1
+    return head
+
+
+def _state_class(tokens, brace_idx):
+    """True for the `{` of `class X extends State<Y> {` (State exposes `context`)."""
+    head = _member_head(tokens, brace_idx)[::-1]
+    return 'class' in head and 'extends' in head and head[head.index('extends') + 1] in _CONTEXT_TYPES
+
+
+def _skip_modifiers(tokens, k):
+    while k >= 0 and tokens[k].value in ('async', 'sync', '*'):
+        k -= 1
+    return k
+
+
+def extract(tokens):
+    """Candidate literals in one Dart file (see module docstring)."""
+    out = []
+    # Open brackets: [char, token index, const (own or inherited), own const token index,
+    #                 context in scope, State class body]
+    stack = [['', -1, False, None, False, False]]
+    last_close = None  # (open index, close index) of the most recent ')'
+    const_decl = []    # bracket depths at which a `const x = ...` initializer is open
+    arrow_ctx = []     # depths at which an arrow body with `context` in scope is open
+    n = len(tokens)
+    for i, tok in enumerate(tokens):
+        v = tok.value
+        if tok.kind == 'punct':
+            if v in '([{':
+                parent = stack[-1]
+                own = _find_const_owner(tokens, i) if v == '(' else (i - 1 if i and tokens[i - 1].value == 'const' else None)
+                inherited = parent[2] or bool(const_decl and const_decl[-1] == len(stack))
+                has_ctx = parent[4] or bool(arrow_ctx)
+                state_body = False
+                if v == '{':
+                    k = _skip_modifiers(tokens, i - 1)
+                    params = last_close if last_close and last_close[1] == k else None
+                    if params and _params_have_context(tokens, *params):
+                        has_ctx = True
+                    elif parent[5]:
+                        # A member body of a State subclass: instance members see `context`
+                        is_body = params is not None or (k >= 1 and tokens[k - 1].value == 'get')
+                        has_ctx = is_body and 'static' not in _member_head(tokens, i)
+                    elif _state_class(tokens, i):
+                        state_body = True
+                stack.append([v, i, inherited or own is not None, own, has_ctx, state_body])
+            elif v in ')]}':
+                if len(stack) > 1:
+                    opened = stack.pop()
+                    if v == ')':
+                        last_close = (opened[1], i)
+                while arrow_ctx and arrow_ctx[-1] > len(stack):
+                    arrow_ctx.pop()
+            elif v == '=>':
+                k = _skip_modifiers(tokens, i - 1)
+                params = last_close if last_close and last_close[1] == k else None
+                if params and _params_have_context(tokens, *params):
+                    arrow_ctx.append(len(stack))
+                elif stack[-1][5]:
+                    head = _member_head(tokens, i)
+                    if 'static' not in head and '=' not in head:  # not a static or a field initializer
+                        arrow_ctx.append(len(stack))
+            elif v == ';' or v == ',':
+                while const_decl and const_decl[-1] >= len(stack):
+                    const_decl.pop()
+                while arrow_ctx and arrow_ctx[-1] >= len(stack):
+                    arrow_ctx.pop()
+            elif v == '=' and i >= 2 and tokens[i - 1].kind == 'ident':
+                j = i - 2
+                while j >= 0 and tokens[j].kind == 'ident' and tokens[j].value not in ('const', 'final', 'var', 'static'):
+                    j -= 1
+                if j >= 0 and tokens[j].value == 'const':
+                    const_decl.append(len(stack))
+            continue
+        if tok.kind != 'ident' or i + 3 >= n:
+            continue
+
+        if v in TEXT_WIDGETS and tokens[i + 1].value == '(':
+            lit, after, paren = tokens[i + 2], tokens[i + 3], i + 1
+        elif v in TEXT_PARAMS and tokens[i + 1].value == ':':
+            lit, after, paren = tokens[i + 2], tokens[i + 3], None
+        else:
+            continue
+        if lit.kind != 'str' or after.value not in (',', ')') or not _USER_FACING.search(lit.value):
+            continue
+        if i and tokens[i - 1].value == '.':
+            continue  # foo.Text(...) is not the widget
+
+        has_ctx = stack[-1][4] or bool(arrow_ctx)
+        if paren is not None:
+            # The Text( paren opens right after this token; work out its constness now
+            own = _find_const_owner(tokens, paren)
+            inherited = stack[-1][2] or bool(const_decl and const_decl[-1] == len(stack))
+        else:
+            own = stack[-1][3]
+            inherited = any(f[2] for f in stack[:-1]) or bool(const_decl and const_decl[-1] < len(stack))
+        if inherited:
+            wireable, reason = False, 'inside a const expression'
+        elif not has_ctx:
+            wireable, reason = False, 'no BuildContext named context in scope'
+        else:
+            wireable, reason = True, None
+        const_start = tokens[own].start if own is not None and wireable else None
+        out.append(Candidate(lit.value, v, lit.line, lit.start, lit.end, const_start, wireable, reason))
+    return out
+
+
+# ── rewrite ──
+
+L10N_IMPORT = "import 'package:{package}/l10n/app_localizations.dart';"
+_IMPORT_LINE = re.compile(r"^import\s+['\"][^'\"]+['\"][^;\n]*;[ \t]*$", re.M)
+
+
+def accessor(key):
+    return f'AppLocalizations.of(context)!.{key}'
+
+
+def rewrite(text, edits, package):
+    """Apply [(candidate, arb key)] to one file; returns the new text."""
+    spans = []
+    for cand, key in edits:
+        spans.append((cand.start, cand.end, accessor(key)))
+        if cand.const_start is not None:
+            spans.append((cand.const_start, cand.const_start + len('const'), ''))
+    out, pos = [], 0
+    for start, end, replacement in sorted(set(spans)):
+        if start < pos:
+            continue
+        out.append(text[pos:start])
+        out.append(replacement)
+        pos = end
+        if replacement == '' and text[pos:pos + 1] == ' ':
+            pos += 1  # drop the space after a removed `const`
+    out.append(text[pos:])
+    new_text = ''.join(out)
+    if 'AppLocalizations' in new_text and 'app_localizations.dart' not in new_text:
+        line = L10N_IMPORT.format(package=package)
+        imports = list(_IMPORT_LINE.finditer(new_text))
+        at = imports[-1].end() if imports else 0
+        new_text = new_text[:at] + ('\n' if at else '') + line + ('' if at else '\n') + new_text[at:]
+    return new_text
+
+
+def is_dart_file(path):
+    return path.endswith('.dart') and not os.path.basename(path).startswith('app_localizations')
+
+
+# ── ARB ──
+
+ARB_DIR = os.path.join('..', 'lib', 'l10n')
+ARB_TEMPLATE = 'app_en.arb'
+PACKAGE = 'zafto'
+
+
+def arb_key(catalog_key):
+    """Catalog key -> ARB message name: common.save -> commonSave."""
+    parts = catalog_key.split('.')
+    return parts[0] + ''.join(p[:1].upper() + p[1:] for p in parts[1:])
+
@@ -0,0 +1,315 @@
+"""
+Persistent key <-> file:line index over the portal sources.
+
+Stores what _i18n_refs.py finds in every .ts/.tsx file of the four portals in
+.i18n-cache/refs.sqlite3, together with each file's content hash and its
+resolved imports. update() only re-tokenizes files whose hash changed (files
+whose size and mtime are unchanged are not even read), so after the first
+build a refresh is a directory walk plus a few stats, and queries answer
+from indexed SQLite tables in milliseconds:
+
+  key   -> every file:line that calls t('key'), reaches it through a
+           t(`prefix${...}`) template, or spells it out as a plain string
+  file  -> every key a file references
+  unused, rename impact and `_i18n_bundles.py --shake` read from here
+  instead of re-scanning; _i18n_routes.py follows the stored imports from
+  each page into the components it renders.
+
+Bumping SCANNER_VERSION (whenever _i18n_lexer/_i18n_refs change what they
+report) makes the next update() rebuild everything.
+
+Usage:
+  python _i18n_index.py update [--rebuild]
+  python _i18n_index.py key propertyManagement.rentRoll
+  python _i18n_index.py key 'books.*'
+  python _i18n_index.py file books/reconciliation/page.tsx
+  python _i18n_index.py unused [--ns jobs]
+  python _i18n_index.py rename jobs.title jobs.pageTitle
+  python _i18n_index.py stats
+"""
+import argparse, fnmatch, hashlib, os, re, sqlite3, sys, time
+
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale
+from _i18n_lexer import is_jsx_file, tokenize
+from _i18n_refs import PORTALS, Ref, import_specifiers, iter_sources, scan_tokens, used_keys
+
+INDEX_PATH = os.path.join('.i18n-cache', 'refs.sqlite3')
+SCANNER_VERSION = '1'
+RESOLVE_EXTS = ('.tsx', '.ts', '/index.tsx', '/index.ts')
+
+# Only strings shaped like a dotted key are kept for the "indirect" lookup
+KEY_LIKE = re.compile(r'^[A-Za-z_$][\w$]*(?:\.[\w$]+)+$')
+
+
+def norm(path):
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def resolve_import(spec, importer, portal_root):
+    """Source file an import specifier points at, or None for packages."""
+    if spec.startswith('@/'):
+        base = os.path.join(portal_root, spec[2:])
+    elif spec.startswith('.'):
+        base = os.path.join(os.path.dirname(importer), spec)
+    else:
+        return None
+    for ext in ('',) + RESOLVE_EXTS:
+        candidate = base + ext
+        if os.path.isfile(candidate):
+            return norm(candidate)
+    return None
+
+
+class KeyIndex:
+    """SQLite tables: files, refs (per call), strings (key-shaped literals), imports."""
+
+    def __init__(self, path=INDEX_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                portal TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS refs (
+                path TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                key TEXT,
+                line INTEGER NOT NULL,
+                snippet TEXT
+            );
+            CREATE INDEX IF NOT EXISTS refs_key ON refs (key);
+            CREATE INDEX IF NOT EXISTS refs_path ON refs (path);
+            CREATE TABLE IF NOT EXISTS strings (path TEXT NOT NULL, value TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS strings_value ON strings (value);
+            CREATE INDEX IF NOT EXISTS strings_path ON strings (path);
+            CREATE TABLE IF NOT EXISTS imports (path TEXT NOT NULL, target TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS imports_path ON imports (path);
+        """)
+
+    def _forget(self, path):
+        for table in ('files', 'refs', 'strings', 'imports'):
+            self.db.execute(f'DELETE FROM {table} WHERE path = ?', (path,))
+
+    def update(self, portals=None, rebuild=False):
+        """Bring the index in line with the sources. Returns {scanned, unchanged, removed}."""
+        stats = {'scanned': 0, 'unchanged': 0, 'removed': 0}
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'scanner'").fetchone()
+        if rebuild or not row or row[0] != SCANNER_VERSION:
+            self.db.executescript('DELETE FROM files; DELETE FROM refs; DELETE FROM strings; DELETE FROM imports;')
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('scanner', ?)", (SCANNER_VERSION,))
+        known = {path: (portal, h, size, mtime) for path, portal, h, size, mtime in
+                 self.db.execute('SELECT path, portal, hash, size, mtime FROM files')}
+        seen = set()
+        for portal, root in PORTALS.items():
+            if portals and portal not in portals:
+                continue
+            for src in iter_sources(root):
+                path = norm(src)
+                seen.add(path)
+                st = os.stat(src)
+                old = known.get(path)
+                if old and old[2] == st.st_size and old[3] == st.st_mtime_ns:
+                    stats['unchanged'] += 1
+                    continue
+                with open(src, 'rb') as f:
+                    data = f.read()
+                digest = hashlib.sha1(data).hexdigest()
+                if old and old[1] == digest:
+                    self.db.execute('UPDATE files SET size = ?, mtime = ? WHERE path = ?',
+                                    (st.st_size, st.st_mtime_ns, path))
+                    stats['unchanged'] += 1
+                    continue
+                self._index_file(path, portal, root, data.decode('utf-8', 'replace'))
+                self.db.execute('INSERT INTO files VALUES (?, ?, ?, ?, ?)',
+                                (path, portal, digest, st.st_size, st.st_mtime_ns))
+                stats['scanned'] += 1
+        for path, (portal, _, _, _) in known.items():
+            if path not in seen and (not portals or portal in portals):
+                self._forget(path)
+                stats['removed'] += 1
+        self.db.commit()
+        return stats
+
+    def _index_file(self, path, portal, root, text):
+        self._forget(path)
+        tokens = tokenize(text, jsx=is_jsx_file(path))
+        refs, strings = scan_tokens(tokens, text, path)
+        self.db.executemany('INSERT INTO refs VALUES (?, ?, ?, ?, ?)',
+                            [(path, r.kind, r.key, r.line, r.snippet) for r in refs])
+        called = {r.key for r in refs if r.kind == 'literal'}
+        self.db.executemany('INSERT INTO strings VALUES (?, ?)',
+                            [(path, s) for s in sorted(strings - called) if KEY_LIKE.match(s)])
+        targets = {resolve_import(spec, path, root) for spec in import_specifiers(tokens)}
+        targets.discard(None)
+        self.db.executemany('INSERT INTO imports VALUES (?, ?)', [(path, t) for t in sorted(targets)])
+
+    # ── queries ──
+
+    def _portal_filter(self, portals):
+        if not portals:
+            return '', []
+        marks = ','.join('?' * len(portals))
+        return f' AND path IN (SELECT path FROM files WHERE portal IN ({marks}))', list(portals)
+
+    def refs(self, portals=None):
+        """(refs, strings) as _i18n_refs.scan() would report them, without re-scanning."""
+        where, params = self._portal_filter(portals)
+        refs = [Ref(*row) for row in self.db.execute(
+            f'SELECT kind, key, path, line, snippet FROM refs WHERE 1 = 1{where}', params)]
+        strings = {v for (v,) in self.db.execute(f'SELECT DISTINCT value FROM strings WHERE 1 = 1{where}', params)}
+        return refs, strings
+
+    def by_file(self, portals=None):
+        """{path: (refs, strings)} so callers can take the union over any file set."""
+        where, params = self._portal_filter(portals)
+        out = {path: ([], set()) for (path,) in self.db.execute(f'SELECT path FROM files WHERE 1 = 1{where}', params)}
+        for row in self.db.execute(f'SELECT kind, key, path, line, snippet FROM refs WHERE 1 = 1{where}', params):
+            out[row[2]][0].append(Ref(*row))
+        for path, value in self.db.execute(f'SELECT path, value FROM strings WHERE 1 = 1{where}', params):
+            out[path][1].add(value)
+        return out
+
+    def used(self, catalog_keys, portals=None):
+        return used_keys(catalog_keys, *self.refs(portals))
+
+    def key_usages(self, key):
+        """[(path, line, how)] for one key: literal / prefix / dynamic-ns / indirect."""
+        rows = [(p, ln, 'literal') for p, ln in
+                self.db.execute("SELECT path, line FROM refs WHERE kind = 'literal' AND key = ?", (key,))]
+        rows += [(p, ln, f'prefix {k}') for p, ln, k in self.db.execute(
+            "SELECT path, line, key FROM refs WHERE kind = 'prefix' AND substr(?, 1, length(key)) = key", (key,))]
+        rows += [(p, ln, f'dynamic in {k}') for p, ln, k in self.db.execute(
+            "SELECT path, line, key FROM refs WHERE kind = 'dynamic' AND key IS NOT NULL "
+            "AND substr(?, 1, length(key)) = key", (key,))]
+        rows += [(p, 0, 'string') for (p,) in self.db.execute(
+            'SELECT path FROM strings WHERE value = ?', (key,))]
+        return sorted(rows)
+
+    def file_keys(self, path):
+        """(matched path, [(line, kind, key, snippet)]) for a path or unique path suffix."""
+        path = norm(path)
+        rows = self.db.execute('SELECT path FROM files WHERE path = ? OR path LIKE ?',
+                               (path, '%/' + path)).fetchall()
+        if len(rows) != 1:
+            return None, [r[0] for r in rows]
+        match = rows[0][0]
+        refs = self.db.execute('SELECT line, kind, key, snippet FROM refs WHERE path = ? ORDER BY line',
+                               (match,)).fetchall()
+        strings = [(0, 'string', v, None) for (v,) in
+                   self.db.execute('SELECT value FROM strings WHERE path = ? ORDER BY value', (match,))]
+        return match, refs + strings
+
+    def imports(self):
+        """{path: [imported source paths]} for the whole index."""
+        out = {}
+        for path, target in self.db.execute('SELECT path, target FROM imports'):
+            out.setdefault(path, []).append(target)
+        return out
+
+    def stats(self):
+        count = lambda table: self.db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        return {table: count(table) for table in ('files', 'refs', 'strings', 'imports')}
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Query the persistent key <-> file:line index.')
+    ap.add_argument('command', choices=['update', 'key', 'file', 'unused', 'rename', 'stats'])
+    ap.add_argument('args', nargs='*')
+    ap.add_argument('--path', default=INDEX_PATH)
+    ap.add_argument('--portal', action='append', choices=sorted(PORTALS), help='repeatable; default all')
+    ap.add_argument('--ns', help='namespace glob for unused')
+    ap.add_argument('--rebuild', action='store_true', help='re-scan every file')
+    ap.add_argument('--no-update', action='store_true', help='query the index as it is')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    index = KeyIndex(args.path)
+    stats = None
+    if args.command == 'update' or not args.no_update:
+        stats = index.update(args.portal, rebuild=args.rebuild)
+
+    if args.command == 'update':
+        print(f"{stats['scanned']} scanned, {stats['unchanged']} unchanged, {stats['removed']} removed")
+
+    elif args.command == 'key':
+        if not args.args:
+            ap.error('key needs a key or glob')
+        en_keys = set(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+        for pattern in args.args:
+            keys = sorted(fnmatch.filter(en_keys, pattern)) if any(c in pattern for c in '*?[') else [pattern]
+            for key in keys:
+                usages = index.key_usages(key)
+                flag = '' if key in en_keys else '  (not in en.json)'
+                print(f'{key}: {len(usages)} usage(s){flag}')
+                for path, line, how in usages:
+                    print(f'  {path}:{line}  {how}' if line else f'  {path}  {how}')
+
+    elif args.command == 'file':
+        if len(args.args) != 1:
+            ap.error('file needs one path')
+        match, rows = index.file_keys(args.args[0])
+        if match is None:
+            print(f'{len(rows)} indexed files match {args.args[0]!r}', file=sys.stderr)
+            for path in rows[:20]:
+                print(f'  {path}', file=sys.stderr)
+            index.close()
+            return 1
+        print(f'{match}: {len(rows)} reference(s)')
+        for line, kind, key, snippet in rows:
+            where = f'{line:5d}' if line else '     '
+            print(f'  {where}  {kind:8s} {key or ""}{"  " + snippet if snippet and kind != "literal" else ""}')
+
+    elif args.command == 'unused':
+        en_keys = set(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+        unused = sorted(k for k in en_keys - index.used(en_keys, args.portal)
+                        if not args.ns or fnmatch.fnmatchcase(k.split('.', 1)[0], args.ns))
+        for key in unused:
+            print(key)
+        print(f'{len(unused)} unused key(s)', file=sys.stderr)
+
+    elif args.command == 'rename':
+        if len(args.args) != 2:
+            ap.error('rename needs OLD NEW')
+        old, new = args.args
+        usages = index.key_usages(old)
+        literal = [u for u in usages if u[2] in ('literal', 'string')]
+        indirect = [u for u in usages if u[2] not in ('literal', 'string')]
+        files = sorted({u[0] for u in literal})
+        catalogs = [loc for loc in LOCALES if old in flatten(load_locale(loc, TRANS_DIR))]
+        taken = [loc for loc in LOCALES if new in flatten(load_locale(loc, TRANS_DIR))]
+        print(f'{old} -> {new}')
+        print(f'  {len(literal)} literal reference(s) in {len(files)} file(s)')
+        for path, line, how in literal:
+            print(f'    {path}:{line}  {how}' if line else f'    {path}  {how}')
+        if indirect:
+            print(f'  {len(indirect)} reference(s) that cannot be rewritten mechanically')
+            for path, line, how in indirect:
+                print(f'    {path}:{line}  {how}')
+        print(f"  catalogs holding {old}: {', '.join(catalogs) or 'none'}")
+        if taken:
+            print(f"  WARNING: {new} already exists in {', '.join(taken)}")
+
+    elif args.command == 'stats':
+        s = index.stats()
+        print(f"{s['files']} files, {s['refs']} calls, {s['strings']} key-like strings, "
+              f"{s['imports']} local imports in {args.path}")
+
+    index.close()
+    if args.command != 'unused':
+        print(f'({(time.perf_counter() - started) * 1000:.0f} ms)', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
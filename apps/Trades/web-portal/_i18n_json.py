@@ -0,0 +1,267 @@
+"""
+Stable, minimal-diff JSON serialization for the translation catalogs.
+
+Two ways to write a catalog:
+
+- canonical_dumps(data): keys sorted at every level, 2-space indent, UTF-8
+  kept as-is, trailing newline. Output depends only on content, never on the
+  order keys were inserted in.
+- minimal_dumps(old_text, new_data): edits the existing file text instead of
+  re-emitting it. Changed string values are spliced in place, and only the
+  objects that gained or lost members are re-rendered. Untouched bytes stay
+  exactly as they were. New keys go in at their sorted position, so a file
+  normalized once stays canonical.
+
+A one-key change is then a one-line diff, and concurrent branches that touch
+different namespaces no longer conflict.
+
+Usage:
+  python _i18n_json.py --check              # list catalogs that are not canonical
+  python _i18n_json.py --normalize es pl    # rewrite in canonical order
+  python _i18n_json.py --normalize --all
+"""
+import argparse, json, os, sys
+from json.decoder import scanstring
+
+_WS = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+
+def _sorted_tree(data):
+    if isinstance(data, dict):
+        return {k: _sorted_tree(data[k]) for k in sorted(data)}
+    return data
+
+
+def _render(data, depth=0):
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    return text.replace('\n', '\n' + '  ' * depth) if depth else text
+
+
+def canonical_dumps(data):
+    return _render(_sorted_tree(data)) + '\n'
+
+
+def index_spans(text):
+    """Map every value in a JSON document to its character span.
+
+    Returns (leaves, objects): leaves maps a key-path tuple to (start, end) of
+    each non-object value, objects does the same for objects (root is ()).
+    """
+    leaves, objects = {}, {}
+    n = len(text)
+
+    def skip(i):
+        while i < n and text[i] in _WS:
+            i += 1
+        return i
+
+    def value(i, path):
+        if text[i] != '{':
+            _, end = _decoder.raw_decode(text, i)
+            leaves[path] = (i, end)
+            return end
+        start = i
+        i = skip(i + 1)
+        if text[i] == '}':
+            objects[path] = (start, i + 1)
+            return i + 1
+        while True:
+            if text[i] != '"':
+                raise ValueError(f'expected a key at offset {i}')
+            key, i = scanstring(text, i + 1)
+            i = skip(i)
+            if text[i] != ':':
+                raise ValueError(f"expected ':' at offset {i}")
+            i = value(skip(i + 1), path + (key,))
+            i = skip(i)
+            if text[i] == ',':
+                i = skip(i + 1)
+            elif text[i] == '}':
+                objects[path] = (start, i + 1)
+                return i + 1
+            else:
+                raise ValueError(f"expected ',' or '}}' at offset {i}")
+
+    value(skip(0), ())
+    return leaves, objects
+
+
+def flat_diff(old, new, prefix=()):
+    """{path-tuple: new value or None} for every leaf that differs between two trees."""
+    changes = {}
+    for k, v in new.items():
+        path = prefix + (k,)
+        ov = old.get(k) if isinstance(old, dict) else None
+        if isinstance(v, dict):
+            if not isinstance(ov, dict):
+                if ov is not None:
+                    changes[path] = None
+                ov = {}
+            changes.update(flat_diff(ov, v, path))
+        elif ov != v:
+            if isinstance(ov, dict):
+                changes.update({p: None for p in flat_diff({}, ov, path)})
+            changes[path] = v
+    if isinstance(old, dict):
+        for k, ov in old.items():
+            if k not in new:
+                path = prefix + (k,)
+                if isinstance(ov, dict):
+                    changes.update({p: None for p in flat_diff({}, ov, path)})
+                    changes.setdefault(path, None)
+                else:
+                    changes[path] = None
+    return changes
+
+
+def _insert_sorted(d, key, value):
+    if key in d:
+        d[key] = value
+        return
+    items = list(d.items())
+    pos = next((i for i, (k, _) in enumerate(items) if k > key), len(items))
+    items.insert(pos, (key, value))
+    d.clear()
+    d.update(items)
+
+
+def _apply(tree, path, value):
+    node = tree
+    for part in path[:-1]:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = {}
+            _insert_sorted(node, part, child)
+        node = child
+    if value is None:
+        node.pop(path[-1], None)
+    else:
+        _insert_sorted(node, path[-1], value)
+
+
+def _prune_empty(tree, path):
+    # Drop namespaces a deletion left empty, innermost first
+    for cut in range(len(path) - 1, 0, -1):
+        parent = tree
+        for part in path[:cut - 1]:
+            parent = parent.get(part, {})
+        node = parent.get(path[cut - 1])
+        if isinstance(node, dict) and not node:
+            del parent[path[cut - 1]]
+        else:
+            break
+
+
+def _get(tree, path):
+    node = tree
+    for part in path:
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def patch_text(old_text, changes):
+    """Apply {path-tuple or dot-path: value-or-None} to JSON text, touching as few bytes as possible.
+
+    Returns (new_text, new_data).
+    """
+    changes = {tuple(k.split('.')) if isinstance(k, str) else k: v for k, v in changes.items()}
+    new_data = json.loads(old_text)
+    for path, value in changes.items():
+        _apply(new_data, path, value)
+        if value is None:
+            _prune_empty(new_data, path)
+
+    try:
+        leaves, objects = index_spans(old_text)
+    except ValueError:
+        return _render(new_data) + '\n', new_data
+
+    splices, targets = {}, set()
+    for path, value in changes.items():
+        if isinstance(value, str) and path in leaves:
+            splices[path] = value
+            continue
+        # Structural change: re-render the closest object that exists before and after
+        anchor = path[:-1]
+        while anchor and not (anchor in objects and isinstance(_get(new_data, anchor), dict)):
+            anchor = anchor[:-1]
+        targets.add(anchor)
+
+    # An object being re-rendered already covers its descendants
+    targets = {t for t in targets if not any(t[:i] in targets for i in range(len(t)))}
+    edits = []
+    for t in targets:
+        start, end = objects[t]
+        edits.append((start, end, _render(_get(new_data, t), len(t))))
+    for path, value in splices.items():
+        if any(path[:i] in targets for i in range(len(path))):
+            continue
+        start, end = leaves[path]
+        edits.append((start, end, json.dumps(value, ensure_ascii=False)))
+
+    out, pos = [], 0
+    for start, end, text in sorted(edits):
+        out.append(old_text[pos:start])
+        out.append(text)
+        pos = end
+    out.append(old_text[pos:])
+    new_text = ''.join(out)
+
+    if json.loads(new_text) != new_data:
+        # Should not happen; never trade correctness for a smaller diff
+        return _render(new_data) + '\n', new_data
+    return new_text, new_data
+
+
+def minimal_dumps(old_text, new_data):
+    """Serialize new_data as a minimal edit of old_text (canonical if there is no old text)."""
+    if old_text is None:
+        return canonical_dumps(new_data)
+    try:
+        old_data = json.loads(old_text)
+    except ValueError:
+        return canonical_dumps(new_data)
+    changes = flat_diff(old_data, new_data)
+    if not changes:
+        return old_text
+    return patch_text(old_text, changes)[0]
+
+
+def main(argv=None):
+    from _i18n_catalog import LOCALES, locale_path, write_if_changed
+
+    ap = argparse.ArgumentParser(description='Check or normalize catalog key order.')
+    ap.add_argument('locales', nargs='*')
+    ap.add_argument('--all', action='store_true')
+    mode = ap.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--check', action='store_true', help='exit 1 if any catalog is not canonical')
+    mode.add_argument('--normalize', action='store_true', help='rewrite catalogs in canonical order')
+    args = ap.parse_args(argv)
+
+    locales = LOCALES if args.all or not args.locales else args.locales
+    dirty = []
+    for loc in locales:
+        path = locale_path(loc)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        canonical = canonical_dumps(json.loads(text))
+        if text == canonical:
+            continue
+        dirty.append(loc)
+        if args.normalize:
+            write_if_changed(path, canonical)
+            print(f'normalized {path}')
+        else:
+            print(f'not canonical: {path}')
+    if args.check:
+        return 1 if dirty else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
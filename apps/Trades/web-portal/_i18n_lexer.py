@@ -0,0 +1,247 @@
+"""
+Single-pass tokenizer for the TS/TSX sources the translation tooling reads.
+
+Unlike the regex sweeps in the _wire_*.py scripts, the lexer knows where it
+is: inside a string, a template literal, a comment, a regex, a JSX tag or
+JSX text. So "Don't" in JSX text does not open a string, and a t('...') call
+inside a template substitution is still found.
+
+tokenize(text, jsx=True) returns a list of Token(kind, value, start, end, line):
+
+  ident      identifier or keyword               value = name
+  num        numeric literal                     value = raw text
+  str        '...' or "..." literal              value = unescaped text
+  template   `...` without substitutions         value = raw text
+  tmpl_head  `...${   tmpl_mid  }...${   tmpl_tail  }...`   value = raw text
+  regex      /.../flags                          value = raw text
+  punct      operator / punctuation              value = the operator
+  jsx_open   <Tag  (fragment: '')                value = tag name
+  jsx_attr   attribute name inside a tag         value = name
+  jsx_str    quoted attribute value              value = text (no escapes in JSX)
+  jsx_end    '>' or '/>' closing an opening tag  value = '>' or '/>'
+  jsx_close  </Tag>                              value = tag name
+  jsx_text   text between JSX tags               value = raw text (never blank)
+
+Comments and whitespace are skipped.
+"""
+import bisect, re
+from collections import namedtuple
+
+Token = namedtuple('Token', 'kind value start end line')
+
+_WS = re.compile(r'\s+')
+_LINE_COMMENT = re.compile(r'//[^\n]*')
+_BLOCK_COMMENT = re.compile(r'/\*.*?(?:\*/|\Z)', re.S)
+_IDENT = re.compile(r'[A-Za-z_$\u00c0-\u024f][\w$\u00c0-\u024f]*')
+_NUM = re.compile(r'(?:0[xXoObB][\da-fA-F_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?)n?')
+_STR = {
+    "'": re.compile(r"'((?:[^'\\\n]|\\.)*)(?:'|$)", re.S | re.M),
+    '"': re.compile(r'"((?:[^"\\\n]|\\.)*)(?:"|$)', re.S | re.M),
+}
+_TMPL_CHUNK = re.compile(r'((?:[^`\\$]|\\.|\$(?!\{))*)(`|\$\{|\Z)', re.S)
+_REGEX = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-zA-Z]*')
+_PUNCT = re.compile(
+    r'>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|\?\?=|&&=|\|\|=|'
+    r'=>|==|!=|<=|>=|&&|\|\||\?\?|\?\.(?!\d)|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|<<|\*\*|[^\s\w]'
+)
+_JSX_NAME = re.compile(r'[A-Za-z_$][\w$.:\-]*')
+_JSX_ATTR = re.compile(r'[A-Za-z_$][\w$:\-]*')
+_JSX_TEXT = re.compile(r'[^<{]+')
+# `<T extends X>(...) =>` and `<T,>(...) =>` are generic arrow functions, not JSX
+_GENERIC_PARAMS = re.compile(r'\s+extends\b|\s*,')
+_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\n|.)', re.S)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0', '\n': ''}
+
+# After these tokens a '/' starts a regex and a '<' may start JSX
+_EXPR_START_PUNCT = {
+    '(', ',', '=', ':', '?', '[', '{', '&&', '||', '??', '=>', '!', '+', '-', '*', '%',
+    '==', '===', '!=', '!==', '<', '>', '<=', '>=', '+=', '-=', '*=', '/=', '&', '|', '^', '~',
+    ';', '...', '??=', '&&=', '||=',
+}
+_EXPR_START_KEYWORDS = {'return', 'yield', 'await', 'case', 'default', 'else', 'typeof', 'void', 'delete', 'in', 'of', 'new', 'do'}
+
+
+def unescape(raw):
+    def sub(m):
+        esc = m.group(1)
+        if esc[0] == 'u':
+            return chr(int(esc[2:-1] if esc[1] == '{' else esc[1:], 16))
+        if esc[0] == 'x':
+            return chr(int(esc[1:], 16))
+        return _ESCAPES.get(esc, esc)
+    return _ESCAPE.sub(sub, raw) if '\\' in raw else raw
+
+
+def _expr_allowed(prev):
+    if prev is None:
+        return True
+    if prev.kind == 'punct':
+        return prev.value in _EXPR_START_PUNCT
+    if prev.kind == 'ident':
+        return prev.value in _EXPR_START_KEYWORDS
+    return False
+
+
+def tokenize(text, jsx=True):
+    tokens = []
+    newlines = [m.start() for m in re.finditer('\n', text)]
+    n = len(text)
+    pos = 0
+    prev = None
+    # Frames: ['js', brace_depth, kind] where kind is 'root', 'tmpl' or 'jsx';
+    #         ['tag', name] inside <Tag ...>; ['children', name] between <Tag> and </Tag>
+    stack = [['js', 0, 'root']]
+
+    def emit(kind, value, start, end):
+        nonlocal prev
+        tok = Token(kind, value, start, end, bisect.bisect_right(newlines, start - 1) + 1)
+        tokens.append(tok)
+        prev = tok
+
+    def template_chunk(start, head):
+        # Scan from just after ` or } up to the closing ` or the next ${
+        m = _TMPL_CHUNK.match(text, start)
+        raw, closer = m.group(1), m.group(2)
+        if closer == '${':
+            emit('tmpl_head' if head else 'tmpl_mid', raw, start - 1, m.end())
+            stack.append(['js', 0, 'tmpl'])
+        else:
+            emit('template' if head else 'tmpl_tail', raw, start - 1, m.end())
+        return m.end()
+
+    while pos < n:
+        frame = stack[-1]
+        mode = frame[0]
+
+        if mode == 'children':
+            c = text[pos]
+            if c == '{':
+                stack.append(['js', 0, 'jsx'])
+                emit('punct', '{', pos, pos + 1)
+                pos += 1
+            elif c == '<':
+                j = pos + 1
+                while j < n and text[j] in ' \t\r\n':
+                    j += 1
+                if j < n and text[j] == '/':
+                    m = _JSX_NAME.match(text, j + 1)
+                    name = m.group(0) if m else ''
+                    end = text.find('>', m.end() if m else j + 1)
+                    end = n if end < 0 else end + 1
+                    emit('jsx_close', name, pos, end)
+                    stack.pop()
+                    pos = end
+                else:
+                    m = _JSX_NAME.match(text, j)
+                    name = m.group(0) if m else ''
+                    emit('jsx_open', name, pos, m.end() if m else j)
+                    stack.append(['tag', name])
+                    pos = m.end() if m else j
+            else:
+                m = _JSX_TEXT.match(text, pos)
+                if m.group(0).strip():
+                    emit('jsx_text', m.group(0), pos, m.end())
+                pos = m.end()
+            continue
+
+        m = _WS.match(text, pos)
+        if m:
+            pos = m.end()
+            continue
+        c = text[pos]
+
+        if mode == 'tag':
+            if c == '/' and text.startswith('/>', pos):
+                emit('jsx_end', '/>', pos, pos + 2)
+                stack.pop()
+                pos += 2
+            elif c == '>':
+                emit('jsx_end', '>', pos, pos + 1)
+                stack[-1] = ['children', frame[1]]
+                pos += 1
+            elif c == '{':
+                stack.append(['js', 0, 'jsx'])
+                emit('punct', '{', pos, pos + 1)
+                pos += 1
+            elif c in '"\'':
+                end = text.find(c, pos + 1)
+                end = n if end < 0 else end + 1
+                emit('jsx_str', text[pos + 1:end - 1], pos, end)
+                pos = end
+            elif c == '=':
+                emit('punct', '=', pos, pos + 1)
+                pos += 1
+            else:
+                m = _JSX_ATTR.match(text, pos)
+                if m:
+                    emit('jsx_attr', m.group(0), pos, m.end())
+                    pos = m.end()
+                else:
+                    pos += 1  # stray character (e.g. TS generic on a component); skip it
+            continue
+
+        # js mode
+        if c == '/' and pos + 1 < n and text[pos + 1] in '/*':
+            m = (_LINE_COMMENT if text[pos + 1] == '/' else _BLOCK_COMMENT).match(text, pos)
+            pos = m.end()
+            continue
+        if c in '"\'':
+            m = _STR[c].match(text, pos)
+            emit('str', unescape(m.group(1)), pos, m.end())
+            pos = m.end()
+            continue
+        if c == '`':
+            pos = template_chunk(pos + 1, head=True)
+            continue
+        m = _IDENT.match(text, pos)
+        if m:
+            emit('ident', m.group(0), pos, m.end())
+            pos = m.end()
+            continue
+        if c.isdigit() or (c == '.' and pos + 1 < n and text[pos + 1].isdigit()):
+            m = _NUM.match(text, pos)
+            emit('num', m.group(0), pos, m.end())
+            pos = m.end()
+            continue
+        if c == '{':
+            frame[1] += 1
+            emit('punct', '{', pos, pos + 1)
+            pos += 1
+            continue
+        if c == '}':
+            if frame[1] > 0 or len(stack) == 1:
+                frame[1] = max(0, frame[1] - 1)
+                emit('punct', '}', pos, pos + 1)
+                pos += 1
+                continue
+            stack.pop()
+            if frame[2] == 'tmpl':
+                pos = template_chunk(pos + 1, head=False)
+            else:
+                emit('punct', '}', pos, pos + 1)
+                pos += 1
+            continue
+        if c == '/' and _expr_allowed(prev):
+            m = _REGEX.match(text, pos)
+            if m:
+                emit('regex', m.group(0), pos, m.end())
+                pos = m.end()
+                continue
+        if c == '<' and jsx and _expr_allowed(prev):
+            m = _JSX_NAME.match(text, pos + 1)
+            if (m or text.startswith('>', pos + 1)) and not (m and _GENERIC_PARAMS.match(text, m.end())):
+                name = m.group(0) if m else ''
+                end = m.end() if m else pos + 1
+                emit('jsx_open', name, pos, end)
+                stack.append(['tag', name])
+                pos = end
+                continue
+        m = _PUNCT.match(text, pos)
+        emit('punct', m.group(0), pos, m.end())
+        pos = m.end()
+
+    return tokens
+
+
+def is_jsx_file(path):
+    return path.endswith(('.tsx', '.jsx'))
@@ -0,0 +1,159 @@
+"""
+Generate next-intl messages/<locale>.json from the shared catalog.
+
+The web portal used to carry two dictionaries: src/lib/translations (the
+useTranslation() catalog, the source of truth for every _i18n_*.py tool) and
+messages/*.json, which src/i18n.ts hands to next-intl and the root layout
+serializes into every page through NextIntlClientProvider. They drifted:
+most messages files were verbatim English copies, and the 107 keys the two
+shared were shipped twice.
+
+messages/*.json is now a projection of src/lib/translations:
+
+  keys    only the keys that next-intl call sites reference
+          (useTranslations / getTranslations in the portal's sources), so
+          a key used through useTranslation() ships once, in the compiled
+          bundle, and not again in the page payload
+  values  the locale's text, English where it has none (next-intl has no
+          fallback of its own)
+
+Files are written canonically and only when their bytes change. Edit the
+catalog, not the messages files.
+
+Only the web portal is generated here. client/team/ops serve their own
+messages (a shared core plus per-portal overlays, see _i18n_core.py), not
+a projection of the web catalog, so --portal rejects them instead of
+overwriting their files.
+
+--import folds keys that so far exist only in messages/*.json into the
+catalog first (catalog values win on conflict), so nothing is lost when
+switching over; it only has to run once per portal. Only keys some source
+of the portal references (t() / useTranslations(), see _i18n_refs.py) are
+imported; the rest were dead text in messages/ and stay out of the catalog.
+
+Usage:
+  python _i18n_messages.py                 # regenerate web-portal messages/
+  python _i18n_messages.py --check         # exit 1 if messages/ is out of date
+  python _i18n_messages.py --import        # one-time: pull messages-only keys into the catalog
+"""
+import argparse, json, os, sys, time
+
+from _i18n_bulk_write import apply_changes
+from _i18n_bundles import merge_fallback
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, read_text, unflatten, write_if_changed
+from _i18n_json import canonical_dumps
+from _i18n_index import KeyIndex
+from _i18n_lexer import is_jsx_file, tokenize
+from _i18n_refs import PORTALS, iter_sources, read_source, scan_tokens, used_keys
+
+NEXT_INTL_HOOKS = {'useTranslations', 'getTranslations'}
+
+
+def messages_dir(portal):
+    return os.path.join(os.path.dirname(PORTALS[portal]), 'messages')
+
+
+def next_intl_keys(catalog_keys, portal='web'):
+    """Catalog keys referenced through next-intl in the portal's sources."""
+    refs, strings = [], set()
+    for path in iter_sources(PORTALS[portal]):
+        text = read_source(path)
+        if 'next-intl' not in text:
+            continue
+        file_refs, file_strings = scan_tokens(tokenize(text, jsx=is_jsx_file(path)), text, path, NEXT_INTL_HOOKS)
+        if file_refs:
+            refs.extend(file_refs)
+            strings |= file_strings
+    return used_keys(catalog_keys, refs, strings)
+
+
+def project(keys, locales=LOCALES, trans_dir=TRANS_DIR):
+    """{locale: nested messages dict} for `keys`, English filling the gaps."""
+    en_flat = flatten(load_locale(SOURCE_LOCALE, trans_dir))
+    en_flat = {k: v for k, v in en_flat.items() if k in keys}
+    out = {}
+    for loc in locales:
+        flat = {k: v for k, v in flatten(load_locale(loc, trans_dir)).items() if k in keys}
+        out[loc] = unflatten(merge_fallback(flat, en_flat))
+    return out
+
+
+def import_messages(portal='web', locales=LOCALES, trans_dir=TRANS_DIR, dry_run=False):
+    """Add keys found only in messages/*.json that the portal references to the catalog.
+
+    Returns (changes, conflicts).
+    """
+    src = messages_dir(portal)
+    msg_en = flatten(json.loads(read_text(os.path.join(src, f'{SOURCE_LOCALE}.json')) or '{}'))
+    index = KeyIndex()
+    index.update([portal])
+    referenced = used_keys(set(msg_en), *index.refs([portal]))
+    index.close()
+    changes, conflicts = {}, []
+    for loc in locales:
+        text = read_text(os.path.join(src, f'{loc}.json'))
+        if not text:
+            continue
+        catalog = flatten(load_locale(loc, trans_dir))
+        namespaces = {p for k in catalog for p in _parents(k)}
+        for key, value in flatten(json.loads(text)).items():
+            if key in catalog or not value or key not in referenced:
+                continue
+            if loc != SOURCE_LOCALE and value == msg_en.get(key):
+                continue  # an untranslated English copy
+            if key in namespaces or any(p in catalog for p in _parents(key)):
+                conflicts.append((loc, key))
+                continue
+            changes.setdefault(loc, {})[key] = value
+    if changes and not dry_run:
+        apply_changes(changes, trans_dir)
+    return changes, conflicts
+
+
+def _parents(key):
+    parts = key.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts))]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Generate next-intl messages from src/lib/translations.')
+    ap.add_argument('--portal', default='web', choices=sorted(PORTALS),
+                    help='only web; the other portals are written by _i18n_core.py')
+    ap.add_argument('--check', action='store_true', help='report stale files instead of writing them')
+    ap.add_argument('--import', dest='import_', action='store_true', help='pull messages-only keys into the catalog first')
+    args = ap.parse_args(argv)
+    if args.portal != 'web':
+        ap.error(f'--portal {args.portal}: its messages are a core + overlay of its own (_i18n_core.py), '
+                 'not a projection of the web catalog')
+
+    started = time.perf_counter()
+    if args.import_:
+        changes, conflicts = import_messages(args.portal, dry_run=args.check)
+        for loc, flat in changes.items():
+            print(f'  import {loc}: {len(flat)} key(s)')
+        for loc, key in conflicts:
+            print(f'  skip {loc} {key}: clashes with a catalog namespace or string', file=sys.stderr)
+
+    catalog_keys = set(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+    keys = next_intl_keys(catalog_keys, args.portal)
+    out_dir = messages_dir(args.portal)
+    stale = []
+    for loc, data in project(keys).items():
+        path = os.path.join(out_dir, f'{loc}.json')
+        text = canonical_dumps(data)
+        if args.check:
+            if read_text(path) != text:
+                stale.append(path)
+        elif write_if_changed(path, text):
+            stale.append(path)
+
+    elapsed = time.perf_counter() - started
+    verb = 'out of date' if args.check else 'written'
+    print(f'{len(keys)} next-intl key(s) from {PORTALS[args.portal]}; {len(stale)} file(s) {verb} in {elapsed:.2f}s')
+    for path in stale:
+        print(f'  {path}')
+    return 1 if args.check and stale else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
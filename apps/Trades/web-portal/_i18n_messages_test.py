@@ -0,0 +1,69 @@
+"""Tests for the next-intl messages projection (_i18n_messages.py).
+
+Usage (from apps/Trades/web-portal):
+  python -m unittest _i18n_messages_test
+"""
+
+import contextlib, io, json, os, tempfile, unittest
+
+from _i18n_catalog import read_text
+import _i18n_messages as messages
+
+NAV_PAGE = """'use client';
+import { useTranslations } from 'next-intl';
+
+export default function Nav() {
+  const t = useTranslations('nav');
+  return <a href="/">{t('home')}</a>;
+}
+"""
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class MessagesFixtureTest(unittest.TestCase):
+    """A scratch web-portal + client-portal tree; the tool runs from web-portal like in the repo."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        root = os.path.join(self.tmp.name, 'web-portal')
+        write(os.path.join(root, 'src', 'lib', 'translations', 'en.json'),
+              json.dumps({'nav': {'home': 'Home', 'jobs': 'Jobs'}}))
+        write(os.path.join(root, 'src', 'lib', 'translations', 'es.json'), json.dumps({'nav': {'home': 'Inicio'}}))
+        write(os.path.join(root, 'src', 'components', 'Nav.tsx'), NAV_PAGE)
+        self.client_en = os.path.join(self.tmp.name, 'client-portal', 'messages', 'en.json')
+        write(self.client_en, '{\n  "portal": {\n    "welcome": "Welcome back"\n  }\n}\n')
+        os.chdir(root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_main(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return messages.main(list(argv))
+
+    def test_client_portal_is_rejected_and_left_alone(self):
+        before = read_text(self.client_en)
+        for argv in (['--portal', 'client', '--check'], ['--portal', 'client'], ['--portal', 'client', '--import']):
+            with self.assertRaises(SystemExit) as cm:
+                self.run_main(*argv)
+            self.assertEqual(cm.exception.code, 2)
+        self.assertEqual(read_text(self.client_en), before)
+        self.assertEqual(os.listdir(os.path.dirname(self.client_en)), ['en.json'])
+
+    def test_web_projection_round_trips(self):
+        self.assertEqual(self.run_main('--check'), 1)
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(self.run_main('--check'), 0)
+        es = json.loads(read_text(os.path.join('messages', 'es.json')))
+        self.assertEqual(es, {'nav': {'home': 'Inicio'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
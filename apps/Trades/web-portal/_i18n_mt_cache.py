@@ -0,0 +1,185 @@
+"""
+Persistent cache for machine-translation results.
+
+Entries are content-addressed by sha256(source text, locale, provider,
+provider version, glossary hash) and stored in a local SQLite file. The cache
+is size-bounded: once the stored translations exceed max_bytes, the least
+recently used entries are evicted. Hit/miss counters persist across runs.
+
+CachedProvider wraps any TranslationProvider from _i18n_translate.py, so a
+re-run of a backfill only sends strings the cache has never seen.
+
+Usage:
+  python _i18n_mt_cache.py stats
+  python _i18n_mt_cache.py prune --max-mb 16
+  python _i18n_mt_cache.py clear
+"""
+import argparse, hashlib, json, os, sqlite3, sys, time
+
+from _i18n_translate import TranslationProvider
+
+CACHE_PATH = os.path.join('.i18n-cache', 'mt.sqlite3')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def glossary_hash(glossary):
+    if not glossary:
+        return ''
+    blob = json.dumps(glossary, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def cache_key(text, locale, provider, version, glossary=''):
+    blob = json.dumps([text, locale, provider, version, glossary], ensure_ascii=False)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """SQLite-backed LRU map of cache_key -> translated text."""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+        self.total_bytes = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys):
+        """Return {key: value} for the keys present, marking them recently used."""
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ','.join('?' * len(chunk))
+            rows = self.db.execute(f'SELECT key, value FROM entries WHERE key IN ({marks})', chunk)
+            found.update(rows)
+        if found:
+            now = time.time()
+            self.db.executemany('UPDATE entries SET last_used = ? WHERE key = ?', [(now, k) for k in found])
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        for key, value in items:
+            size = len(key) + len(value.encode('utf-8'))
+            old = self.db.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+            self.db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', (key, value, size, now))
+            self.total_bytes += size
+        if self.total_bytes > self.max_bytes:
+            self.evict(self.max_bytes)
+        self.db.commit()
+
+    def evict(self, target_bytes):
+        """Drop least recently used entries until the cache fits in target_bytes."""
+        rows = self.db.execute('SELECT key, size FROM entries ORDER BY last_used')
+        doomed = []
+        for key, size in rows:
+            if self.total_bytes <= target_bytes:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+        self.db.executemany('DELETE FROM entries WHERE key = ?', doomed)
+        self.evictions += len(doomed)
+        return len(doomed)
+
+    def clear(self):
+        self.db.execute('DELETE FROM entries')
+        self.db.execute('DELETE FROM counters')
+        self.db.commit()
+        self.total_bytes = 0
+
+    def stats(self):
+        saved = dict(self.db.execute('SELECT name, value FROM counters'))
+        hits = saved.get('hits', 0) + self.hits
+        misses = saved.get('misses', 0) + self.misses
+        return {
+            'entries': self.db.execute('SELECT COUNT(*) FROM entries').fetchone()[0],
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'evictions': saved.get('evictions', 0) + self.evictions,
+        }
+
+    def close(self):
+        """Fold this session's counters into the persistent totals."""
+        for name in ('hits', 'misses', 'evictions'):
+            self.db.execute(
+                'INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                (name, getattr(self, name)))
+            setattr(self, name, 0)
+        self.db.commit()
+        self.db.close()
+
+
+class CachedProvider(TranslationProvider):
+    """Read-through cache in front of another provider; only misses reach it."""
+
+    def __init__(self, inner, cache):
+        self.inner = inner
+        self.cache = cache
+        self.name = inner.name
+        self.version = inner.version
+        self.max_batch = inner.max_batch
+        self.glossary = inner.glossary
+
+    def supports(self, locale):
+        return self.inner.supports(locale)
+
+    async def translate_batch(self, texts, locale):
+        g = glossary_hash(self.inner.glossary)
+        keys = [cache_key(t, locale, self.inner.name, self.inner.version, g) for t in texts]
+        found = self.cache.get_many(keys)
+        missing = [i for i, k in enumerate(keys) if k not in found]
+        if missing:
+            fresh = await self.inner.translate_batch([texts[i] for i in missing], locale)
+            if len(fresh) != len(missing):
+                return fresh  # let the caller's length check report it
+            new_items = [(keys[i], value) for i, value in zip(missing, fresh)]
+            self.cache.put_many(new_items)
+            found.update(new_items)
+        return [found[k] for k in keys]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Inspect or trim the machine-translation cache.')
+    ap.add_argument('command', choices=['stats', 'prune', 'clear'])
+    ap.add_argument('--path', default=CACHE_PATH)
+    ap.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024)
+    args = ap.parse_args(argv)
+
+    cache = TranslationCache(args.path, int(args.max_mb * 1024 * 1024))
+    if args.command == 'clear':
+        cache.clear()
+        print(f'Cleared {args.path}')
+    elif args.command == 'prune':
+        dropped = cache.evict(cache.max_bytes)
+        cache.db.commit()
+        print(f'Evicted {dropped} entries')
+    s = cache.stats()
+    print(f"{s['entries']} entries, {s['bytes'] / 1024:.1f} KB of {s['max_bytes'] / 1024 / 1024:.0f} MB, "
+          f"{s['hits']} hits / {s['misses']} misses ({s['hit_rate']:.0%}), {s['evictions']} evicted")
+    cache.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Pseudo-locales: synthetic translations of en.json for layout and render
+stress tests.
+
+Text expansion (German- or Russian-length strings) and the render cost of
+long strings otherwise only show up once real translations land. A
+pseudo-locale shows them on day one, and every string that does not change
+on screen is a hardcoded one.
+
+  en-XA  accented: "Save" -> "[Šåṽé]". Every Latin letter gets a
+         diacritic, so fonts, line height and clipping of accents are
+         exercised while the text stays readable.
+  ar-XB  bidirectional: each word wrapped in RLM + RLO ... PDF + RLM, so it
+         renders right-to-left inside left-to-right layout. It catches
+         mirrored icons, alignment and concatenated strings.
+
+Both are padded with filler words to --expand times the English length
+(default 1.4, brackets included), so wrapping behaves like real longer text.
+They are also wrapped in [ ] so truncation is visible at a glance
+(--no-brackets to turn that off).
+Placeholders and ICU {x, plural, ...} groups are kept verbatim, so t()
+params still interpolate.
+
+The catalogs are written to src/lib/translations/<code>.json (gitignored).
+`_i18n_bundles.py --pseudo` compiles them into public/locales (exempt from
+the size budgets); `npm run i18n:pseudo` runs both. A plain bundle build,
+like the one `npm run build` starts, leaves them out, so they never ship.
+useTranslation() loads one when the NEXT_LOCALE cookie names it (the
+middleware leaves a pseudo cookie alone), and ar-XB sets dir="rtl" on the
+document. They are kept out of LOCALES, so nothing translates, checks or
+counts them, and they are not offered in the language picker.
+
+--routes N prints the N heaviest web-portal routes (_i18n_routes.py) with
+their English and pseudo text volume, so you know where to look first.
+
+Usage:
+  python _i18n_pseudo.py                         # en-XA and ar-XB, 1.4x
+  python _i18n_pseudo.py --only en-XA --expand 1.8
+  python _i18n_pseudo.py --no-brackets --routes 10
+  python _i18n_pseudo.py --clean                 # remove the generated catalogs
+"""
+import argparse, math, os, sys, time
+
+from _i18n_catalog import PSEUDO_LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, locale_path, unflatten, write_if_changed
+from _i18n_index import KeyIndex
+from _i18n_json import canonical_dumps
+from _i18n_routes import route_manifest
+
+DEFAULT_EXPAND = 1.4
+ACCENTS = dict(zip(
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'åƀçđéƒĝĥîĵķĺɱñöþǫŕšţûṽŵẋýžÅƁÇĐÉƑĜĤÎĴĶĹṀÑÖÞǪŔŠŢÛṼŴẊÝŽ',
+))
+FILLER = 'ẋẋ ŵåŕɱ ţéẋţ ƀöñûš ţŵö ţĥŕéé ƒöûŕ ƒîṽé šîẋ'.split()
+RLM, RLO, PDF = '\u200f', '\u202e', '\u202c'
+
+
+def _segments(text):
+    """[(is_literal, piece)]: brace groups ({name}, {n, plural, ...}) are not literal."""
+    out, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == '{':
+            if depth == 0 and i > start:
+                out.append((True, text[start:i]))
+                start = i
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                out.append((False, text[start:i + 1]))
+                start = i + 1
+    if start < len(text):
+        out.append((depth == 0, text[start:]))
+    return out
+
+
+def _accent(piece):
+    return ''.join(ACCENTS.get(ch, ch) for ch in piece)
+
+
+def _bidi(piece):
+    return ' '.join(f'{RLM}{RLO}{w}{PDF}{RLM}' if w else w for w in piece.split(' '))
+
+
+def _padding(missing):
+    """' ' + filler words, cut to `missing` characters ('' when there is no room)."""
+    text = ''
+    while len(text) < missing:
+        text += ' ' + FILLER[len(text) % len(FILLER)]
+    return text[:missing].rstrip() if missing > 1 else ''
+
+
+STYLES = {'en-XA': _accent, 'ar-XB': _bidi}
+
+
+def visible_len(text):
+    return len(text) - sum(text.count(c) for c in (RLM, RLO, PDF))
+
+
+def pseudo_value(text, style, expand=DEFAULT_EXPAND, brackets=True):
+    """One pseudo-localized catalog value; placeholders survive unchanged."""
+    transform = STYLES[style]
+    out = ''.join(transform(piece) if literal else piece for literal, piece in _segments(text))
+    out += transform(_padding(math.ceil(len(text) * expand) - len(text) - (2 if brackets else 0)))
+    return f'[{out}]' if brackets else out
+
+
+def pseudo_catalog(en_flat, style, expand=DEFAULT_EXPAND, brackets=True):
+    return {k: pseudo_value(v, style, expand, brackets) for k, v in en_flat.items()}
+
+
+def heaviest_routes(pseudo, en_flat, top):
+    """[(route, keys, en chars, pseudo chars)] by English text volume."""
+    index = KeyIndex()
+    index.update(['web'])
+    routes = route_manifest(index, set(en_flat))
+    index.close()
+    rows = []
+    for route, entry in routes.items():
+        keys = entry['keys']
+        rows.append((route, len(keys), sum(len(en_flat[k]) for k in keys), sum(visible_len(pseudo[k]) for k in keys)))
+    rows.sort(key=lambda r: (-r[2], r[0]))
+    return rows[:top]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Generate pseudo-locale catalogs from en.json.')
+    ap.add_argument('--only', action='append', choices=PSEUDO_LOCALES, help='repeatable; default all')
+    ap.add_argument('--expand', type=float, default=DEFAULT_EXPAND, help='target length / English length')
+    ap.add_argument('--no-brackets', dest='brackets', action='store_false', help='no [ ] truncation markers')
+    ap.add_argument('--routes', type=int, metavar='N', help='report the N heaviest routes')
+    ap.add_argument('--clean', action='store_true', help='delete the generated catalogs')
+    args = ap.parse_args(argv)
+    if args.expand < 1:
+        ap.error('--expand must be at least 1')
+
+    started = time.perf_counter()
+    codes = args.only or PSEUDO_LOCALES
+    if args.clean:
+        for code in codes:
+            path = locale_path(code, TRANS_DIR)
+            if os.path.exists(path):
+                os.unlink(path)
+                print(f'removed {path}')
+        return 0
+
+    en_flat = flatten(load_locale(SOURCE_LOCALE, TRANS_DIR))
+    en_chars = sum(len(v) for v in en_flat.values())
+    for code in codes:
+        pseudo = pseudo_catalog(en_flat, code, args.expand, args.brackets)
+        path = locale_path(code, TRANS_DIR)
+        written = write_if_changed(path, canonical_dumps(unflatten(pseudo)), durable=False)
+        chars = sum(visible_len(v) for v in pseudo.values())
+        print(f"{code}: {len(pseudo)} keys, {chars / en_chars:.2f}x English text -> {path}"
+              f"{'' if written else ' (unchanged)'}")
+    if args.routes:
+        pseudo = pseudo_catalog(en_flat, codes[0], args.expand, args.brackets)
+        print(f'\nheaviest routes ({codes[0]}):')
+        for route, keys, en, ps in heaviest_routes(pseudo, en_flat, args.routes):
+            print(f'  {en / 1000:6.1f}k -> {ps / 1000:6.1f}k chars  {keys:4d} keys  {route}')
+    print(f'({time.perf_counter() - started:.2f}s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
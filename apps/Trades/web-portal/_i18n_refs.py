@@ -0,0 +1,277 @@
+"""
+Static index of translation keys referenced from portal sources.
+
+Reads every .ts/.tsx file of the four portals with the _i18n_lexer tokenizer
+and records what each file's translation functions are called with. The
+function names come from the file itself:
+
+  const { t } = useTranslation();            t('common.save')
+  const { t: tr } = useTranslation();        tr('common.save')
+  const t = useTranslations('books');        t('cashBalance')   -> books.cashBalance
+
+so a local variable or a method that happens to be called t is not counted,
+and obj.t('...') never is.
+
+Each call is one of:
+
+  literal   first argument is a plain string: t('jobs.title')
+  prefix    template with a static head: t(`scheduling.status${s}`) keeps
+            every key under "scheduling.status"
+  dynamic   anything else: t(statusKey), t(cond ? 'a' : 'b'), t(`${ns}.x`)
+
+Dynamic calls are listed with file:line so they can be rewritten or reviewed.
+Keys they reach are usually spelled out elsewhere as plain strings
+(labelKey: 'nav.dashboard'), so any string literal in the sources that is
+exactly a catalog key also counts as referenced ("indirect").
+
+used_keys() is what `_i18n_bundles.py --shake` drops unreferenced keys with;
+the source catalogs in src/lib/translations are never touched.
+
+Usage:
+  python _i18n_refs.py                      # summary per portal
+  python _i18n_refs.py --dynamic            # list non-literal calls
+  python _i18n_refs.py --unused [--ns jobs] # catalog keys nothing references
+  python _i18n_refs.py --missing            # literal keys absent from en.json
+  python _i18n_refs.py --json > refs.json
+"""
+import argparse, fnmatch, json, os, sys, time
+from collections import namedtuple
+
+from _i18n_catalog import SOURCE_LOCALE, TRANS_DIR, flatten, load_locale
+from _i18n_lexer import is_jsx_file, tokenize
+
+PORTALS = {
+    'web': 'src',
+    'client': os.path.join('..', 'client-portal', 'src'),
+    'team': os.path.join('..', 'team-portal', 'src'),
+    'ops': os.path.join('..', 'ops-portal', 'src'),
+}
+SOURCE_EXTS = ('.ts', '.tsx')
+SKIP_DIRS = {'node_modules', '.next', '__tests__'}
+HOOKS = {'useTranslation', 'useTranslations', 'getTranslations'}
+
+Ref = namedtuple('Ref', 'kind key path line snippet')
+
+
+def iter_sources(root):
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for fname in sorted(files):
+            if fname.endswith(SOURCE_EXTS) and not fname.endswith('.d.ts'):
+                yield os.path.join(dirpath, fname)
+
+
+def _closing(tokens, i):
+    """Index of the token closing the bracket at tokens[i]."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        tok = tokens[j]
+        if tok.kind != 'punct':
+            continue
+        if tok.value in '([{':
+            depth += 1
+        elif tok.value in ')]}':
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+
+def translators(tokens, hooks=HOOKS):
+    """{local name: key prefix} for the translation functions a file binds.
+
+    Recognises `const { t, t: tr } = useTranslation()` and
+    `const t = useTranslations('ns')` (next-intl, keys relative to ns).
+    """
+    names = {}
+    for i, tok in enumerate(tokens):
+        if tok.kind != 'ident' or tok.value not in hooks:
+            continue
+        j = i - 1
+        if j > 0 and tokens[j].kind == 'ident' and tokens[j].value == 'await':
+            j -= 1
+        if j < 1 or tokens[j].value != '=':
+            continue
+        prefix = ''
+        if i + 2 < len(tokens) and tokens[i + 1].value == '(' and tokens[i + 2].kind == 'str':
+            prefix = tokens[i + 2].value + '.'
+        target = tokens[j - 1]
+        if target.kind == 'ident':
+            names[target.value] = prefix
+        elif target.value == '}':
+            k = j - 1
+            while k > 0 and tokens[k].value != '{':
+                k -= 1
+            members = tokens[k + 1:j - 1]
+            for m, member in enumerate(members):
+                if member.kind != 'ident' or member.value != 't':
+                    continue
+                after = members[m + 1] if m + 1 < len(members) else None
+                if after is not None and after.value == ':' and m + 2 < len(members):
+                    names[members[m + 2].value] = prefix
+                else:
+                    names['t'] = prefix
+    return names
+
+
+def import_specifiers(tokens):
+    """Module specifiers a file imports or re-exports, in source order.
+
+    Covers `import x from 'm'`, `import 'm'`, `export { x } from 'm'` and
+    `import('m')` / `next/dynamic(() => import('m'))`. Type-only imports are
+    included; they cost nothing to follow.
+    """
+    specs = []
+    last = len(tokens) - 1
+    for i, tok in enumerate(tokens):
+        if tok.kind != 'ident':
+            continue
+        if tok.value == 'from' and i < last and tokens[i + 1].kind == 'str':
+            specs.append(tokens[i + 1].value)
+        elif tok.value == 'import' and i < last:
+            nxt = tokens[i + 1]
+            if nxt.kind == 'str':
+                specs.append(nxt.value)
+            elif nxt.value == '(' and i + 2 <= last and tokens[i + 2].kind == 'str':
+                specs.append(tokens[i + 2].value)
+    return specs
+
+
+def scan_text(text, path, jsx=True):
+    """(refs, strings): every translation call plus every string literal in the file."""
+    return scan_tokens(tokenize(text, jsx=jsx), text, path)
+
+
+def scan_tokens(tokens, text, path, hooks=HOOKS):
+    """scan_text() for an already tokenized file."""
+    strings = {tok.value for tok in tokens if tok.kind in ('str', 'jsx_str', 'template')}
+    names = translators(tokens, hooks)
+    refs = []
+    if not names:
+        return refs, strings
+    last = len(tokens) - 1
+    for i, tok in enumerate(tokens):
+        if tok.kind != 'ident' or tok.value not in names or i >= last or tokens[i + 1].value != '(':
+            continue
+        if i and tokens[i - 1].value in ('.', '?.', 'function'):
+            continue
+        prefix = names[tok.value]
+        arg = tokens[i + 2] if i + 2 <= last else None
+        end = tokens[i + 3].value if i + 3 <= last else None
+        if arg is not None and arg.kind in ('str', 'template') and end in (',', ')'):
+            refs.append(Ref('literal', prefix + arg.value, path, tok.line, None))
+            continue
+        close = tokens[_closing(tokens, i + 1)]
+        snippet = ' '.join(text[tok.start:close.end].split())
+        if len(snippet) > 100:
+            snippet = snippet[:97] + '...'
+        if arg is not None and arg.kind == 'tmpl_head' and (prefix or arg.value):
+            refs.append(Ref('prefix', prefix + arg.value, path, tok.line, snippet))
+        else:
+            refs.append(Ref('dynamic', prefix or None, path, tok.line, snippet))
+    return refs, strings
+
+
+def scan(portals=None):
+    """{portal: (refs, strings, files)} over the portals' source trees."""
+    out = {}
+    for portal, root in PORTALS.items():
+        if portals and portal not in portals:
+            continue
+        refs, strings, files = [], set(), 0
+        for path in iter_sources(root):
+            file_refs, file_strings = scan_text(read_source(path), path, jsx=is_jsx_file(path))
+            refs.extend(file_refs)
+            strings |= file_strings
+            files += 1
+        out[portal] = (refs, strings, files)
+    return out
+
+
+def read_source(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def used_keys(catalog_keys, refs, strings):
+    """Subset of catalog_keys reachable from refs, plus literals naming a key."""
+    catalog_keys = set(catalog_keys)
+    used = {r.key for r in refs if r.kind == 'literal'} & catalog_keys
+    used |= strings & catalog_keys
+    prefixes = tuple({r.key for r in refs if r.kind == 'prefix'})
+    if prefixes:
+        used |= {k for k in catalog_keys if k.startswith(prefixes)}
+    # next-intl t(x) with a namespace: any key of that namespace may be reached
+    namespaces = tuple({r.key for r in refs if r.kind == 'dynamic' and r.key})
+    if namespaces:
+        used |= {k for k in catalog_keys if k.startswith(namespaces)}
+    return used
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Index translation keys referenced from portal sources.')
+    ap.add_argument('--portal', action='append', choices=sorted(PORTALS), help='repeatable; default all')
+    ap.add_argument('--dynamic', action='store_true', help='list non-literal t() calls')
+    ap.add_argument('--unused', action='store_true', help='list en keys no portal references')
+    ap.add_argument('--missing', action='store_true', help='list literal keys absent from en.json')
+    ap.add_argument('--ns', help='namespace glob for --unused/--missing')
+    ap.add_argument('--json', action='store_true')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    results = scan(args.portal)
+    en_keys = set(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+    all_refs = [r for refs, _, _ in results.values() for r in refs]
+    all_strings = set().union(*(s for _, s, _ in results.values())) if results else set()
+    used = used_keys(en_keys, all_refs, all_strings)
+    elapsed = time.perf_counter() - started
+
+    def in_ns(key):
+        return not args.ns or fnmatch.fnmatchcase(key.split('.', 1)[0], args.ns)
+
+    unused = sorted(k for k in en_keys - used if in_ns(k))
+    missing = sorted({r.key for r in all_refs if r.kind == 'literal' and r.key not in en_keys and in_ns(r.key)})
+
+    if args.json:
+        json.dump({
+            'portals': {
+                portal: {
+                    'files': files,
+                    'literal': sorted({r.key for r in refs if r.kind == 'literal'}),
+                    'prefix': sorted({r.key for r in refs if r.kind == 'prefix'}),
+                    'dynamic': [f'{r.path}:{r.line}: {r.snippet}' for r in refs if r.kind == 'dynamic'],
+                }
+                for portal, (refs, _, files) in results.items()
+            },
+            'used': len(used),
+            'unused': unused,
+            'missing': missing,
+        }, sys.stdout, indent=2)
+        print()
+        return 0
+
+    for portal, (refs, strings, files) in results.items():
+        counts = {kind: sum(1 for r in refs if r.kind == kind) for kind in ('literal', 'prefix', 'dynamic')}
+        print(f"{portal:7s} {files:4d} files  {counts['literal']:5d} literal  "
+              f"{counts['prefix']:3d} prefix  {counts['dynamic']:3d} dynamic calls")
+    print(f'{len(used)} of {len(en_keys)} en keys referenced, {len(en_keys - used)} unused, '
+          f'{len(missing)} referenced but missing ({elapsed:.2f}s)')
+
+    if args.dynamic:
+        print('\nnon-literal calls:')
+        for r in all_refs:
+            if r.kind != 'literal':
+                print(f'  {r.path}:{r.line}: {r.snippet}')
+    if args.unused:
+        print('\nunused:')
+        for key in unused:
+            print(f'  {key}')
+    if args.missing:
+        print('\nmissing from en.json:')
+        for key in missing:
+            print(f'  {key}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
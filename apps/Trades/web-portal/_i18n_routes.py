@@ -0,0 +1,152 @@
+"""
+Route -> required translation keys manifest for the web portal.
+
+For every src/app/**/page.tsx, follows the page, the layout.tsx files above
+it and everything they import (transitively, local sources only) through
+the import graph stored by _i18n_index.py, and unions the keys those files
+reference. The result says which slice of a locale bundle a route can ever
+render, so the client loads just the namespace chunks of that slice instead
+of the whole dictionary.
+
+Writes public/locales/routes.json next to the bundles (gitignored, rebuilt by
+`npm run i18n:build`):
+
+  {
+    "version": 1,
+    "routes": {
+      "/dashboard/books/reconciliation": {
+        "files": 14,
+        "namespaces": ["booksRecon", "booksReconciliation", "common", ...],
+        "keys": ["booksRecon.bankAccount", ...]
+      },
+      "/dashboard/jobs/[id]": {...},
+      ...
+    }
+  }
+
+Route patterns keep Next.js segment syntax ([id], [...slug], [[...slug]]);
+route groups like (auth) are dropped. useTranslation()
+(src/lib/translations/index.ts) matches the current pathname against it
+(matchRoute()/routeNamespaces() in runtime.ts) and fetches the route's
+namespace chunks; an unknown route loads the whole bundle.
+
+Keys reached only through a dynamic t(x) are counted when the same files
+spell them out as strings, exactly as for `_i18n_bundles.py --shake`;
+`python _i18n_refs.py --dynamic` lists the calls to review.
+
+Usage:
+  python _i18n_routes.py
+  python _i18n_routes.py --route /dashboard/books     # print one route's keys
+  python _i18n_routes.py --out /tmp/locales
+"""
+import argparse, os, sys, time
+
+from _i18n_bundles import OUT_DIR, ROUTES, chunk_text
+from _i18n_catalog import SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, write_if_changed
+from _i18n_index import KeyIndex, norm
+from _i18n_refs import PORTALS, used_keys
+
+APP_DIR = os.path.join(PORTALS['web'], 'app')
+
+
+def route_of(page_path, app_dir=APP_DIR):
+    """src/app/(auth)/dashboard/jobs/[id]/page.tsx -> /dashboard/jobs/[id]"""
+    rel = os.path.relpath(os.path.dirname(page_path), app_dir).replace(os.sep, '/')
+    parts = [p for p in rel.split('/') if p not in ('', '.') and not (p.startswith('(') and p.endswith(')'))]
+    return '/' + '/'.join(parts)
+
+
+def layouts_above(page_path, app_dir, files):
+    """layout.tsx files from the app root down to the page's own directory."""
+    out = []
+    d = norm(os.path.dirname(page_path))
+    root = norm(app_dir)
+    while True:
+        candidate = f'{d}/layout.tsx'
+        if candidate in files:
+            out.append(candidate)
+        if d == root or '/' not in d:
+            break
+        d = d.rsplit('/', 1)[0]
+    return out[::-1]
+
+
+def closure(entries, imports):
+    """Every source file reachable from entries through local imports."""
+    seen, stack = set(), list(entries)
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        stack.extend(imports.get(path, ()))
+    return seen
+
+
+def pages(per_file, app_dir=APP_DIR):
+    root = norm(app_dir) + '/'
+    return sorted(p for p in per_file if p.startswith(root) and p.endswith('/page.tsx'))
+
+
+def route_files(page, per_file, imports, app_dir=APP_DIR):
+    """Layouts above the page, the page, then everything they import."""
+    entries = layouts_above(page, app_dir, per_file) + [page]
+    return entries + sorted(closure(entries, imports) - set(entries))
+
+
+def route_manifest(index, catalog_keys, app_dir=APP_DIR):
+    """{route: {files, namespaces, keys}} for every page under app_dir."""
+    per_file = index.by_file(['web'])
+    imports = index.imports()
+    routes = {}
+    for page in pages(per_file, app_dir):
+        files = route_files(page, per_file, imports, app_dir)
+        refs, strings = [], set()
+        for path in files:
+            file_refs, file_strings = per_file.get(path, ((), ()))
+            refs.extend(file_refs)
+            strings.update(file_strings)
+        keys = sorted(used_keys(catalog_keys, refs, strings))
+        routes[route_of(page, app_dir)] = {
+            'files': len(files),
+            'namespaces': sorted({k.split('.', 1)[0] for k in keys}),
+            'keys': keys,
+        }
+    return routes
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Compute the translation keys each web-portal route needs.')
+    ap.add_argument('--out', default=OUT_DIR)
+    ap.add_argument('--route', help='print the keys of one route instead of writing the manifest')
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    index = KeyIndex()
+    index.update(['web'])
+    catalog_keys = set(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+    routes = route_manifest(index, catalog_keys)
+    index.close()
+
+    if args.route:
+        entry = routes.get(args.route)
+        if entry is None:
+            print(f'no page for {args.route}', file=sys.stderr)
+            return 1
+        print(f"{args.route}: {len(entry['keys'])} keys in {len(entry['namespaces'])} namespaces "
+              f"from {entry['files']} files")
+        for key in entry['keys']:
+            print(f'  {key}')
+        return 0
+
+    write_if_changed(os.path.join(args.out, ROUTES), chunk_text({'version': 1, 'routes': routes}), durable=False)
+    elapsed = time.perf_counter() - started
+    sizes = sorted(len(e['keys']) for e in routes.values())
+    print(f'{len(routes)} routes -> {os.path.join(args.out, ROUTES)} in {elapsed:.2f}s')
+    if sizes:
+        print(f'  keys per route: median {sizes[len(sizes) // 2]}, max {sizes[-1]} of {len(catalog_keys)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
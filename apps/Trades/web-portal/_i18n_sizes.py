@@ -0,0 +1,238 @@
+"""
+Size history for the translation catalogs.
+
+`python _i18n_sizes.py record` (or `python _i18n_bundles.py --history`) measures
+src/lib/translations/<locale>.json -- raw file bytes, minified bytes, gzip
+bytes and key count per locale and per namespace -- and appends one JSON line
+to i18n-size-history.jsonl when the catalogs changed since the last entry.
+Lines are never rewritten.
+
+One line:
+
+  {"id": "3f16d74cb7", "at": "2026-10-19T05:40:00Z", "label": "e4b4292",
+   "locales": {"en": [raw, min, gzip, keys], ...},
+   "namespaces": {"books": {"en": [min, gzip, keys], ...}, ...}}
+
+The English catalog of each entry is also kept (gzipped, a few dozen KB) in
+.i18n-cache/sizes/<id>.json.gz so a diff can name keys, not just bytes.
+
+`diff` compares the catalogs on disk against any entry: per-locale growth,
+the namespaces that grew most, English values that became duplicates, and
+English keys added since that entry which some locales still lack. All
+offline; a record or diff takes well under a second.
+
+Usage:
+  python _i18n_sizes.py record [--label round9]
+  python _i18n_sizes.py log
+  python _i18n_sizes.py diff            # against the latest entry
+  python _i18n_sizes.py diff -3         # third-latest entry
+  python _i18n_sizes.py diff 3f16d7     # entry by id prefix
+"""
+import argparse, gzip, hashlib, json, os, subprocess, sys, time
+
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, locale_path, read_text
+
+HISTORY_PATH = 'i18n-size-history.jsonl'
+SNAPSHOT_DIR = os.path.join('.i18n-cache', 'sizes')
+
+
+def _min_bytes(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _count(value):
+    return sum(_count(v) for v in value.values()) if isinstance(value, dict) else int(isinstance(value, str))
+
+
+def measure(locales=LOCALES, trans_dir=TRANS_DIR):
+    """(entry without id/at/label, parsed catalogs, catalog hash) for the files on disk."""
+    digest = hashlib.sha256()
+    per_locale, per_ns, catalogs = {}, {}, {}
+    for loc in locales:
+        text = read_text(locale_path(loc, trans_dir)) or '{}'
+        raw = text.encode('utf-8')
+        digest.update(loc.encode('utf-8') + b'\0' + raw + b'\0')
+        data = json.loads(text)
+        catalogs[loc] = data
+        packed = _min_bytes(data)
+        per_locale[loc] = [len(raw), len(packed), len(gzip.compress(packed, 6)), _count(data)]
+        for ns, value in data.items():
+            packed = _min_bytes(value)
+            per_ns.setdefault(ns, {})[loc] = [len(packed), len(gzip.compress(packed, 6)), _count(value)]
+    entry = {'locales': per_locale, 'namespaces': {ns: per_ns[ns] for ns in sorted(per_ns)}}
+    return entry, catalogs, digest.hexdigest()[:10]
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def git_label():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=2)
+    except (OSError, subprocess.SubprocessError):
+        return ''
+    return out.stdout.strip() if out.returncode == 0 else ''
+
+
+def record(label=None, path=HISTORY_PATH, snapshot_dir=SNAPSHOT_DIR, trans_dir=TRANS_DIR):
+    """Append an entry if the catalogs changed since the last one. Returns (entry, appended)."""
+    entry, catalogs, catalog_id = measure(trans_dir=trans_dir)
+    history = load_history(path)
+    if history and history[-1]['id'] == catalog_id:
+        return history[-1], False
+    entry = {
+        'id': catalog_id,
+        'at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'label': git_label() if label is None else label,
+        **entry,
+    }
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(os.path.join(snapshot_dir, f'{catalog_id}.json.gz'), 'wb') as f:
+        f.write(gzip.compress(_min_bytes(flatten(catalogs.get(SOURCE_LOCALE, {}))), 6, mtime=0))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+    return entry, True
+
+
+def find_entry(history, ref):
+    if not history:
+        return None
+    if ref is None:
+        return history[-1]
+    if ref.lstrip('-').isdigit():
+        i = int(ref)
+        return history[i] if -len(history) <= i < len(history) else None
+    matches = [e for e in history if e['id'].startswith(ref)]
+    return matches[-1] if matches else None
+
+
+def load_snapshot(entry, snapshot_dir=SNAPSHOT_DIR):
+    path = os.path.join(snapshot_dir, f"{entry['id']}.json.gz")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return json.loads(gzip.decompress(f.read()))
+
+
+def duplicate_values(flat):
+    """{value: sorted keys} for English strings used by more than one key."""
+    by_value = {}
+    for key, value in flat.items():
+        by_value.setdefault(value, []).append(key)
+    return {v: sorted(keys) for v, keys in by_value.items() if len(keys) > 1}
+
+
+def diff(base, current, base_en, catalogs, top=10):
+    """Regression report of `current` (a measure() entry) against history entry `base`."""
+    report = {'locales': {}, 'namespaces': [], 'duplicates': None, 'untranslated': None}
+    for loc, now in current['locales'].items():
+        then = base['locales'].get(loc, [0, 0, 0, 0])
+        report['locales'][loc] = [n - t for n, t in zip(now, then)]
+
+    growth = []
+    for ns in set(current['namespaces']) | set(base['namespaces']):
+        now, then = current['namespaces'].get(ns, {}), base['namespaces'].get(ns, {})
+        gz = sum(v[1] for v in now.values()) - sum(v[1] for v in then.values())
+        keys = now.get(SOURCE_LOCALE, [0, 0, 0])[2] - then.get(SOURCE_LOCALE, [0, 0, 0])[2]
+        if gz or keys:
+            growth.append((gz, keys, ns))
+    growth.sort(reverse=True)
+    report['namespaces'] = growth[:top]
+
+    if base_en is not None:
+        en = flatten(catalogs.get(SOURCE_LOCALE, {}))
+        before = duplicate_values(base_en)
+        report['duplicates'] = {v: keys for v, keys in duplicate_values(en).items()
+                                if v not in before or len(keys) > len(before[v])}
+        added = [k for k in en if k not in base_en]
+        untranslated = {}
+        for loc, data in catalogs.items():
+            if loc == SOURCE_LOCALE:
+                continue
+            flat = flatten(data)
+            missing = [k for k in added if not flat.get(k)]
+            if missing:
+                untranslated[loc] = missing
+        report['untranslated'] = {'added': added, 'missing': untranslated}
+    return report
+
+
+def _kb(n):
+    return f'{n / 1024:+.1f} KB'
+
+
+def print_report(base, report, top=10):
+    print(f"vs {base['id']} ({base['at']}{', ' + base['label'] if base.get('label') else ''})")
+    print(f"\n{'locale':6s} {'raw':>10s} {'min':>10s} {'gzip':>10s} {'keys':>6s}")
+    for loc, (raw, packed, gz, keys) in report['locales'].items():
+        print(f'{loc:6s} {_kb(raw):>10s} {_kb(packed):>10s} {_kb(gz):>10s} {keys:+6d}')
+
+    if report['namespaces']:
+        print('\ntop namespaces by gzip growth (all locales):')
+        for gz, keys, ns in report['namespaces']:
+            print(f'  {ns:30s} {_kb(gz):>10s} {keys:+5d} en keys')
+
+    if report['untranslated'] is None:
+        print(f"\n(no English snapshot for {base['id']} in {SNAPSHOT_DIR}; key-level checks skipped)")
+        return
+    dups = report['duplicates']
+    print(f'\n{len(dups)} new duplicate English value(s)')
+    for value, keys in list(dups.items())[:top]:
+        print(f"  {value[:40]!r}: {', '.join(keys[:4])}{' ...' if len(keys) > 4 else ''}")
+    added = report['untranslated']['added']
+    missing = report['untranslated']['missing']
+    print(f'\n{len(added)} English key(s) added; untranslated since:')
+    for loc, keys in missing.items():
+        print(f"  {loc:6s} {len(keys):5d}  {', '.join(keys[:3])}{' ...' if len(keys) > 3 else ''}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Record and compare translation catalog sizes.')
+    ap.add_argument('command', choices=['record', 'log', 'diff'])
+    ap.add_argument('ref', nargs='?', help='history entry for diff: index (-1 = latest) or id prefix')
+    ap.add_argument('--label', help='label for record (default: git HEAD)')
+    ap.add_argument('--top', type=int, default=10)
+    ap.add_argument('--json', action='store_true', help='print the diff report as JSON')
+    ap.add_argument('--history', default=HISTORY_PATH)
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == 'record':
+        entry, appended = record(args.label, args.history)
+        en = entry['locales'].get(SOURCE_LOCALE, [0, 0, 0, 0])
+        state = 'recorded' if appended else 'unchanged since'
+        print(f"{state} {entry['id']}: en {en[0] / 1024:.1f} KB raw, {en[2] / 1024:.1f} KB gzip, {en[3]} keys "
+              f'({time.perf_counter() - started:.2f}s)')
+        return 0
+
+    history = load_history(args.history)
+    if args.command == 'log':
+        for i, entry in enumerate(history):
+            en = entry['locales'].get(SOURCE_LOCALE, [0, 0, 0, 0])
+            total = sum(v[0] for v in entry['locales'].values())
+            print(f"{i - len(history):4d} {entry['id']} {entry['at']} {entry.get('label', ''):10s} "
+                  f"en {en[0] / 1024:7.1f} KB {en[3]:5d} keys, all locales {total / 1024:8.1f} KB")
+        return 0
+
+    base = find_entry(history, args.ref)
+    if base is None:
+        print(f"no history entry {args.ref or ''} in {args.history}; run `python _i18n_sizes.py record` first",
+              file=sys.stderr)
+        return 1
+    current, catalogs, _ = measure()
+    report = diff(base, current, load_snapshot(base), catalogs, args.top)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(base, report, args.top)
+        print(f'\n({time.perf_counter() - started:.2f}s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
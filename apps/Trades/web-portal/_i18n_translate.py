@@ -0,0 +1,342 @@
+"""
+Machine-translation backfill for src/lib/translations.
+
+Finds the keys each target locale is missing, groups them by distinct English
+text, and sends the texts through a translation provider in batches. Batches
+for all requested locales run concurrently (bounded by --concurrency) and are
+retried with exponential backoff on transient failures. Results are applied to
+the locale catalog as each batch completes and checkpointed to disk every
+--flush-every batches, so an interrupted run keeps what it already translated.
+
+Replaces hand-typed dicts like the ones in _translate_round7_es.py and the
+_5lang_batch*.py scripts.
+
+Every provider is fronted by the on-disk cache in _i18n_mt_cache.py, so a
+re-run only pays for strings that were never translated before.
+
+--glossary pins terms: a JSON object of {english: translation} or
+{english: {locale: translation}}. A text equal to a term is not sent at all.
+Inside longer texts each term is swapped for a {_gN} placeholder, which
+providers keep verbatim, and the pinned translation is put back afterwards.
+
+The default 'stub' provider only produces '[es] Save' placeholders, so it
+always runs as --dry-run and never writes the catalogs.
+
+Usage:
+  python _i18n_translate.py es pl zh                   # deterministic stub, dry run
+  python _i18n_translate.py ko ru --provider deepl --concurrency 4
+  python _i18n_translate.py --all --include-identical --dry-run
+  python _i18n_translate.py es --provider deepl --glossary glossary.json
+"""
+import argparse, asyncio, json, os, random, re, sys, time
+import urllib.error, urllib.request
+from xml.sax.saxutils import escape, unescape
+
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, load_same_as_en, save_locale, set_path
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+class ProviderError(Exception):
+    """A batch failed and retrying will not help (bad request, quota, unsupported locale)."""
+
+
+class TransientProviderError(ProviderError):
+    """A batch failed in a way worth retrying (timeout, 429, 5xx)."""
+
+
+class TranslationProvider:
+    """Base class for translation backends.
+
+    Subclasses only implement translate_batch(); batching, concurrency,
+    retries and writing results are handled by backfill().
+    """
+    name = 'base'
+    version = '1'
+    max_batch = 50
+    glossary = None  # {english: translation or {locale: translation}}; see translate_with_glossary()
+
+    def supports(self, locale):
+        return True
+
+    async def translate_batch(self, texts, locale):
+        """Return one translation per input text, in the same order."""
+        raise NotImplementedError
+
+
+class StubProvider(TranslationProvider):
+    """Deterministic offline provider for tests and dry runs.
+
+    Returns '[<locale>] <text>' with {placeholders} untouched, so the same
+    input always produces the same catalog.
+    """
+    name = 'stub'
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def translate_batch(self, texts, locale):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [f'[{locale}] {text}' for text in texts]
+
+
+def _protect(text):
+    # DeepL runs with tag_handling=xml; <x> is in ignore_tags so {name} survives
+    return PLACEHOLDER.sub(r'<x>{\1}</x>', escape(text))
+
+
+def _restore(text):
+    return unescape(re.sub(r'</?x>', '', text))
+
+
+class DeepLProvider(TranslationProvider):
+    """DeepL REST API. Reads the key from DEEPL_API_KEY (':fx' keys use the free endpoint)."""
+    name = 'deepl'
+    version = 'v2'
+    max_batch = 50
+    TARGETS = {'es': 'ES', 'pt-BR': 'PT-BR', 'pl': 'PL', 'zh': 'ZH-HANS', 'ru': 'RU', 'ko': 'KO'}
+
+    def __init__(self, api_key=None, timeout=30):
+        self.api_key = api_key or os.environ.get('DEEPL_API_KEY', '')
+        if not self.api_key:
+            raise ProviderError('DEEPL_API_KEY is not set')
+        host = 'api-free.deepl.com' if self.api_key.endswith(':fx') else 'api.deepl.com'
+        self.url = f'https://{host}/v2/translate'
+        self.timeout = timeout
+
+    def supports(self, locale):
+        return locale in self.TARGETS
+
+    async def translate_batch(self, texts, locale):
+        return await asyncio.to_thread(self._post, texts, locale)
+
+    def _post(self, texts, locale):
+        body = json.dumps({
+            'text': [_protect(t) for t in texts],
+            'source_lang': 'EN',
+            'target_lang': self.TARGETS[locale],
+            'tag_handling': 'xml',
+            'ignore_tags': ['x'],
+        }).encode('utf-8')
+        req = urllib.request.Request(self.url, data=body, headers={
+            'Authorization': f'DeepL-Auth-Key {self.api_key}',
+            'Content-Type': 'application/json',
+        })
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload = json.load(resp)
+        except urllib.error.HTTPError as e:
+            if e.code == 429 or e.code >= 500:
+                raise TransientProviderError(f'DeepL HTTP {e.code}') from e
+            raise ProviderError(f'DeepL HTTP {e.code}: {e.read()[:200]!r}') from e
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise TransientProviderError(f'DeepL unreachable: {e}') from e
+        return [_restore(t['text']) for t in payload['translations']]
+
+
+PROVIDERS = {
+    'stub': StubProvider,
+    'deepl': DeepLProvider,
+}
+
+
+def get_provider(name, **kwargs):
+    if name not in PROVIDERS:
+        raise ProviderError(f"unknown provider '{name}' (have: {', '.join(sorted(PROVIDERS))})")
+    return PROVIDERS[name](**kwargs)
+
+
+def pending_keys(en_flat, loc_flat, include_identical=False, same_as_en=()):
+    """Keys the locale lacks; optionally also keys still holding the English text.
+
+    Keys in same_as_en (from _same-as-en.json) are never retranslated.
+    """
+    keys = []
+    for key, text in en_flat.items():
+        current = loc_flat.get(key)
+        if current is None or (include_identical and current == text and key not in same_as_en):
+            keys.append(key)
+    return keys
+
+
+def glossary_terms(glossary, locale):
+    """{english: translation} of the glossary entries that apply to `locale`."""
+    terms = {}
+    for english, pinned in (glossary or {}).items():
+        value = pinned.get(locale) if isinstance(pinned, dict) else pinned
+        if value:
+            terms[english] = value
+    return terms
+
+
+def pin_terms(text, terms):
+    """(text with each term replaced by {_gN}, [translation of _gN])."""
+    pins = []
+    for english in sorted(terms, key=len, reverse=True):
+        pattern = re.compile(rf'(?<!\w){re.escape(english)}(?!\w)')
+        if pattern.search(text):
+            text = pattern.sub(f'{{_g{len(pins)}}}', text)
+            pins.append(terms[english])
+    return text, pins
+
+
+def unpin_terms(text, pins):
+    return re.sub(r'\{_g(\d+)\}', lambda m: pins[int(m.group(1))], text) if pins else text
+
+
+def make_batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def translate_with_retry(provider, texts, locale, retries=4, base_delay=0.5):
+    for attempt in range(retries + 1):
+        try:
+            result = await provider.translate_batch(texts, locale)
+        except TransientProviderError:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(base_delay * 2 ** attempt * (1 + random.random()))
+            continue
+        if len(result) != len(texts):
+            raise ProviderError(f'{provider.name} returned {len(result)} results for {len(texts)} texts')
+        return result
+
+
+async def translate_with_glossary(provider, texts, locale, retries=4, base_delay=0.5):
+    """translate_with_retry() with the provider's glossary terms pinned."""
+    terms = glossary_terms(provider.glossary, locale)
+    if not terms:
+        return await translate_with_retry(provider, texts, locale, retries, base_delay)
+    out = [terms.get(t) for t in texts]
+    todo = [i for i, value in enumerate(out) if value is None]
+    if todo:
+        pinned = [pin_terms(texts[i], terms) for i in todo]
+        result = await translate_with_retry(provider, [p[0] for p in pinned], locale, retries, base_delay)
+        for i, (_, pins), value in zip(todo, pinned, result):
+            out[i] = unpin_terms(value, pins)
+    return out
+
+
+async def backfill(provider, locales, concurrency=4, batch_size=None, retries=4, base_delay=0.5,
+                   include_identical=False, flush_every=20, trans_dir=TRANS_DIR, dry_run=False):
+    """Translate every pending key of `locales` and write the results back.
+
+    Each distinct English string is sent once per locale, however many keys
+    share it. Returns per-locale stats.
+    """
+    en_flat = flatten(load_locale(SOURCE_LOCALE, trans_dir))
+    size = max(1, min(batch_size or provider.max_batch, provider.max_batch))
+    same_as_en = load_same_as_en(locales, trans_dir)
+
+    catalogs, jobs, stats = {}, [], {}
+    for loc in locales:
+        if loc == SOURCE_LOCALE:
+            continue
+        if not provider.supports(loc):
+            print(f"  skip {loc}: not supported by '{provider.name}'")
+            continue
+        data = load_locale(loc, trans_dir)
+        by_text = {}
+        for key in pending_keys(en_flat, flatten(data), include_identical, same_as_en[loc]):
+            by_text.setdefault(en_flat[key], []).append(key)
+        catalogs[loc] = data
+        stats[loc] = {'keys': 0, 'strings': 0, 'batches': 0, 'failed': 0}
+        for batch in make_batches(list(by_text), size):
+            jobs.append((loc, batch, by_text))
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        loc, batch, _ = job
+        async with sem:
+            try:
+                return job, await translate_with_glossary(provider, batch, loc, retries, base_delay), None
+            except ProviderError as e:
+                return job, None, e
+
+    dirty, done = set(), 0
+    for fut in asyncio.as_completed([run(job) for job in jobs]):
+        (loc, batch, by_text), result, err = await fut
+        s = stats[loc]
+        if err is not None:
+            s['failed'] += len(batch)
+            print(f'  {loc}: batch of {len(batch)} failed: {err}', file=sys.stderr)
+            continue
+        for text, translated in zip(batch, result):
+            for key in by_text[text]:
+                try:
+                    set_path(catalogs[loc], key, translated)
+                    s['keys'] += 1
+                except ValueError as e:
+                    print(f'  {loc}: {e}', file=sys.stderr)
+        s['strings'] += len(batch)
+        s['batches'] += 1
+        dirty.add(loc)
+        done += 1
+        if not dry_run and flush_every and done % flush_every == 0:
+            for d in dirty:
+                save_locale(d, catalogs[d], trans_dir)
+            dirty.clear()
+
+    if not dry_run:
+        for d in dirty:
+            save_locale(d, catalogs[d], trans_dir)
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    ap.add_argument('locales', nargs='*', help='target locales (default: none, see --all)')
+    ap.add_argument('--all', action='store_true', help='every non-English locale')
+    ap.add_argument('--provider', default='stub', choices=sorted(PROVIDERS), help="default 'stub' (implies --dry-run)")
+    ap.add_argument('--concurrency', type=int, default=4)
+    ap.add_argument('--batch-size', type=int, default=None)
+    ap.add_argument('--retries', type=int, default=4)
+    ap.add_argument('--flush-every', type=int, default=20, help='checkpoint after this many batches (0 = only at end)')
+    ap.add_argument('--include-identical', action='store_true', help='also retranslate values identical to English')
+    ap.add_argument('--dry-run', action='store_true', help='translate but do not write')
+    ap.add_argument('--glossary', help='JSON file of {english: translation} pinned terms')
+    ap.add_argument('--no-cache', action='store_true', help='bypass the translation cache')
+    args = ap.parse_args(argv)
+
+    locales = [l for l in LOCALES if l != SOURCE_LOCALE] if args.all else args.locales
+    unknown = [l for l in locales if l not in LOCALES]
+    if unknown or not locales:
+        ap.error(f"unknown locales: {', '.join(unknown)}" if unknown else 'no locales given')
+    if args.provider == 'stub' and not args.dry_run:
+        print("provider 'stub' writes placeholder text; running as --dry-run")
+        args.dry_run = True
+
+    provider = get_provider(args.provider)
+    if args.glossary:
+        with open(args.glossary, encoding='utf-8') as f:
+            provider.glossary = json.load(f)
+    cache = None
+    if not args.no_cache:
+        from _i18n_mt_cache import CachedProvider, TranslationCache
+        cache = TranslationCache()
+        provider = CachedProvider(provider, cache)
+
+    started = time.perf_counter()
+    stats = asyncio.run(backfill(
+        provider, locales, concurrency=args.concurrency, batch_size=args.batch_size,
+        retries=args.retries, include_identical=args.include_identical,
+        flush_every=args.flush_every, dry_run=args.dry_run,
+    ))
+    elapsed = time.perf_counter() - started
+
+    for loc, s in stats.items():
+        failed = f", {s['failed']} failed" if s['failed'] else ''
+        print(f"{loc}: {s['keys']} keys ({s['strings']} strings, {s['batches']} batches{failed})")
+    print(f"\nDone in {elapsed:.2f}s via '{provider.name}'{' (dry run)' if args.dry_run else ''}")
+    if cache is not None:
+        print(f'Cache: {cache.hits} hits, {cache.misses} misses')
+        cache.close()
+    return 1 if any(s['failed'] for s in stats.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
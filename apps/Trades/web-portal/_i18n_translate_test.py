@@ -0,0 +1,116 @@
+"""Tests for the machine-translation backfill (_i18n_translate.py), run offline on the stub provider.
+
+Usage (from apps/Trades/web-portal):
+  python -m unittest _i18n_translate_test     # all tests: npm run i18n:test
+"""
+
+import asyncio, contextlib, io, json, os, tempfile, unittest
+
+from _i18n_catalog import flatten, load_locale
+from _i18n_translate import (ProviderError, StubProvider, TransientProviderError, backfill,
+                             translate_with_glossary, translate_with_retry)
+
+
+class RecordingStub(StubProvider):
+    """StubProvider that records what it was sent and fails the first `failures` batches."""
+
+    def __init__(self, failures=0, error=TransientProviderError):
+        super().__init__()
+        self.failures, self.error, self.sent = failures, error, []
+
+    async def translate_batch(self, texts, locale):
+        if self.failures:
+            self.failures -= 1
+            raise self.error('provider unavailable')
+        self.sent.append(list(texts))
+        return await super().translate_batch(texts, locale)
+
+
+class BackfillTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.write('en.json', {'common': {'save': 'Save', 'store': 'Save', 'hello': 'Hello {name}', 'brand': 'Zafto'}})
+        self.write('es.json', {'common': {'save': 'Guardar'}})
+        self.write('_same-as-en.json', {'*': ['common.brand']})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        with open(os.path.join(self.dir, name), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def test_fills_missing_keys_of_a_temporary_catalog(self):
+        provider = RecordingStub()
+        stats = asyncio.run(backfill(provider, ['es'], trans_dir=self.dir, base_delay=0))
+        es = flatten(load_locale('es', self.dir))
+        self.assertEqual(es, {
+            'common.save': 'Guardar',
+            'common.store': '[es] Save',
+            'common.hello': '[es] Hello {name}',
+            'common.brand': '[es] Zafto',
+        })
+        self.assertEqual(sorted(t for batch in provider.sent for t in batch), ['Hello {name}', 'Save', 'Zafto'])
+        self.assertEqual(stats['es'], {'keys': 3, 'strings': 3, 'batches': 1, 'failed': 0})
+
+    def test_dry_run_writes_nothing(self):
+        with open(os.path.join(self.dir, 'es.json'), encoding='utf-8') as f:
+            before = f.read()
+        asyncio.run(backfill(StubProvider(), ['es'], trans_dir=self.dir, dry_run=True))
+        with open(os.path.join(self.dir, 'es.json'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), before)
+
+    def test_failed_batches_are_counted_and_not_written(self):
+        provider = RecordingStub(failures=1, error=ProviderError)
+        with contextlib.redirect_stderr(io.StringIO()):
+            stats = asyncio.run(backfill(provider, ['es'], trans_dir=self.dir, base_delay=0))
+        self.assertEqual(stats['es']['failed'], 3)
+        self.assertEqual(flatten(load_locale('es', self.dir)), {'common.save': 'Guardar'})
+
+
+class RetryTest(unittest.TestCase):
+    def test_transient_errors_are_retried(self):
+        provider = RecordingStub(failures=2)
+        result = asyncio.run(translate_with_retry(provider, ['Save'], 'pl', retries=2, base_delay=0))
+        self.assertEqual(result, ['[pl] Save'])
+        self.assertEqual(provider.calls, 1)
+
+    def test_gives_up_after_the_last_retry(self):
+        provider = RecordingStub(failures=3)
+        with self.assertRaises(TransientProviderError):
+            asyncio.run(translate_with_retry(provider, ['Save'], 'pl', retries=2, base_delay=0))
+        self.assertEqual(provider.calls, 0)
+
+    def test_permanent_errors_are_not_retried(self):
+        provider = RecordingStub(failures=1, error=ProviderError)
+        with self.assertRaises(ProviderError):
+            asyncio.run(translate_with_retry(provider, ['Save'], 'pl', retries=4, base_delay=0))
+        self.assertEqual(provider.failures, 0)
+        self.assertEqual(provider.sent, [])
+
+
+class GlossaryTest(unittest.TestCase):
+    def setUp(self):
+        self.provider = RecordingStub()
+        self.provider.glossary = {'Save': 'Guardar', 'Job': {'es': 'Trabajo'}, 'Time Clock': {'es': 'Reloj'}}
+
+    def translate(self, texts, locale):
+        return asyncio.run(translate_with_glossary(self.provider, texts, locale, base_delay=0))
+
+    def test_terms_are_pinned_and_restored(self):
+        out = self.translate(['Save', 'Save the Job', 'Jobs list', 'Open Time Clock for {name}'], 'es')
+        self.assertEqual(out, ['Guardar', '[es] Guardar the Trabajo', '[es] Jobs list', '[es] Open Reloj for {name}'])
+        self.assertEqual(self.provider.sent, [['{_g0} the {_g1}', 'Jobs list', 'Open {_g0} for {name}']])
+
+    def test_per_locale_terms_only_apply_to_their_locale(self):
+        self.assertEqual(self.translate(['Save the Job'], 'pl'), ['[pl] Guardar the Job'])
+        self.assertEqual(self.provider.sent, [['{_g0} the Job']])
+
+    def test_exact_matches_skip_the_provider(self):
+        self.assertEqual(self.translate(['Save', 'Job'], 'es'), ['Guardar', 'Trabajo'])
+        self.assertEqual(self.provider.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,435 @@
+"""
+TSX backend for the wiring engine (_i18n_wire.py): JSX text sites, translator
+scopes and the translation APIs they are wired to.
+
+The engine does not assume one translation API. A TargetApi says how a
+component gets its translator and how keys are spelled:
+
+  CUSTOM     web-portal's own hook, keys are full catalog paths
+               import { useTranslation } from '@/lib/translations';
+               const { t } = useTranslation();          t('jobs.title')
+  NEXT_INTL  client/team/ops portals, keys relative to a namespace
+               import { useTranslations } from 'next-intl';
+               const t = useTranslations('projects');   t('title')
+             async server components get
+               import { getTranslations } from 'next-intl/server';
+               const t = await getTranslations('projects');
+
+analyze() walks the tokens once and finds every function scope, which
+function names are components or hooks (Capitalized, useXxx), and which
+blocks bind a translator through the API's hooks.
+
+extract() makes one more pass and classifies every string by its syntactic
+context. The old STRING_PATTERN regex only saw >Capitalized text</Tag>, and
+each extra pattern would have cost another sweep per file. A bracket stack
+records what each open `{`, `(` and `[` is: a JSX child container, a JSX
+attribute container, a call (and its callee), an object or block. The
+user-facing contexts are:
+
+  text   JSX text between tags, any characters   <p>Step 2 (optional)</p>
+  attr   display attributes                      placeholder="Search jobs"
+  expr   a whole operand in a JSX child or       {'Loading'}  {ok ? 'Active' : 'Inactive'}
+         display-attribute container             {name || 'Unnamed'}
+         display props in object literals        [{ value: 'w', label: 'Weekly' }]
+         the message argument of UI calls        alert('Saved')  toast.error('Failed')
+
+Strings that are compared, concatenated, passed to other calls or look like
+code (dotted keys, paths, URLs, kebab-case) are never candidates, and
+neither are display props of an object literal handed to a call that
+stores or sends it (.insert() / .update() / .rpc() / JSON.stringify() /
+fetch(), see DATA_SINKS): `title` there is a database column. Each
+candidate is then placed: already under a translator (use it), or inside a
+component without one (the rewrite injects the API's declaration at the top
+of the component body, under a name the component does not already use,
+and adds or extends the import). Strings outside any component, such as
+module-level option arrays, are reported and left alone.
+
+Stat cards, empty states and table headers are copy-pasted between pages,
+and one edit re-extracts a whole page. With a ScopePlans, extract() hashes
+the token stream of every outermost component body (whitespace in JSX text
+normalized, positions left out). A body whose fingerprint has been
+classified before is not walked again: its candidates are rebuilt from the
+stored plan (token offsets within the body, reasons, translators) against
+the new tokens.
+"""
+import hashlib, re
+from collections import namedtuple
+
+# translator: local name (bound, or to inject); prefix: binding namespace ('' = none, None = not bound);
+# inject_at: char offset just inside the component body when the translator must be added;
+# context: 'text' / 'attr' (replaced by {t(...)}) or 'expr' (replaced by t(...))
+Candidate = namedtuple('Candidate', 'text line start end reason translator prefix inject_at is_async context')
+Scope = namedtuple('Scope', 'open close name is_async')
+Binding = namedtuple('Binding', 'open close name prefix')
+
+USER_FACING = re.compile(r'[A-Za-z]{2,}')
+_FREE_NAMES = ('t', 'tr', 'tx')
+_NOT_FUNCTIONS = {'if', 'for', 'while', 'switch', 'catch', 'with'}
+
+DISPLAY_ATTRS = {'placeholder', 'title', 'alt', 'aria-label', 'label'}
+DISPLAY_PROPS = {'label', 'title', 'description', 'desc', 'subtitle', 'message', 'text', 'placeholder', 'caption',
+                 'heading', 'tooltip', 'helperText', 'emptyText'}
+DISPLAY_CALLS = {'toast', 'alert', 'confirm', 'window.alert', 'window.confirm', 'setError', 'setMessage',
+                 'setSuccess'}
+# calls that store or send their argument: an object literal passed to one is data, whatever its keys
+DATA_SINKS = {'insert', 'update', 'upsert', 'rpc', 'invoke', 'stringify', 'fetch', 'post', 'put', 'patch', 'send'}
+_OPERAND_BEFORE = {'{', '(', '?', ':', '&&', '||', '??'}
+_OPERAND_AFTER = {'}', ')', ':'}
+# dotted keys, paths / URLs / handles, snake_case and kebab-case identifiers
+_CODE_LIKE = re.compile(r'^(?:[\w$]+(?:\.[\w$]+)+|\S*[/@#_\\]\S*|[a-z0-9]+(?:-[a-z0-9]+)+)$')
+
+
+class TargetApi:
+    def __init__(self, name, hooks, namespaced, declare, source, client_only=False):
+        self.name = name
+        self.hooks = hooks
+        self.namespaced = namespaced
+        self.client_only = client_only  # the hook only runs in 'use client' modules
+        self._declare = declare
+        self._source = source
+
+    def declaration(self, local, namespace, is_async):
+        return self._declare(local, namespace, is_async)
+
+    def source(self, is_async):
+        """(module, export) the declaration needs imported."""
+        return self._source(is_async)
+
+
+CUSTOM = TargetApi(
+    'useTranslation', ('useTranslation',), False,
+    lambda local, ns, is_async: f"const {{ {'t' if local == 't' else 't: ' + local} }} = useTranslation();",
+    lambda is_async: ('@/lib/translations', 'useTranslation'),
+    client_only=True,
+)
+NEXT_INTL = TargetApi(
+    'next-intl', ('useTranslations', 'getTranslations'), True,
+    lambda local, ns, is_async: (f"const {local} = await getTranslations({repr(ns) if ns else ''});" if is_async
+                                 else f"const {local} = useTranslations({repr(ns) if ns else ''});"),
+    lambda is_async: ('next-intl/server', 'getTranslations') if is_async else ('next-intl', 'useTranslations'),
+)
+
+
+def is_component(name):
+    return bool(name) and (name[0].isupper() or (name.startswith('use') and name[3:4].isupper()))
+
+
+def _function_name(tokens, brace, match):
+    """(name, is_async) if the `{` at tokens[brace] opens a function body, else None."""
+    if brace >= 2 and tokens[brace - 1].value == '=>':
+        j = k = brace - 2
+        while k >= 0 and tokens[k].value not in (')', '=', '(', ',', '{', ';') and j - k < 16:
+            k -= 1  # return type annotation
+        if k >= 0 and tokens[k].value == ')':
+            start = match.get(k, k)
+        elif tokens[j].kind == 'ident':
+            start = j  # single bare parameter: `x => {`
+        else:
+            return None
+        p = start - 1
+        is_async = p >= 0 and tokens[p].value == 'async'
+        if is_async:
+            p -= 1
+        if p < 1 or tokens[p].value != '=':
+            return '', is_async
+        k = p - 1
+        while k >= 0 and tokens[k].value not in ('const', 'let', 'var') and p - k < 16:
+            k -= 1
+        return (tokens[k + 1].value if k >= 0 and tokens[k + 1].kind == 'ident' else ''), is_async
+    j = brace - 1
+    while j >= 0 and tokens[j].value not in (')', '=', '{', '}', ';', '(') and brace - j < 16:
+        j -= 1  # return type annotation
+    if j < 0 or tokens[j].value != ')':
+        return None
+    k = match.get(j, j) - 1
+    if k >= 0 and tokens[k].value == '>':  # generic parameters
+        while k >= 0 and tokens[k].value != '<':
+            k -= 1
+        k -= 1
+    if k < 0 or tokens[k].kind != 'ident' or tokens[k].value in _NOT_FUNCTIONS:
+        return None
+    if tokens[k].value == 'function':
+        return '', k >= 1 and tokens[k - 1].value == 'async'
+    if k >= 1 and tokens[k - 1].value == 'function':
+        return tokens[k].value, k >= 2 and tokens[k - 2].value == 'async'
+    return tokens[k].value, k >= 1 and tokens[k - 1].value == 'async'  # method
+
+
+def analyze(tokens, hooks):
+    """([Scope] of function bodies, [Binding] of translator declarations), one pass."""
+    stack, match = [], {}
+    functions, bindings = [], []
+    for i, tok in enumerate(tokens):
+        if tok.kind == 'punct':
+            v = tok.value
+            if v in '([{':
+                stack.append(i)
+                if v == '{':
+                    fn = _function_name(tokens, i, match)
+                    if fn is not None:
+                        functions.append([i, None, fn[0], fn[1]])
+            elif v in ')]}' and stack:
+                match[i] = stack.pop()
+                match[match[i]] = i
+            continue
+        if tok.kind != 'ident' or tok.value not in hooks:
+            continue
+        j = i - 1
+        if j > 0 and tokens[j].value == 'await':
+            j -= 1
+        if j < 1 or tokens[j].value != '=':
+            continue
+        prefix = ''
+        if i + 2 < len(tokens) and tokens[i + 1].value == '(' and tokens[i + 2].kind == 'str':
+            prefix = tokens[i + 2].value + '.'
+        scope = next((s for s in reversed(stack) if tokens[s].value == '{'), None)
+        if scope is None:
+            continue
+        target = tokens[j - 1]
+        if target.kind == 'ident':
+            bindings.append([scope, None, target.value, prefix])
+        elif target.value == '}':
+            k = j - 1
+            while k > 0 and tokens[k].value != '{':
+                k -= 1
+            members = [t.value for t in tokens[k + 1:j - 1]]
+            if 't' in members:
+                m = members.index('t')
+                name = members[m + 2] if m + 2 < len(members) and members[m + 1] == ':' else 't'
+                bindings.append([scope, None, name, prefix])
+    last = len(tokens)
+    functions = [Scope(f[0], match.get(f[0], last), f[2], f[3]) for f in functions]
+    bindings = [Binding(b[0], match.get(b[0], last), b[2], b[3]) for b in bindings]
+    return functions, bindings
+
+
+def free_name(tokens, lo, hi):
+    """A translator name no identifier in tokens[lo:hi] uses."""
+    used = {t.value for t in tokens[lo:hi] if t.kind == 'ident'}
+    return next((n for n in _FREE_NAMES if n not in used), None)
+
+
+def _open_frame(tokens, i, closed):
+    """(bracket, kind, name) for the bracket at tokens[i]; `closed` is the kind of a frame closed just before."""
+    v, prev = tokens[i].value, tokens[i - 1] if i else None
+    if v == '[':
+        return v, 'array', None
+    if v == '(':
+        if prev is not None and prev.kind == 'ident' and prev.value not in _NOT_FUNCTIONS:
+            if i >= 3 and tokens[i - 2].value in ('.', '?.') and tokens[i - 3].kind == 'ident':
+                return v, 'call', f'{tokens[i - 3].value}.{prev.value}'
+            return v, 'call', prev.value
+        return v, 'group', None
+    if prev is not None and (prev.kind in ('jsx_end', 'jsx_text', 'jsx_close') or (prev.value == '}' and closed == 'child')):
+        return v, 'child', None
+    if prev is not None and prev.value == '=' and i >= 2 and tokens[i - 2].kind == 'jsx_attr':
+        return v, 'attr', tokens[i - 2].value
+    return v, 'block', None
+
+
+def _is_display_call(name):
+    return name in DISPLAY_CALLS or name.startswith('toast.')
+
+
+def _in_data_sink(stack):
+    """True when the object literal on top of `stack` is (part of) an argument of a DATA_SINKS call."""
+    for _, kind, name in reversed(stack):
+        if kind not in ('block', 'array'):
+            return kind == 'call' and name.rsplit('.', 1)[-1] in DATA_SINKS
+    return False
+
+
+def string_context(tokens, i, stack):
+    """'text' / 'attr' / 'expr' when tokens[i] is shown to the user, else None."""
+    tok = tokens[i]
+    if tok.kind == 'jsx_text':
+        return 'text'
+    prev, nxt = tokens[i - 1], tokens[i + 1] if i + 1 < len(tokens) else None
+    if tok.kind == 'jsx_str':
+        return 'attr' if prev.value == '=' and tokens[i - 2].kind == 'jsx_attr' and tokens[i - 2].value in DISPLAY_ATTRS else None
+    if tok.kind not in ('str', 'template') or not stack or nxt is None:
+        return None
+    _, kind, name = stack[-1]
+    if kind == 'call':
+        return 'expr' if prev.value == '(' and nxt.value in (',', ')') and _is_display_call(name) else None
+    if (kind == 'block' and prev.value == ':' and nxt.value in (',', '}') and i >= 3
+            and tokens[i - 2].kind == 'ident' and tokens[i - 2].value in DISPLAY_PROPS and tokens[i - 3].value in ('{', ',')):
+        return None if _in_data_sink(stack) else 'expr'
+    container = next((f for f in reversed(stack) if f[1] != 'group'), None)
+    if container is None or not (container[1] == 'child' or (container[1] == 'attr' and container[2] in DISPLAY_ATTRS)):
+        return None
+    return 'expr' if prev.value in _OPERAND_BEFORE and nxt.value in _OPERAND_AFTER else None
+
+
+class ScopePlans:
+    """Candidates per component fingerprint, shared by every file extract() sees."""
+
+    def __init__(self, plans=None):
+        self.plans = dict(plans or {})
+        self.seen = []  # fingerprints of the last extract() call
+        self.hits = self.misses = 0
+
+
+def fingerprint(tokens, scope, api):
+    """Hash of a component body's token stream; equal bodies extract to equal candidates."""
+    h = hashlib.sha1(f'{api.name}\0{scope.is_async}'.encode())
+    for tok in tokens[scope.open:scope.close + 1]:
+        value = ' '.join(tok.value.split()) if tok.kind == 'jsx_text' else tok.value
+        h.update(f'\0{tok.kind}\1{value}'.encode())
+    return h.hexdigest()[:20]
+
+
+def _outermost_components(functions, bindings):
+    """{open: Scope} of component bodies no other function or binding encloses."""
+    outer = functions + bindings
+    return {c.open: c for c in functions
+            if is_component(c.name) and not any(o.open < c.open and c.close < o.close for o in outer)}
+
+
+def _span(tok, context):
+    """(normalized text, start, end) of the part of `tok` a candidate replaces."""
+    if context != 'text':
+        return ' '.join(tok.value.split()), tok.start, tok.end
+    lead = len(tok.value) - len(tok.value.lstrip())
+    return ' '.join(tok.value.split()), tok.start + lead, tok.start + len(tok.value.rstrip())
+
+
+def _replay(tokens, base, plan):
+    for k, reason, translator, prefix, inject_k, is_async, context in plan:
+        tok = tokens[base + k]
+        text, start, end = _span(tok, context)
+        inject_at = None if inject_k is None else tokens[base + inject_k].end
+        yield Candidate(text, tok.line, start, end, reason, translator, prefix, inject_at, is_async, context)
+
+
+def extract(tokens, api, plans=None):
+    """Candidate user-facing strings of one file, classified for `api`; `plans` (ScopePlans) memoizes bodies."""
+    functions, bindings = analyze(tokens, api.hooks)
+    components = [f for f in functions if is_component(f.name)]
+    outermost = _outermost_components(functions, bindings) if plans is not None else {}
+    if plans is not None:
+        plans.seen = []
+    out = []
+    n = len(tokens)
+    stack, closed = [], None
+    recording = None  # (body Scope, plan being written)
+    i = -1
+    while i + 1 < n:
+        i += 1
+        tok = tokens[i]
+        if recording is not None and i > recording[0].close:
+            plans.plans[plans.seen[-1]] = recording[1]
+            recording = None
+        if tok.kind == 'punct':
+            if tok.value == '{' and i in outermost:
+                body = outermost[i]
+                fp = fingerprint(tokens, body, api)
+                plans.seen.append(fp)
+                if fp in plans.plans:
+                    plans.hits += 1
+                    out.extend(_replay(tokens, i, plans.plans[fp]))
+                    i, closed = body.close, 'block'
+                    continue
+                plans.misses += 1
+                recording = (body, [])
+            if tok.value in '([{':
+                stack.append(_open_frame(tokens, i, closed))
+            elif tok.value in ')]}' and stack:
+                closed = stack.pop()[1]
+                continue
+            closed = None
+            continue
+        closed = None
+        if tok.kind not in ('jsx_text', 'jsx_str', 'str', 'template') or not USER_FACING.search(tok.value):
+            continue
+        context = string_context(tokens, i, stack)
+        if context is None:
+            continue
+        text, start, end = _span(tok, context)
+        if context != 'text' and _CODE_LIKE.match(text):
+            continue
+        prev, nxt = tokens[i - 1], tokens[i + 1] if i + 1 < n else None
+        binding = min((b for b in bindings if b.open < i < b.close), key=lambda b: b.close - b.open, default=None)
+        comp = min((c for c in components if c.open < i < c.close), key=lambda c: c.close - c.open, default=None)
+        translator, prefix, inject_at, is_async, reason = None, None, None, False, None
+        if context == 'text' and (prev.kind != 'jsx_end' or nxt is None or nxt.kind != 'jsx_close'):
+            reason = 'text mixed with expressions or tags'
+        elif context != 'expr' and '&' in tok.value:
+            reason = 'HTML entity'
+        elif context == 'expr' and ('{' in text or '\\' in text):
+            reason = 'braces or escapes in a string literal'
+        elif binding is not None:
+            translator, prefix = binding.name, binding.prefix
+        elif comp is not None:
+            translator = free_name(tokens, comp.open, comp.close)
+            inject_at, is_async = tokens[comp.open].end, comp.is_async
+            if translator is None:
+                reason = 'no free name for the translator'
+        else:
+            reason = 'not inside a component or hook'
+        out.append(Candidate(text, tok.line, start, end, reason, translator, prefix, inject_at, is_async, context))
+        if recording is not None:
+            base = recording[0].open
+            recording[1].append([i - base, reason, translator, prefix,
+                                 None if inject_at is None else comp.open - base, is_async, context])
+    if recording is not None:
+        plans.plans[plans.seen[-1]] = recording[1]
+    return out
+
+
+# ── rewrite ──
+
+_IMPORT_FROM = re.compile(r"^import\s+(?:type\s+)?\{([^}]*)\}\s+from\s+['\"]([^'\"]+)['\"];?[ \t]*$", re.M)
+_ANY_IMPORT = re.compile(r"^import\s[^;]*?['\"][^'\"]+['\"];?[ \t]*$", re.M | re.S)
+_DIRECTIVE = re.compile(r"^\s*(['\"])use (?:client|server)\1;?[ \t]*\n?")
+_CLIENT_DIRECTIVE = re.compile(r"^(?:\s+|//[^\n]*|/\*.*?\*/)*(['\"])use client\1", re.S)
+
+
+def is_client_module(text):
+    """True when the file starts with 'use client' (comments allowed before it)."""
+    return bool(_CLIENT_DIRECTIVE.match(text))
+
+
+def _import_span(text, module, export):
+    """(start, end, insertion) that makes `text` import `export` from `module`, or None."""
+    for m in _IMPORT_FROM.finditer(text):
+        if m.group(2) != module or m.group(0).startswith('import type'):
+            continue
+        names = [n.strip() for n in m.group(1).split(',') if n.strip()]
+        if export in names:
+            return None
+        at = m.start(1) + len(m.group(1).rstrip().rstrip(','))
+        return at, at, f', {export}' if names else f' {export} '
+    line = f"import {{ {export} }} from '{module}';"
+    imports = list(_ANY_IMPORT.finditer(text))
+    if imports:
+        at = imports[-1].end()
+        return at, at, '\n' + line
+    directive = _DIRECTIVE.match(text)
+    at = directive.end() if directive else 0
+    return at, at, line + '\n' + ('\n' if directive else '')
+
+
+def rewrite(text, edits, injections, api):
+    """Apply [(candidate, key ref)] and {inject_at: (name, namespace, is_async)} to one file."""
+    spans = []
+    for cand, ref in edits:
+        call = f"{cand.translator}('{ref}')"
+        spans.append((cand.start, cand.end, call if cand.context == 'expr' else f'{{{call}}}'))
+    needed = set()
+    for at, (local, namespace, is_async) in injections.items():
+        m = re.match(r'[ \t]*\n([ \t]*)', text[at:])
+        decl = api.declaration(local, namespace, is_async)
+        spans.append((at, at, f'\n{m.group(1)}{decl}' if m else f' {decl}'))
+        needed.add(api.source(is_async))
+    for module, export in sorted(needed):
+        span = _import_span(text, module, export)
+        if span is not None:
+            spans.append(span)
+    out, pos = [], 0
+    for start, end, replacement in sorted(spans, key=lambda s: (s[0], s[1])):
+        out.append(text[pos:start])
+        out.append(replacement)
+        pos = max(pos, end)
+    out.append(text[pos:])
+    return ''.join(out)
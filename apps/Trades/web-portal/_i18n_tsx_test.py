@@ -0,0 +1,46 @@
+"""Tests for TSX string extraction (_i18n_tsx.py).
+
+Usage (from apps/Trades/web-portal):
+  python -m unittest _i18n_tsx_test     # all tests: npm run i18n:test
+"""
+
+import unittest
+
+import _i18n_tsx as tsx
+from _i18n_lexer import tokenize
+
+
+def candidates(body):
+    """{text: context} of the strings extract() finds in a client component wrapping `body`."""
+    text = "'use client';\n\nexport default function Page() {\n" + body + '\n}\n'
+    return {c.text: c.context for c in tsx.extract(tokenize(text, jsx=True), tsx.CUSTOM) if c.reason is None}
+
+
+class DisplayPropsTest(unittest.TestCase):
+    def test_option_labels_are_wired(self):
+        found = candidates("const opts = [{ value: 'w', label: 'Weekly' }];\n  return <Select options={opts} />;")
+        self.assertEqual(found, {'Weekly': 'expr'})
+
+    def test_ui_call_objects_are_wired(self):
+        found = candidates("const save = () => toast({ title: 'Saved', description: 'Your job was updated' });\n"
+                           "  return <button onClick={save} />;")
+        self.assertEqual(found, {'Saved': 'expr', 'Your job was updated': 'expr'})
+
+    def test_data_sink_objects_are_left_alone(self):
+        sinks = [
+            "supabase.from('jobs').insert({ title: 'New Job', description: 'Created from template' });",
+            "supabase.from('jobs').insert([{ title: 'New Job' }]);",
+            "supabase.from('jobs').update({ title: 'Renamed Job' }).eq('id', id);",
+            "supabase.from('jobs').upsert({ label: 'Primary Job' });",
+            "supabase.rpc('log_event', { message: 'Job created' });",
+            "supabase.functions.invoke('notify', { body: { message: 'Crew assigned' } });",
+            "JSON.stringify({ message: 'Hello there' });",
+            "fetch('/api/notes', { method: 'POST', body: JSON.stringify({ text: 'Call the customer' }) });",
+        ]
+        for line in sinks:
+            with self.subTest(line=line):
+                self.assertEqual(candidates(f'const run = async () => {{ await {line} }};\n  return <div />;'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Crash-safe multi-file writes for the tooling that rewrites many files at once.
+
+A wiring round touches 150+ sources plus en.json, the next-intl overlays and
+the ARB files. Writing them one by one means a crash halfway (an encoding
+error, Ctrl-C, a full disk) leaves sources that reference keys the catalog
+never got. The only way back was `git checkout`.
+
+Transaction.commit() writes a staged {path: text} set in three steps:
+
+  1. prepare  the old and new bytes of every file that changes go to
+              .i18n-cache/txn/<n>.before / <n>.after (fsynced). Then the
+              journal is written atomically: one [path, before sha1, after
+              sha1] row per file, with null for a file that did not exist.
+              Paths are stored relative to the journal's directory, so
+              recovery finds the files from whatever directory it runs in.
+              Nothing in the tree has been touched yet.
+  2. apply    each file is replaced through write_if_changed() (temp file +
+              rename, fsynced), so every single file is either old or new.
+  3. finish   the journal is deleted, then the blobs.
+
+If the process dies between 1 and 3, the journal is still there. rollback()
+and resume() read it and hash only the journaled files. A file already in
+the wanted state is left alone, and one in the other journaled state is
+written from its blob. A file that matches neither was edited after the
+crash. It is reported and not overwritten, and the journal is kept until
+it is resolved (or force=True). An exception inside commit() rolls back
+right away.
+
+Recovery costs one read per changed file, however large the tree is.
+"""
+import hashlib, json, os, shutil, time
+
+from _i18n_catalog import read_text, write_if_changed
+
+TXN_DIR = os.path.join('.i18n-cache', 'txn')
+JOURNAL = 'journal.json'
+JOURNAL_VERSION = 2  # 1: paths relative to the working directory
+
+
+class JournalPending(RuntimeError):
+    """An earlier transaction did not finish; roll it back or resume it first."""
+
+
+def _sha(data):
+    return None if data is None else hashlib.sha1(data).hexdigest()
+
+
+def _read_bytes(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _encode(text):
+    return text.encode('utf-8') if isinstance(text, str) else text
+
+
+def _journal_path(path, txn_dir):
+    """`path` relative to txn_dir; absolute when they are on different drives."""
+    try:
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(txn_dir)).replace(os.sep, '/')
+    except ValueError:
+        return os.path.abspath(path)
+
+
+def load_journal(txn_dir=TXN_DIR):
+    text = read_text(os.path.join(txn_dir, JOURNAL))
+    return json.loads(text) if text else None
+
+
+class Transaction:
+    def __init__(self, label='', txn_dir=TXN_DIR):
+        self.label = label
+        self.txn_dir = txn_dir
+        self.staged = {}
+
+    def stage(self, path, text):
+        self.staged[path] = text
+
+    def commit(self):
+        """Write every staged file that changes. Returns the paths written."""
+        if load_journal(self.txn_dir) is not None:
+            raise JournalPending(f'unfinished transaction in {self.txn_dir}')
+        changes = []
+        for path, text in sorted(self.staged.items()):
+            after, before = _encode(text), _read_bytes(path)
+            if after != before:
+                changes.append((path, before, after))
+        if not changes:
+            return []
+        shutil.rmtree(self.txn_dir, ignore_errors=True)  # blobs of a run that died before its journal
+        rows = []
+        for n, (path, before, after) in enumerate(changes):
+            if before is not None:
+                write_if_changed(os.path.join(self.txn_dir, f'{n}.before'), before)
+            write_if_changed(os.path.join(self.txn_dir, f'{n}.after'), after)
+            rows.append([_journal_path(path, self.txn_dir), _sha(before), _sha(after)])
+        journal = {'version': JOURNAL_VERSION, 'label': self.label, 'started': int(time.time()), 'files': rows}
+        write_if_changed(os.path.join(self.txn_dir, JOURNAL), json.dumps(journal, ensure_ascii=False, indent=1))
+        try:
+            for path, _, after in changes:
+                write_if_changed(path, after)
+        except BaseException:
+            rollback(self.txn_dir)
+            raise
+        _finish(self.txn_dir)
+        return [path for path, _, _ in changes]
+
+
+def _finish(txn_dir):
+    os.unlink(os.path.join(txn_dir, JOURNAL))
+    shutil.rmtree(txn_dir, ignore_errors=True)
+
+
+def _recover(txn_dir, forward, force):
+    journal = load_journal(txn_dir)
+    if journal is None:
+        return None
+    base = txn_dir if journal.get('version', 1) >= 2 else ''
+    fixed, conflicts = [], []
+    for n, (stored, before, after) in enumerate(journal['files']):
+        path = os.path.normpath(os.path.join(base, stored))
+        want, other = (after, before) if forward else (before, after)
+        current = _sha(_read_bytes(path))
+        if current == want:
+            continue
+        if current != other and not force:
+            conflicts.append(path)
+            continue
+        if want is None:
+            os.unlink(path)
+        else:
+            write_if_changed(path, _read_bytes(os.path.join(txn_dir, f"{n}.{'after' if forward else 'before'}")))
+        fixed.append(path)
+    if not conflicts:
+        _finish(txn_dir)
+    return {'label': journal.get('label', ''), 'files': len(journal['files']), 'fixed': fixed,
+            'conflicts': conflicts}
+
+
+def rollback(txn_dir=TXN_DIR, force=False):
+    """Put every journaled file back to its old bytes. None if there is no journal."""
+    return _recover(txn_dir, False, force)
+
+
+def resume(txn_dir=TXN_DIR, force=False):
+    """Finish writing every journaled file. None if there is no journal."""
+    return _recover(txn_dir, True, force)
@@ -0,0 +1,109 @@
+"""Tests for crash-safe multi-file writes (_i18n_txn.py).
+
+Usage (from apps/Trades/web-portal):
+  python -m unittest _i18n_txn_test     # all tests: npm run i18n:test
+"""
+
+import os, tempfile, unittest
+from unittest import mock
+
+import _i18n_txn as txn
+from _i18n_catalog import read_text
+
+
+class Crash(Exception):
+    pass
+
+
+class TransactionTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmp.name)
+        self.elsewhere = os.path.join(self.root, 'elsewhere')
+        os.makedirs(self.elsewhere)
+        os.makedirs(os.path.join(self.root, 'tree', 'src'))
+        os.chdir(os.path.join(self.root, 'tree'))
+        for name, text in (('a.json', 'old a'), ('b.tsx', 'old b')):
+            with open(os.path.join('src', name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        self.txn_dir = os.path.join('.i18n-cache', 'txn')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def tree(self):
+        return {f'src/{n}': read_text(os.path.join(self.root, 'tree', 'src', n)) for n in ('a.json', 'b.tsx', 'c.tsx')}
+
+    def commit(self, fail_on=None, recover=True):
+        """Commit new a/b/c, raising Crash while writing `fail_on`; recover=False skips the automatic rollback."""
+        t = txn.Transaction('test', self.txn_dir)
+        t.stage(os.path.join('src', 'a.json'), 'new a')
+        t.stage(os.path.join('src', 'b.tsx'), 'new b')
+        t.stage(os.path.join('src', 'c.tsx'), 'new c')
+        real = txn.write_if_changed
+
+        def write(path, data, durable=True):
+            if path == fail_on:
+                raise Crash(path)
+            return real(path, data, durable)
+
+        with mock.patch.object(txn, 'write_if_changed', write):
+            if recover:
+                return t.commit()
+            with mock.patch.object(txn, 'rollback', lambda *a, **k: None):
+                return t.commit()
+
+    def test_commit_writes_everything_and_clears_the_journal(self):
+        self.assertEqual(len(self.commit()), 3)
+        self.assertEqual(self.tree(), {'src/a.json': 'new a', 'src/b.tsx': 'new b', 'src/c.tsx': 'new c'})
+        self.assertIsNone(txn.load_journal(self.txn_dir))
+
+    def test_exception_during_apply_rolls_back(self):
+        with self.assertRaises(Crash):
+            self.commit(fail_on=os.path.join('src', 'c.tsx'))
+        self.assertEqual(self.tree(), {'src/a.json': 'old a', 'src/b.tsx': 'old b', 'src/c.tsx': None})
+        self.assertIsNone(txn.load_journal(self.txn_dir))
+
+    def test_resume_after_a_crash_from_another_directory(self):
+        with self.assertRaises(Crash):
+            self.commit(fail_on=os.path.join('src', 'b.tsx'), recover=False)
+        self.assertEqual(self.tree()['src/a.json'], 'new a')
+        self.assertIsNotNone(txn.load_journal(self.txn_dir))
+        txn_dir = os.path.abspath(self.txn_dir)
+        os.chdir(self.elsewhere)
+        report = txn.resume(txn_dir)
+        self.assertEqual(report['conflicts'], [])
+        self.assertEqual(len(report['fixed']), 2)
+        self.assertEqual(self.tree(), {'src/a.json': 'new a', 'src/b.tsx': 'new b', 'src/c.tsx': 'new c'})
+        self.assertIsNone(txn.load_journal(txn_dir))
+
+    def test_rollback_after_a_crash_from_another_directory(self):
+        with self.assertRaises(Crash):
+            self.commit(fail_on=os.path.join('src', 'c.tsx'), recover=False)
+        txn_dir = os.path.abspath(self.txn_dir)
+        os.chdir(self.elsewhere)
+        report = txn.rollback(txn_dir)
+        self.assertEqual(sorted(report['fixed']), sorted(os.path.join(self.root, 'tree', 'src', n) for n in ('a.json', 'b.tsx')))
+        self.assertEqual(self.tree(), {'src/a.json': 'old a', 'src/b.tsx': 'old b', 'src/c.tsx': None})
+        self.assertIsNone(txn.load_journal(txn_dir))
+
+    def test_file_edited_after_the_crash_is_a_conflict(self):
+        with self.assertRaises(Crash):
+            self.commit(fail_on=os.path.join('src', 'c.tsx'), recover=False)
+        with open(os.path.join('src', 'a.json'), 'w', encoding='utf-8') as f:
+            f.write('hand edit')
+        report = txn.resume(self.txn_dir)
+        self.assertEqual(report['conflicts'], [os.path.join('src', 'a.json')])
+        self.assertEqual(self.tree(), {'src/a.json': 'hand edit', 'src/b.tsx': 'new b', 'src/c.tsx': 'new c'})
+        self.assertIsNotNone(txn.load_journal(self.txn_dir))
+        with self.assertRaises(txn.JournalPending):
+            self.commit()
+        txn.resume(self.txn_dir, force=True)
+        self.assertEqual(self.tree()['src/a.json'], 'new a')
+        self.assertIsNone(txn.load_journal(self.txn_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
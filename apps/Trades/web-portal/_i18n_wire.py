@@ -0,0 +1,542 @@
+"""
+Wiring engine: replace hardcoded UI strings with translation lookups.
+
+One run scans every registered backend, resolves each hardcoded string
+against a single text -> key index built from the English catalog, mints
+keys for the texts the catalog does not have yet, and rewrites the sources.
+All backends share the index, so "Cancel" on a Flutter screen, a web page
+and a client-portal page resolves to the same text, which is translated
+once.
+
+Backends:
+
+  web     web-portal UI strings: JSX text (<button>Save</button>), display
+          attributes, ternary / fallback operands in JSX, option labels and
+          toast() / alert() messages (see _i18n_tsx.py), wired to the
+          portal's own hook: {t('jobs.title')} under
+          `const { t } = useTranslation()`
+  client  the same strings in client-portal, team-portal and ops-portal, wired to
+  team    next-intl: {t('title')} under `const t = useTranslations('projects')`
+  ops     (`await getTranslations(...)` in async server components)
+  dart    Flutter Text('...') / hintText: / labelText: literals in
+          apps/Trades/lib (see _i18n_dart.py), wired to
+          AppLocalizations.of(context)!.name
+
+The TSX backends differ only in their target API (_i18n_tsx.py: CUSTOM,
+NEXT_INTL). A component that has no translator yet gets the API's hook
+declaration and import injected; one that has one keeps it and its
+namespace. useTranslation() is a client hook, so web files without a
+'use client' directive (server components such as app/not-found.tsx) are
+never given one; their strings are reported and left alone. Text mixed with {expressions} is left alone. Strings in JSX
+text and attributes become {t('key')}; strings already inside an
+expression become a bare t('key').
+
+Key choice for a text:
+
+  web     an existing catalog key with exactly that English value, directly
+          under the page's namespace or anywhere under common.* (keys of
+          other pages are not borrowed). Otherwise a new key is minted from the
+          text the way the _wire_*.py rounds did (camelCase of its words, at
+          most 50 characters) under the page's namespace
+          (settings/phone -> settingsPhone).
+  next-intl  a key with that text in the component's namespace of the
+          portal's messages (core + overlay, see _i18n_core.py). Otherwise a
+          key is minted there. Its translations are copied from the catalog
+          key with the same English text, and English fills the rest.
+  dart    the hand-written ARB message with that text, else the catalog key
+          as for web under `mobile`, named by arb_key() (common.save ->
+          commonSave).
+
+Minted catalog keys go to en.json through _i18n_bulk_write.apply_changes.
+next-intl keys go to the portal's messages/<locale>.json overlays.
+_i18n_arb.py projects the ARB files for new message names.
+
+apply stages all of it in memory (rewritten sources, en.json, overlays, ARB
+files), so a source that fails to decode stops the run before anything is
+written. It then writes everything as one journaled transaction
+(_i18n_txn.py). If a run dies partway, the next apply refuses to start, and
+`rollback` or `resume` brings the journaled files back to all-old or
+all-new.
+
+Each backend's extraction is cached per file in .i18n-cache/wire-<name>.json
+by size and mtime. A rescan therefore only re-tokenizes changed files; a
+cold scan of the ~2,000 Dart files takes about 10 s, a warm one well under a
+second. The TSX backends also keep the extraction of every component body
+by token fingerprint (_i18n_tsx.ScopePlans). A changed file is still
+tokenized, but only its changed components and ones never seen in any other
+file are classified again. Keys are resolved per site either way, since the
+namespace depends on the page.
+
+Usage:
+  python _i18n_wire.py scan                          # per-backend counts
+  python _i18n_wire.py scan --backend dart --list    # every site: key or skip reason
+  python _i18n_wire.py apply --backend client,team   # rewrite sources + catalogs
+  python _i18n_wire.py apply --backend web --dry-run --path dashboard/bids
+  python _i18n_wire.py rollback                      # undo an interrupted apply
+  python _i18n_wire.py resume                        # or finish it
+"""
+import argparse, json, os, re, sys, time
+from collections import Counter, namedtuple
+
+import _i18n_dart as dart, _i18n_tsx as tsx
+import _i18n_arb as arb
+from _i18n_bulk_write import apply_changes
+from _i18n_catalog import LOCALES, SOURCE_LOCALE, TRANS_DIR, flatten, load_locale, read_text, set_path, write_if_changed
+from _i18n_core import overlay_path, portal_messages
+from _i18n_index import norm
+from _i18n_json import canonical_dumps
+from _i18n_lexer import tokenize
+from _i18n_refs import PORTALS, iter_sources
+from _i18n_txn import JournalPending, Transaction, load_journal, resume, rollback
+
+CACHE_DIR = '.i18n-cache'
+CACHE_VERSION = 6
+MAX_KEY_LEN = 50
+
+SERVER_MODULE = "no 'use client' (useTranslation is a client hook)"
+
+# path, 1-based line, normalized text, span to replace, skip reason (None = wireable), backend data
+Site = namedtuple('Site', 'path line text start end skip data')
+
+
+def text_to_camel(text):
+    """Convert English text to a camelCase key segment."""
+    words = re.sub(r'[^a-zA-Z0-9 ]', '', text).split()
+    if not words:
+        return None
+    return (words[0].lower() + ''.join(w.capitalize() for w in words[1:]))[:MAX_KEY_LEN]
+
+
+def normalize(text):
+    return ' '.join(text.split())
+
+
+class TextIndex:
+    """English text -> catalog key, shared by every backend in a run."""
+
+    def __init__(self, en_flat):
+        self.keys = set(en_flat)
+        self.namespaces = {k.rsplit('.', 1)[0] for k in self.keys if '.' in k}
+        self.namespaces |= {p for ns in self.namespaces for p in _parents(ns)}
+        self.by_text, self.by_ns_text, self.by_common_text = {}, {}, {}
+        for key in sorted(en_flat, key=_key_rank):
+            if isinstance(en_flat[key], str):
+                self._register(key, normalize(en_flat[key]))
+        self.added = {}
+
+    def _register(self, key, text):
+        self.by_text.setdefault(text, key)
+        self.by_ns_text.setdefault((_namespace_of(key), text), key)
+        if key.startswith('common.'):
+            self.by_common_text.setdefault(text, key)
+
+    def lookup(self, text, namespace=None):
+        """Key for `text`; with a namespace, only a key directly under it."""
+        if namespace is None:
+            return self.by_text.get(text)
+        return self.by_ns_text.get((namespace, text))
+
+    def mint(self, namespace, text):
+        """A new key for `text` under namespace, registered in the index."""
+        base = text_to_camel(text)
+        if base is None:
+            return None
+        key, n = f'{namespace}.{base}', 2
+        while key in self.keys or key in self.namespaces or any(p in self.keys for p in _parents(key)):
+            key, n = f'{namespace}.{base}{n}', n + 1
+        self.keys.add(key)
+        self.namespaces.update(_parents(key))
+        self._register(key, text)
+        self.added[key] = text
+        return key
+
+    def key_for(self, namespace, text):
+        """A key directly under `namespace` or anywhere under common., else a new one under namespace.
+
+        Keys of other pages are never borrowed: their translation may fit
+        only there, and renaming that page would orphan this one.
+        """
+        return self.lookup(text, namespace) or self.by_common_text.get(text) or self.mint(namespace, text)
+
+
+def _namespace_of(key):
+    return key.rsplit('.', 1)[0] if '.' in key else ''
+
+
+def _parents(key):
+    parts = key.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts))]
+
+
+def _key_rank(key):
+    return (not key.startswith('common.'), len(key), key)
+
+
+# ── backends ──
+
+def page_namespace(path, root):
+    """src/app/dashboard/settings/phone/page.tsx -> settingsPhone; components -> common."""
+    rel = norm(os.path.relpath(path, os.path.join(root, 'app')))
+    parts = [p for p in rel.split('/')[:-1] if not p.startswith(('[', '(')) and p not in ('.', '..')]
+    if parts[:1] == ['dashboard']:
+        parts = parts[1:]
+    if not parts or parts[0] in ('lib', 'components'):
+        return 'common'
+    words = '-'.join(parts[:2]).split('-')
+    return words[0] + ''.join(w.capitalize() for w in words[1:])
+
+
+class TsxBackend:
+    """UI strings of one portal, wired to its target API (see _i18n_tsx.py)."""
+
+    api = tsx.CUSTOM
+    unavailable = None
+
+    def __init__(self, portal='web'):
+        self.name = portal
+        self.root = PORTALS[portal]
+        self.injections = {}  # path -> {inject_at: (local name, namespace, is_async)}
+        self.plans = tsx.ScopePlans()
+
+    def files(self):
+        return (p for p in iter_sources(self.root) if p.endswith('.tsx'))
+
+    def sites(self, path, text):
+        if '</' not in text and '/>' not in text:
+            self.plans.seen = []
+            return []
+        # A server component cannot call a client hook: only wire sites that already have a translator
+        server = self.api.client_only and not tsx.is_client_module(text)
+        return [Site(path, c.line, c.text, c.start, c.end,
+                     c.reason or (SERVER_MODULE if server and c.inject_at is not None else None),
+                     [c.translator, c.prefix, c.inject_at, c.is_async, c.context])
+                for c in tsx.extract(tokenize(text, jsx=True), self.api, self.plans)]
+
+    def resolve(self, path, site, index):
+        """(ref, None) for a wireable site, or (None, skip reason)."""
+        translator, prefix, inject_at, is_async, _ = site.data
+        if inject_at is not None and is_async:
+            return None, 'async component (useTranslation is a client hook)'
+        key = index.key_for(page_namespace(path, self.root), site.text)
+        if key is None:
+            return None, 'no key-worthy words'
+        if inject_at is not None:
+            self.injections.setdefault(path, {})[inject_at] = (translator, None, False)
+        return key, None
+
+    def rewrite(self, path, text, edits):
+        cands = [(tsx.Candidate(s.text, s.line, s.start, s.end, None, *s.data), ref) for s, ref in edits]
+        return tsx.rewrite(text, cands, self.injections.get(path, {}), self.api)
+
+    def outputs(self, refs, index):
+        """({path: text} to write besides the sources, names added)."""
+        return {}, []
+
+
+class NextIntlBackend(TsxBackend):
+    """client/team/ops: next-intl useTranslations('ns'), keys in the portal's messages."""
+
+    api = tsx.NEXT_INTL
+
+    def __init__(self, portal):
+        super().__init__(portal)
+        self.catalog = self.web = None
+        self.added = {}  # locale -> {key: value} for the overlays
+
+    @property
+    def unavailable(self):
+        """Why this portal cannot be wired, or None."""
+        if not os.path.exists(os.path.join(self.root, 'i18n.ts')):
+            return 'no next-intl setup (src/i18n.ts missing)'
+        return None
+
+    def files(self):
+        return iter(()) if self.unavailable else super().files()
+
+    def _load(self):
+        if self.catalog is None:
+            self.catalog = TextIndex(portal_messages(self.name)[SOURCE_LOCALE])
+            self.web = {loc: flatten(load_locale(loc, TRANS_DIR)) for loc in LOCALES}
+
+    def resolve(self, path, site, index):
+        self._load()
+        translator, prefix, inject_at, is_async, _ = site.data
+        if inject_at is not None:
+            namespace = page_namespace(path, self.root)
+            self.injections.setdefault(path, {})[inject_at] = (translator, namespace, is_async)
+        else:
+            namespace = prefix[:-1] or None  # a translator bound without a namespace takes full keys
+        key = self.catalog.lookup(site.text, namespace)
+        if key is None:
+            key = self.catalog.mint(namespace or page_namespace(path, self.root), site.text)
+            if key is None:
+                return None, 'no key-worthy words'
+            shared = index.lookup(site.text)
+            for loc in LOCALES:
+                value = self.web[loc].get(shared) if shared and loc != SOURCE_LOCALE else None
+                self.added.setdefault(loc, {})[key] = value or site.text
+        return (key[len(namespace) + 1:] if namespace else key), None
+
+    def outputs(self, refs, index):
+        """Minted keys in messages/<locale>.json."""
+        files = {}
+        for loc, flat in self.added.items():
+            path = overlay_path(self.name, loc)
+            data = json.loads(read_text(path) or '{}')
+            for key, value in flat.items():
+                set_path(data, key, value)
+            files[path] = canonical_dumps(data)
+        return files, sorted(self.added.get(SOURCE_LOCALE, ()))
+
+
+class DartBackend:
+    """Flutter Text / hintText / labelText literals; see _i18n_dart.py."""
+
+    name = 'dart'
+    unavailable = None
+    root = os.path.join('..', 'lib')
+    marker = 'Text'
+
+    def __init__(self):
+        self.arb_path = os.path.join(dart.ARB_DIR, dart.ARB_TEMPLATE)
+        arb = json.loads(read_text(self.arb_path) or '{}')
+        self.arb = {k: v for k, v in arb.items() if not k.startswith('@') and isinstance(v, str)}
+        self.arb_by_text = {}
+        for k, v in self.arb.items():
+            if '{' not in v:
+                self.arb_by_text.setdefault(normalize(v), k)
+
+    def files(self):
+        for dirpath, dirs, files in os.walk(self.root):
+            dirs[:] = sorted(d for d in dirs if d != 'l10n')  # generated localizations
+            for fname in sorted(files):
+                if dart.is_dart_file(fname) and not fname.endswith(('.g.dart', '.freezed.dart')):
+                    yield os.path.join(dirpath, fname)
+
+    def sites(self, path, text):
+        if self.marker not in text:
+            return []
+        out = []
+        for cand in dart.extract(dart.tokenize(text)):
+            skip = cand.reason
+            if skip is None and ('{' in cand.text or '}' in cand.text):
+                skip = 'braces are ICU syntax in ARB'
+            out.append(Site(path, cand.line, normalize(cand.text), cand.start, cand.end, skip, cand.const_start))
+        return out
+
+    def resolve(self, path, site, index):
+        ref = self.arb_by_text.get(site.text)
+        if ref is None:
+            key = index.key_for('mobile', site.text)
+            if key is None:
+                return None, 'no key-worthy words'
+            ref = dart.arb_key(key)
+        return ref, None
+
+    def rewrite(self, path, text, edits):
+        return dart.rewrite(text, [(dart.Candidate(s.text, None, s.line, s.start, s.end, s.data, True, None), ref)
+                                   for s, ref in edits], dart.PACKAGE)
+
+    def outputs(self, refs, index):
+        """The ARB files (_i18n_arb.py) as they will be once the sources and en.json are written."""
+        added = sorted(ref for ref in refs if ref not in self.arb)
+        if not added:
+            return {}, []
+        catalogs = {loc: flatten(load_locale(loc, TRANS_DIR)) for loc in set(arb.ARB_LOCALES.values())}
+        catalogs[SOURCE_LOCALE].update(index.added)
+        return arb.plan_files(arb.dart_refs(arb.APP_DIR) | set(refs), catalogs), added
+
+
+BACKENDS = {
+    'web': TsxBackend,
+    'client': lambda: NextIntlBackend('client'),
+    'team': lambda: NextIntlBackend('team'),
+    'ops': lambda: NextIntlBackend('ops'),
+    'dart': DartBackend,
+}
+
+
+# ── scan cache ──
+
+def _cache_path(name):
+    return os.path.join(CACHE_DIR, f'wire-{name}.json')
+
+
+def scan(backend, path_filter=None):
+    """{path: [Site]} for one backend, re-extracting only files whose size/mtime changed.
+
+    A backend with `plans` (ScopePlans) gets the stored component plans, and
+    each file entry records the fingerprints it used, so plans are kept as
+    long as some file still has that component.
+    """
+    cache_path = _cache_path(backend.name)
+    cache = json.loads(read_text(cache_path) or '{}')
+    if cache.get('version') != CACHE_VERSION:
+        cache = {'version': CACHE_VERSION, 'files': {}, 'plans': {}}
+    plans = getattr(backend, 'plans', None)
+    if plans is not None:
+        plans.plans.update(cache['plans'])
+    old, files, out = cache['files'], {}, {}
+    for path in backend.files():
+        key = norm(path)
+        st = os.stat(path)
+        entry = old.get(key)
+        if entry is None or entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            sites = backend.sites(path, text)
+            entry = [st.st_size, st.st_mtime_ns, [list(s[1:]) for s in sites], plans.seen if plans is not None else []]
+        files[key] = entry
+        if path_filter is None or path_filter in key:
+            out[path] = [Site(path, *s) for s in entry[2]]
+    kept = {}
+    if plans is not None:
+        kept = {fp: plans.plans[fp] for entry in files.values() for fp in entry[3] if fp in plans.plans}
+    if files != old or kept != cache['plans']:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_if_changed(cache_path, json.dumps({'version': CACHE_VERSION, 'files': files, 'plans': kept},
+                                                separators=(',', ':')), durable=False)
+    return out
+
+
+# ── engine ──
+
+def plan(backends, index, path_filter=None):
+    """{backend: {path: [(site, ref)]}}, skipped sites, {backend: {ref: text}} for every wireable site."""
+    edits, skipped, refs = {}, [], {}
+    for backend in backends:
+        per_file, used = {}, {}
+        for path, sites in scan(backend, path_filter).items():
+            for site in sites:
+                if site.skip:
+                    skipped.append((backend.name, site))
+                    continue
+                ref, reason = backend.resolve(path, site, index)
+                if ref is None:
+                    skipped.append((backend.name, site._replace(skip=reason)))
+                    continue
+                per_file.setdefault(path, []).append((site, ref))
+                used[ref] = site.text
+        edits[backend.name] = per_file
+        refs[backend.name] = used
+    return edits, skipped, refs
+
+
+def apply(backends, index, edits, refs, dry_run=False):
+    """Stage every rewritten source, en.json, overlay and ARB file, then write them in one transaction.
+
+    Returns ({backend: (files, strings, names added)}, paths written).
+    """
+    txn = Transaction('wire ' + ','.join(b.name for b in backends))
+    summary = {}
+    for backend in backends:
+        files = 0
+        for path, file_edits in edits[backend.name].items():
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            new_text = backend.rewrite(path, text, file_edits)
+            if new_text != text:
+                files += 1
+                txn.stage(path, new_text)
+        summary[backend.name] = (files, sum(len(e) for e in edits[backend.name].values()))
+    if index.added:
+        apply_changes({SOURCE_LOCALE: dict(index.added)}, staged=txn.staged)
+    for backend in backends:
+        files, added = backend.outputs(refs[backend.name], index)
+        txn.staged.update(files)
+        summary[backend.name] += (added,)
+    return summary, ([] if dry_run else txn.commit())
+
+
+def recover(command, force=False):
+    result = (rollback if command == 'rollback' else resume)(force=force)
+    if result is None:
+        print('no unfinished wiring run')
+        return 0
+    verb = 'restored' if command == 'rollback' else 'completed'
+    print(f"{result['label']}: {verb} {len(result['fixed'])} of {result['files']} journaled file(s)")
+    if result['conflicts']:
+        print(f"{len(result['conflicts'])} file(s) changed since the run; left alone, journal kept "
+              f'(--force overwrites them):')
+        for path in result['conflicts']:
+            print(f'  {path}')
+        return 1
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Wire hardcoded UI strings to translation keys.')
+    ap.add_argument('command', choices=['scan', 'apply', 'rollback', 'resume'])
+    ap.add_argument('--backend', default=','.join(BACKENDS), help='comma-separated backends (default: all)')
+    ap.add_argument('--path', help='only files whose path contains this')
+    ap.add_argument('--list', action='store_true', help='print every site with its key or skip reason')
+    ap.add_argument('--dry-run', action='store_true')
+    ap.add_argument('--force', action='store_true', help='rollback/resume: also overwrite files edited since the run')
+    args = ap.parse_args(argv)
+
+    if args.command in ('rollback', 'resume'):
+        return recover(args.command, args.force)
+    pending = load_journal()
+    if args.command == 'apply' and pending is not None and not args.dry_run:
+        print(f"an earlier run ({pending.get('label', '')}, {len(pending['files'])} files) did not finish; "
+              f'run `python _i18n_wire.py rollback` or `resume` first', file=sys.stderr)
+        return 1
+
+    names = [n for n in args.backend.split(',') if n]
+    unknown = [n for n in names if n not in BACKENDS]
+    if unknown:
+        ap.error(f"unknown backend(s) {', '.join(unknown)}; choose from {', '.join(BACKENDS)}")
+
+    started = time.perf_counter()
+    backends = [BACKENDS[n]() for n in names]
+    index = TextIndex(flatten(load_locale(SOURCE_LOCALE, TRANS_DIR)))
+    edits, skipped, refs = plan(backends, index, args.path)
+
+    if args.list:
+        for name, per_file in edits.items():
+            for path, file_edits in per_file.items():
+                for site, ref in file_edits:
+                    print(f'{name} {norm(path)}:{site.line}  {site.text[:50]!r} -> {ref}')
+        for name, site in skipped:
+            print(f'{name} {norm(site.path)}:{site.line}  {site.text[:50]!r} skipped: {site.skip}')
+
+    reasons = Counter((name, site.skip) for name, site in skipped)
+    for backend in backends:
+        if backend.unavailable:
+            print(f'{backend.name}: not wired, {backend.unavailable}')
+    if args.command == 'scan':
+        for backend in backends:
+            if backend.unavailable:
+                continue
+            per_file = edits[backend.name]
+            n = sum(len(e) for e in per_file.values())
+            print(f'{backend.name}: {n} wireable string(s) in {len(per_file)} file(s), '
+                  f'{len(refs[backend.name])} distinct')
+            plans = getattr(backend, 'plans', None)
+            if plans is not None and plans.hits + plans.misses:
+                print(f'  {plans.hits} of {plans.hits + plans.misses} extracted component(s) reused by fingerprint')
+            for (name, reason), count in reasons.most_common():
+                if name == backend.name:
+                    print(f'  skip {count:6d}  {reason}')
+        print(f'{len(index.added)} new catalog key(s) would be minted ({time.perf_counter() - started:.2f}s)')
+        return 0
+
+    try:
+        summary, written = apply(backends, index, edits, refs, args.dry_run)
+    except UnicodeDecodeError as e:
+        print(f'nothing written: a source is not UTF-8 ({e})', file=sys.stderr)
+        return 1
+    except JournalPending as e:
+        print(f'nothing written: {e}', file=sys.stderr)
+        return 1
+    verb = 'would wire' if args.dry_run else 'wired'
+    for name, (files, strings, added) in summary.items():
+        extra = f', {len(added)} new message(s)' if added else ''
+        print(f'{name}: {verb} {strings} string(s) in {files} file(s){extra}')
+    print(f'{len(index.added)} catalog key(s) minted, {len(written)} file(s) written in one transaction '
+          f'({time.perf_counter() - started:.2f}s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Regression tests for the wiring engine (_i18n_wire.py).
+
+Usage (from apps/Trades/web-portal):
+  python -m unittest _i18n_wire_test     # all tests: npm run i18n:test
+"""
+
+import os, unittest
+
+from _i18n_refs import PORTALS
+from _i18n_wire import SERVER_MODULE, TextIndex, TsxBackend
+
+SERVER_PAGE = """import Link from 'next/link';
+
+export default function NotFound() {
+  return (
+    <div>
+      <h1>Page Not Found</h1>
+      <Link href="/dashboard">Back to Dashboard</Link>
+    </div>
+  );
+}
+"""
+
+CLIENT_PAGE = "// Sign-in prompt\n'use client';\n\n" + SERVER_PAGE
+
+
+def wire(text, index):
+    """(rewritten text, skip reasons) for one src/app/not-found.tsx of the web portal."""
+    backend = TsxBackend('web')
+    path = os.path.join(PORTALS['web'], 'app', 'not-found.tsx')
+    edits, skipped = [], []
+    for site in backend.sites(path, text):
+        ref, reason = (None, site.skip) if site.skip else backend.resolve(path, site, index)
+        if ref is None:
+            skipped.append(reason)
+        else:
+            edits.append((site, ref))
+    return backend.rewrite(path, text, edits) if edits else text, skipped
+
+
+class ServerComponentTest(unittest.TestCase):
+    def test_sync_server_component_is_left_unchanged(self):
+        out, skipped = wire(SERVER_PAGE, TextIndex({}))
+        self.assertEqual(out, SERVER_PAGE)
+        self.assertEqual(skipped, [SERVER_MODULE, SERVER_MODULE])
+
+    def test_client_component_gets_the_hook(self):
+        out, skipped = wire(CLIENT_PAGE, TextIndex({}))
+        self.assertEqual(skipped, [])
+        self.assertIn("import { useTranslation } from '@/lib/translations';", out)
+        self.assertIn('const { t } = useTranslation();', out)
+
+
+class KeyChoiceTest(unittest.TestCase):
+    def setUp(self):
+        self.index = TextIndex({
+            'common.save': 'Save',
+            'property_preservation.back_to_dashboard': 'Back to Dashboard',
+        })
+
+    def test_other_page_keys_are_not_borrowed(self):
+        self.assertEqual(self.index.key_for('notFound', 'Back to Dashboard'), 'notFound.backToDashboard')
+
+    def test_common_and_own_keys_are_reused(self):
+        self.assertEqual(self.index.key_for('jobs', 'Save'), 'common.save')
+        self.assertEqual(self.index.key_for('property_preservation', 'Back to Dashboard'),
+                         'property_preservation.back_to_dashboard')
+
+
+if __name__ == '__main__':
+    unittest.main()
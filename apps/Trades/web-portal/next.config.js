@@ -53,6 +53,20 @@ const nextConfig = {
           { key: 'Pragma', value: 'no-cache' },
         ],
       },
+      {
+        // Compiled locale bundles (npm run i18n:build) carry a content hash in the filename
+        source: '/locales/:path*',
+        headers: [
+          { key: 'Cache-Control', value: 'public, max-age=31536000, immutable' },
+        ],
+      },
+      {
+        // ...except the manifests that point at them, which must always revalidate
+        source: '/locales/:file(manifest\\.json|routes\\.json)',
+        headers: [
+          { key: 'Cache-Control', value: 'public, max-age=0, must-revalidate' },
+        ],
+      },
     ];
   },
 }
@@ -0,0 +1,33 @@
+import { describe, it, expect } from 'vitest';
+import { defaultLocale, isPseudoLocale, localeDir, toRuntimeLocale } from '@/lib/i18n-config';
+
+describe('toRuntimeLocale', () => {
+  it('accepts shipped locales and pseudo-locales', () => {
+    expect(toRuntimeLocale('es')).toBe('es');
+    expect(toRuntimeLocale('pt-BR')).toBe('pt-BR');
+    expect(toRuntimeLocale('en-XA')).toBe('en-XA');
+    expect(toRuntimeLocale('ar-XB')).toBe('ar-XB');
+  });
+
+  it('falls back to the default for anything else', () => {
+    expect(toRuntimeLocale('fr')).toBe(defaultLocale);
+    expect(toRuntimeLocale('')).toBe(defaultLocale);
+    expect(toRuntimeLocale(undefined)).toBe(defaultLocale);
+  });
+});
+
+describe('isPseudoLocale', () => {
+  it('only matches the pseudo-locales', () => {
+    expect(isPseudoLocale('en-XA')).toBe(true);
+    expect(isPseudoLocale('en')).toBe(false);
+    expect(isPseudoLocale(undefined)).toBe(false);
+  });
+});
+
+describe('localeDir', () => {
+  it('is rtl for ar-XB only', () => {
+    expect(localeDir('ar-XB')).toBe('rtl');
+    expect(localeDir('en-XA')).toBe('ltr');
+    expect(localeDir('en')).toBe('ltr');
+  });
+});
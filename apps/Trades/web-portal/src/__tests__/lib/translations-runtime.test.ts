@@ -0,0 +1,150 @@
+import { describe, it, expect } from 'vitest';
+import {
+  applyDelta,
+  compileTemplate,
+  flattenDict,
+  format,
+  interpolate,
+  lookup,
+  matchRoute,
+  resolve,
+  routeNamespaces,
+  withFallback,
+  type BundleManifest,
+  type RouteManifest,
+} from '@/lib/translations/runtime';
+
+const en = {
+  common: { save: 'Save', cancel: 'Cancel' },
+  books: { cashBalance: 'Cash Balance', reports: { title: 'Reports' } },
+};
+
+const es = {
+  common: { save: 'Guardar', cancel: '' },
+};
+
+describe('translations runtime', () => {
+  describe('flattenDict', () => {
+    it('turns nested namespaces into dot keys', () => {
+      expect(flattenDict(en)).toEqual({
+        'common.save': 'Save',
+        'common.cancel': 'Cancel',
+        'books.cashBalance': 'Cash Balance',
+        'books.reports.title': 'Reports',
+      });
+    });
+  });
+
+  describe('withFallback + lookup', () => {
+    const dict = withFallback(flattenDict(es), flattenDict(en));
+
+    it('prefers the locale value', () => {
+      expect(lookup(dict, 'common.save')).toBe('Guardar');
+    });
+
+    it('falls back to English for missing and empty values', () => {
+      expect(lookup(dict, 'books.reports.title')).toBe('Reports');
+      expect(lookup(dict, 'common.cancel')).toBe('Cancel');
+    });
+
+    it('falls back to the key itself', () => {
+      expect(lookup(dict, 'books.missing')).toBe('books.missing');
+    });
+
+    it('agrees with the nested resolve() for every English key', () => {
+      for (const key of Object.keys(flattenDict(en))) {
+        expect(lookup(dict, key)).toBe(resolve(es, key) || resolve(en, key));
+      }
+    });
+  });
+
+  describe('applyDelta', () => {
+    it('rebuilds the full locale map from English plus the differing entries', () => {
+      const base = flattenDict(en);
+      const delta = { 'common.save': 'Guardar' };
+      const full = applyDelta(base, delta);
+      expect(full['common.save']).toBe('Guardar');
+      expect(full['books.reports.title']).toBe('Reports');
+      expect(Object.keys(full)).toHaveLength(Object.keys(base).length);
+    });
+
+    it('matches the merged bundle it replaces', () => {
+      const merged = withFallback(flattenDict(es), flattenDict(en));
+      const base = flattenDict(en);
+      const delta = Object.fromEntries(Object.entries(merged).filter(([k, v]) => base[k] !== v));
+      expect(applyDelta(base, delta)).toEqual(merged);
+    });
+  });
+
+  describe('interpolate', () => {
+    it('replaces known params and keeps unknown placeholders', () => {
+      expect(interpolate('{count} of {total}', { count: 3 })).toBe('3 of {total}');
+    });
+  });
+
+  describe('compileTemplate + format', () => {
+    it('keeps strings without placeholders as strings', () => {
+      expect(compileTemplate('Cash Balance')).toBe('Cash Balance');
+    });
+
+    it('splits placeholders into literal/param tokens', () => {
+      expect(compileTemplate('{count} of {total}')).toEqual(['', 'count', ' of ', 'total', '']);
+    });
+
+    it('matches interpolate() output', () => {
+      const samples = ['Hi {name}!', '{a}{b}', 'No params', '{count} of {total} hours'];
+      const params = { name: 'Ana', a: 1, count: 2 };
+      for (const s of samples) {
+        expect(format(compileTemplate(s), params)).toBe(interpolate(s, params));
+        expect(format(compileTemplate(s))).toBe(interpolate(s));
+      }
+    });
+  });
+
+  describe('matchRoute + routeNamespaces', () => {
+    const entry = (keys: string[]) => ({ files: 1, namespaces: keys.map(k => k.split('.')[0]), keys });
+    const manifest: RouteManifest = {
+      version: 1,
+      routes: {
+        '/dashboard': entry(['nav.dashboard']),
+        '/dashboard/jobs/[id]': entry(['jobs.detail']),
+        '/dashboard/jobs/new': entry(['jobs.create']),
+        '/docs/[...slug]': entry(['docs.page']),
+      },
+    };
+
+    it('matches static, dynamic and catch-all segments', () => {
+      expect(matchRoute(manifest, '/dashboard')?.keys).toEqual(['nav.dashboard']);
+      expect(matchRoute(manifest, '/dashboard/jobs/42')?.keys).toEqual(['jobs.detail']);
+      expect(matchRoute(manifest, '/docs/a/b')?.keys).toEqual(['docs.page']);
+      expect(matchRoute(manifest, '/docs')).toBeUndefined();
+      expect(matchRoute(manifest, '/dashboard/jobs/42/edit')).toBeUndefined();
+    });
+
+    it('prefers static segments over dynamic ones', () => {
+      expect(matchRoute(manifest, '/dashboard/jobs/new')?.keys).toEqual(['jobs.create']);
+    });
+
+    const chunk = { path: 'x.json', bytes: 1, keys: 1 };
+    const bundles: BundleManifest = {
+      version: 4,
+      format: 'delta',
+      defaultLocale: 'en',
+      locales: ['en', 'es'],
+      bundles: { en: chunk, es: chunk },
+      namespaces: { nav: { en: chunk, es: chunk }, jobs: { en: chunk, es: chunk } },
+    };
+
+    it('loads only the namespaces of the matched route', () => {
+      expect(routeNamespaces(manifest, bundles, 'es', '/dashboard')).toEqual(['nav']);
+      expect(routeNamespaces(manifest, bundles, 'es', '/dashboard/jobs/7')).toEqual(['jobs']);
+    });
+
+    it('falls back to the whole bundle when a route, locale or chunk is unknown', () => {
+      expect(routeNamespaces(manifest, bundles, 'es', '/nowhere')).toBeUndefined();
+      expect(routeNamespaces(null, bundles, 'es', '/dashboard')).toBeUndefined();
+      expect(routeNamespaces(manifest, bundles, 'ko', '/dashboard')).toBeUndefined();
+      expect(routeNamespaces(manifest, bundles, 'es', '/docs/a')).toBeUndefined();
+    });
+  });
+});
@@ -340,7 +340,7 @@ export default function AutomationsPage() {
           <Card>
             <CardContent className="p-12 text-center">
               <Zap size={48} className="mx-auto text-muted mb-4" />
-              <h3 className="text-lg font-medium text-main mb-2">{t('automations.noRecords')}</h3>
+              <h3 className="text-lg font-medium text-main mb-2">{t('automations.noAutomations')}</h3>
               <p className="text-muted mb-4">{t('automations.createWorkflowAutomationsToSaveTimeOnRepetitiveTas')}</p>
               <Button onClick={() => setShowNewModal(true)}><Plus size={16} />{t('common.newAutomation')}</Button>
             </CardContent>
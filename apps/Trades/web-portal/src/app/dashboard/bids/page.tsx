@@ -445,7 +445,7 @@ export default function BidsPage() {
             {filteredBids.length === 0 ? (
               <div className="py-12 text-center text-muted">
                 <FileText size={40} className="mx-auto mb-2 opacity-50" />
-                <p>{t('bids.noRecords')}</p>
+                <p>{t('bids.noBids')}</p>
               </div>
             ) : (
               <>
@@ -233,7 +233,7 @@ function OrdersTab({ filteredCOs, search, setSearch, statusFilter, setStatusFilt
         {filteredCOs.length === 0 && (
           <Card><CardContent className="p-12 text-center">
             <FileDiff size={48} className="mx-auto text-muted mb-4" />
-            <h3 className="text-lg font-medium text-main mb-2">{t('common.noChangeOrdersFound')}</h3>
+            <h3 className="text-lg font-medium text-main mb-2">{t('changeOrders.noChangeOrders')}</h3>
             <p className="text-muted mb-4">Change orders track scope modifications, cost adjustments, and customer approvals.</p>
             <Button onClick={onNewCO}><Plus size={16} />{t('common.newChangeOrder')}</Button>
           </CardContent></Card>
@@ -326,7 +326,7 @@ export default function DocumentsPage() {
             <Card>
               <CardContent className="py-12 text-center">
                 <FileText size={40} className="mx-auto mb-2 opacity-50 text-muted" />
-                <p className="text-muted">{t('documents.noRecords')}</p>
+                <p className="text-muted">{t('documents.noDocumentsFound')}</p>
                 <Button variant="secondary" className="mt-4" onClick={() => setShowUploadModal(true)}>
                   <Upload size={16} />
                   Upload First Document
@@ -284,7 +284,7 @@ function LogsTab({
         {filtered.length === 0 && (
           <CardContent className="p-12 text-center">
             <Wind size={48} className="mx-auto text-muted mb-4" />
-            <h3 className="text-lg font-medium text-main mb-2">{t('dryingLogs.noRecords')}</h3>
+            <h3 className="text-lg font-medium text-main mb-2">{t('dryingLogs.noLogs')}</h3>
             <p className="text-muted mb-4">Start documenting drying progress with setup logs, daily readings, and equipment changes.</p>
             <Button onClick={() => setShowAddModal(true)}>
               <Plus size={16} />Add Entry
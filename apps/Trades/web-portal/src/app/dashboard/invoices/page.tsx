@@ -236,7 +236,7 @@ export default function InvoicesPage() {
           {filteredInvoices.length === 0 ? (
             <div className="py-12 text-center text-muted">
               <Receipt size={40} className="mx-auto mb-2 opacity-50" />
-              <p>{t('invoices.noRecords')}</p>
+              <p>{t('invoices.noInvoices')}</p>
             </div>
           ) : (
             <div className="overflow-x-auto">
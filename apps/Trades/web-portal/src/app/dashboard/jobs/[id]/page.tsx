@@ -1890,7 +1890,7 @@ function InvoicesTab({ jobId }: { jobId: string }) {
         {jobInvoices.length === 0 ? (
           <div className="text-center py-8">
             <Receipt size={32} className="mx-auto text-muted mb-2" />
-            <p className="text-sm text-muted">{t('invoices.noRecords')}</p>
+            <p className="text-sm text-muted">{t('invoices.noInvoices')}</p>
           </div>
         ) : (
           <div className="space-y-2">
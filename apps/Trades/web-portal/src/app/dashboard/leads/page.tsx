@@ -510,7 +510,7 @@ export default function LeadsPage() {
               <tbody>
                 {filteredLeads.length === 0 && (
                   <tr><td colSpan={8} className="px-6 py-16 text-center">
-                    <p className="text-sm font-medium text-main">{t('leads.noRecords')}</p>
+                    <p className="text-sm font-medium text-main">{t('leads.noLeads')}</p>
                     <p className="text-xs text-muted mt-1">{t('leads.addYourFirstLeadOrAdjustYourFilters')}</p>
                   </td></tr>
                 )}
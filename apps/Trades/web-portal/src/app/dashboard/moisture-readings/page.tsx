@@ -258,7 +258,7 @@ export default function MoistureReadingsPage() {
         {filtered.length === 0 && (
           <CardContent className="p-12 text-center">
             <Droplets size={48} className="mx-auto text-muted mb-4" />
-            <h3 className="text-lg font-medium text-main mb-2">{t('moistureReadings.noRecords')}</h3>
+            <h3 className="text-lg font-medium text-main mb-2">{t('moistureReadings.noReadings')}</h3>
             <p className="text-muted mb-4">{t('moistureReadings.startLoggingDesc')}</p>
             <Button onClick={() => setShowAddModal(true)}>
               <Plus size={16} />Add Reading
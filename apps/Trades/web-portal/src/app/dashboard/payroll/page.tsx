@@ -324,7 +324,7 @@ function PayPeriodsTab({
           {periods.length === 0 ? (
             <div className="py-12 text-center text-muted">
               <FileText size={40} className="mx-auto mb-2 opacity-50" />
-              <p>{t('payroll.noRecords')}</p>
+              <p>{t('payroll.noPayroll')}</p>
             </div>
           ) : (
             <div className="divide-y divide-main">
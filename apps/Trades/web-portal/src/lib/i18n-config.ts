@@ -4,6 +4,32 @@ export const locales = ['en', 'es', 'pt-BR', 'pl', 'zh', 'ht', 'ru', 'ko', 'vi',
 export type Locale = (typeof locales)[number];
 export const defaultLocale: Locale = 'en';
 
+// Pseudo-locales for layout/render stress tests, generated from English and
+// compiled by `npm run i18n:pseudo` (must match PSEUDO_LOCALES in _i18n_catalog.py).
+// Never offered in the language picker; set the NEXT_LOCALE cookie to one and
+// useTranslation() loads it like any other locale. ar-XB also switches the
+// document to dir="rtl".
+export const pseudoLocales = ['en-XA', 'ar-XB'] as const;
+export type PseudoLocale = (typeof pseudoLocales)[number];
+// Every locale useTranslation() can run in
+export type RuntimeLocale = Locale | PseudoLocale;
+
+const rtlLocales: readonly RuntimeLocale[] = ['ar-XB'];
+
+export function isPseudoLocale(value: string | null | undefined): value is PseudoLocale {
+  return (pseudoLocales as readonly string[]).includes(value ?? '');
+}
+
+// NEXT_LOCALE cookie value -> a locale we ship (or can generate), else the default
+export function toRuntimeLocale(value: string | null | undefined): RuntimeLocale {
+  if (isPseudoLocale(value)) return value;
+  return (locales as readonly string[]).includes(value ?? '') ? (value as Locale) : defaultLocale;
+}
+
+export function localeDir(locale: RuntimeLocale): 'ltr' | 'rtl' {
+  return rtlLocales.includes(locale) ? 'rtl' : 'ltr';
+}
+
 export const localeNames: Record<Locale, string> = {
   en: 'English',
   es: 'Espa\u00f1ol',
@@ -1,103 +1,181 @@
 'use client';
 
 import { useState, useEffect, useCallback, useMemo } from 'react';
-import type { Locale } from '@/lib/i18n-config';
-import { defaultLocale } from '@/lib/i18n-config';
+import { usePathname } from 'next/navigation';
+import type { Locale, RuntimeLocale } from '@/lib/i18n-config';
+import { defaultLocale, localeDir, toRuntimeLocale } from '@/lib/i18n-config';
+
+import {
+  type BundleManifest,
+  type FlatDict,
+  type RouteManifest,
+  type TranslationDict,
+  COMPILED_TEMPLATES_VERSION,
+  applyDelta,
+  compileDict,
+  flattenDict,
+  format,
+  lookup,
+  routeNamespaces,
+  withFallback,
+} from './runtime';
+
+// ── Compiled bundles (public/locales, built by `npm run i18n:build`) ──
+const BUNDLE_BASE = '/locales/';
+
+// ── Cache loaded dictionaries in memory (one flat dict per locale, English merged in) ──
+const dictCache: Partial<Record<RuntimeLocale, Promise<FlatDict>>> = {};
+// ── Namespace chunks, keyed "<locale>/<namespace>" ──
+const chunkCache: Record<string, Promise<FlatDict | null>> = {};
+let manifestPromise: Promise<BundleManifest | null> | null = null;
+let routesPromise: Promise<RouteManifest | null> | null = null;
+
+// Bundles are content-hashed and cached forever; only manifest.json and routes.json are revalidated
+function fetchFresh<T>(name: string): Promise<T | null> {
+  return fetch(`${BUNDLE_BASE}${name}`, { cache: 'no-cache' })
+    .then(res => (res.ok ? (res.json() as Promise<T>) : null))
+    .catch(() => null);
+}
 
-// ── Translation dictionary type ──
-// Nested object with string leaves: { nav: { dashboard: "Dashboard" } }
-type TranslationDict = Record<string, any>;
+function loadManifest(): Promise<BundleManifest | null> {
+  if (!manifestPromise) manifestPromise = fetchFresh<BundleManifest>('manifest.json');
+  return manifestPromise;
+}
 
-// ── Cache loaded dictionaries in memory ──
-const dictCache: Partial<Record<Locale, TranslationDict>> = {};
+function loadRoutes(): Promise<RouteManifest | null> {
+  if (!routesPromise) routesPromise = fetchFresh<RouteManifest>('routes.json');
+  return routesPromise;
+}
 
-// ── Load a locale dictionary ──
-async function loadDict(locale: Locale): Promise<TranslationDict> {
-  if (dictCache[locale]) return dictCache[locale]!;
+async function fetchFlat(manifest: BundleManifest, path: string): Promise<FlatDict | null> {
   try {
-    const mod = await import(`./${locale}.json`);
-    const dict = mod.default || mod;
-    dictCache[locale] = dict;
-    return dict;
+    const res = await fetch(`${BUNDLE_BASE}${path}`);
+    if (!res.ok) return null;
+    const raw = await res.json();
+    return manifest.version >= COMPILED_TEMPLATES_VERSION ? (raw as FlatDict) : compileDict(raw);
+  } catch {
+    return null;
+  }
+}
+
+async function fetchBundle(locale: RuntimeLocale): Promise<FlatDict | null> {
+  const manifest = await loadManifest();
+  const entry = manifest?.bundles[locale] ?? manifest?.bundles[defaultLocale];
+  if (!manifest || !entry) return null;
+  const dict = await fetchFlat(manifest, entry.path);
+  if (!dict) return null;
+  // Delta bundles only carry what differs from English: fold them over the English bundle
+  if (manifest.format === 'delta' && entry !== manifest.bundles[defaultLocale]) {
+    return applyDelta(await loadDict(defaultLocale), dict);
+  }
+  return dict;
+}
+
+// ── One namespace chunk; delta chunks are folded over the English chunk like bundles ──
+function loadChunk(manifest: BundleManifest, locale: RuntimeLocale, ns: string): Promise<FlatDict | null> {
+  const id = `${locale}/${ns}`;
+  if (!chunkCache[id]) {
+    chunkCache[id] = fetchFlat(manifest, manifest.namespaces[ns][locale].path).then(async dict => {
+      if (!dict || manifest.format !== 'delta' || locale === defaultLocale) return dict;
+      const base = await loadChunk(manifest, defaultLocale, ns);
+      return base && applyDelta(base, dict);
+    });
+  }
+  return chunkCache[id];
+}
+
+// ── What one page needs: its route's namespace chunks, else the whole bundle ──
+async function loadRouteDict(locale: RuntimeLocale, pathname: string | null): Promise<FlatDict> {
+  if (dictCache[locale] || pathname === null) return loadDict(locale);
+  const [manifest, routes] = await Promise.all([loadManifest(), loadRoutes()]);
+  const namespaces = manifest ? routeNamespaces(routes, manifest, locale, pathname) : undefined;
+  if (!manifest || !namespaces) return loadDict(locale);
+  const chunks = await Promise.all(namespaces.map(ns => loadChunk(manifest, locale, ns)));
+  if (chunks.some(chunk => chunk === null)) return loadDict(locale);
+  return Object.assign({}, ...chunks) as FlatDict;
+}
+
+// ── Fallback when bundles are not built: nested catalog, flattened and compiled once ──
+// Pseudo catalogs on disk stay out of the build; they only ship as `i18n:pseudo` bundles.
+async function importNested(locale: RuntimeLocale): Promise<TranslationDict> {
+  try {
+    const mod = await import(/* webpackExclude: /-X[A-Z]\.json$/ */ `./${locale}.json`);
+    return mod.default || mod;
   } catch {
-    // Fallback to English if locale file doesn't exist
-    if (locale !== 'en') {
-      return loadDict('en' as Locale);
-    }
     return {};
   }
 }
 
-// ── Resolve a dot-path key from nested dict ──
-// e.g. t('nav.dashboard') → dict.nav.dashboard
-function resolve(dict: TranslationDict, key: string): string | undefined {
-  const parts = key.split('.');
-  let node: any = dict;
-  for (const part of parts) {
-    if (node == null || typeof node !== 'object') return undefined;
-    node = node[part];
+async function buildFromCatalog(locale: RuntimeLocale): Promise<FlatDict> {
+  const [dict, en] = await Promise.all([
+    importNested(locale),
+    locale === defaultLocale ? Promise.resolve({}) : importNested(defaultLocale),
+  ]);
+  return compileDict(withFallback(flattenDict(dict), flattenDict(en)));
+}
+
+// ── Load a locale dictionary ──
+function loadDict(locale: RuntimeLocale): Promise<FlatDict> {
+  if (!dictCache[locale]) {
+    dictCache[locale] = fetchBundle(locale).then(dict => dict ?? buildFromCatalog(locale));
   }
-  return typeof node === 'string' ? node : undefined;
+  return dictCache[locale]!;
 }
 
-// ── Read locale from cookie ──
-function getLocaleFromCookie(): Locale {
+// ── Read locale from cookie; unknown values fall back to the default ──
+function getLocaleFromCookie(): RuntimeLocale {
   if (typeof document === 'undefined') return defaultLocale;
   const match = document.cookie.split('; ').find(c => c.startsWith('NEXT_LOCALE='));
-  const val = match?.split('=')[1];
-  return (val as Locale) || defaultLocale;
+  return toRuntimeLocale(match?.split('=')[1]);
 }
 
-// ── Interpolation: replace {name} placeholders ──
-function interpolate(str: string, params?: Record<string, string | number>): string {
-  if (!params) return str;
-  return str.replace(/\{(\w+)\}/g, (_, key) => {
-    const val = params[key];
-    return val != null ? String(val) : `{${key}}`;
-  });
+// ── Text direction follows the locale (ar-XB stress-tests RTL layout) ──
+function applyDir(locale: RuntimeLocale) {
+  const dir = localeDir(locale);
+  if (document.documentElement.dir !== dir) document.documentElement.dir = dir;
 }
 
 // ── Main hook ──
 export function useTranslation() {
-  const [locale, setLocale] = useState<Locale>(defaultLocale);
-  const [dict, setDict] = useState<TranslationDict>({});
-  const [enDict, setEnDict] = useState<TranslationDict>({});
+  const pathname = usePathname();
+  const [locale, setLocale] = useState<RuntimeLocale>(defaultLocale);
+  const [dict, setDict] = useState<FlatDict>({});
   const [ready, setReady] = useState(false);
 
-  // Read locale from cookie on mount
+  // Read locale from cookie on mount; load the current route's chunks (again on navigation)
   useEffect(() => {
+    let current = true;
     const loc = getLocaleFromCookie();
     setLocale(loc);
+    applyDir(loc);
 
-    // Always load English as fallback
-    Promise.all([loadDict(loc), loadDict('en' as Locale)]).then(([locDict, en]) => {
+    loadRouteDict(loc, pathname).then(locDict => {
+      if (!current) return;
       setDict(locDict);
-      setEnDict(en);
       setReady(true);
     });
-  }, []);
+    return () => {
+      current = false;
+    };
+  }, [pathname]);
 
   // Listen for locale changes (from settings page)
   useEffect(() => {
     const handler = () => {
       const loc = getLocaleFromCookie();
       setLocale(loc);
-      Promise.all([loadDict(loc), loadDict('en' as Locale)]).then(([locDict, en]) => {
-        setDict(locDict);
-        setEnDict(en);
-      });
+      applyDir(loc);
+      loadRouteDict(loc, pathname).then(setDict);
     };
     window.addEventListener('localeChange', handler);
     return () => window.removeEventListener('localeChange', handler);
-  }, []);
+  }, [pathname]);
 
-  // t() function: resolve key, fallback to English, fallback to key itself
+  // t() function: one lookup in the merged dict (English already folded in), fallback to key itself
   const t = useCallback(
-    (key: string, params?: Record<string, string | number>): string => {
-      const val = resolve(dict, key) || resolve(enDict, key) || key;
-      return interpolate(val, params);
-    },
-    [dict, enDict]
+    (key: string, params?: Record<string, string | number>): string =>
+      format(lookup(dict, key), params),
+    [dict]
   );
 
   // ── Intl formatters (locale-aware) ──
@@ -0,0 +1,182 @@
+// Translation runtime helpers — plain functions, no React.
+// Used by the useTranslation hook (./index.ts) and by the lookup benchmarks.
+//
+// Dictionaries come in two shapes:
+//   nested catalog (src/lib/translations/<locale>.json): { nav: { dashboard: "Dashboard" } }
+//   compiled bundle (public/locales/<locale>.json):      { "nav.dashboard": "Dashboard" }
+// Compiled bundles are produced by `npm run i18n:build` (_i18n_bundles.py).
+// From manifest version 4 ("format": "delta") a non-English bundle only holds
+// entries that differ from English; applyDelta() folds it over the English
+// bundle once per load, so a lookup is still one property access.
+// When public/locales/routes.json has an entry for the current page, the hook
+// loads only that route's namespace chunks (routeNamespaces()) instead of
+// the whole bundle.
+//
+// Compiled values are either a plain string or, when the text has {placeholders},
+// a token array alternating literal and param name: "Hi {name}!" → ["Hi ", "name", "!"].
+
+export type TranslationDict = Record<string, any>;
+export type CompiledValue = string | string[];
+export type FlatDict = Record<string, CompiledValue>;
+
+// First manifest version whose bundles carry pre-compiled templates
+export const COMPILED_TEMPLATES_VERSION = 3;
+// First manifest version whose non-English bundles are deltas against English
+export const DELTA_BUNDLES_VERSION = 4;
+
+export interface BundleEntry {
+  path: string; // content-hashed, relative to /locales/
+  bytes: number;
+  gzip?: number;
+  keys: number;
+}
+
+export interface BundleManifest {
+  version: number;
+  format: 'flat' | 'delta';
+  shaken?: boolean; // unreferenced keys dropped (`_i18n_bundles.py --shake`)
+  defaultLocale: string;
+  locales: string[];
+  bundles: Record<string, BundleEntry>;
+  namespaces: Record<string, Record<string, BundleEntry>>;
+}
+
+// public/locales/routes.json (_i18n_routes.py): keys each page can render
+export interface RouteEntry {
+  files: number;
+  namespaces: string[];
+  keys: string[];
+}
+
+export interface RouteManifest {
+  version: number;
+  routes: Record<string, RouteEntry>;
+}
+
+// ── Resolve a dot-path key from a nested dict (legacy lookup) ──
+// e.g. resolve(dict, 'nav.dashboard') → dict.nav.dashboard
+export function resolve(dict: TranslationDict, key: string): string | undefined {
+  const parts = key.split('.');
+  let node: any = dict;
+  for (const part of parts) {
+    if (node == null || typeof node !== 'object') return undefined;
+    node = node[part];
+  }
+  return typeof node === 'string' ? node : undefined;
+}
+
+// ── Flatten a nested catalog into dot keys (done once per load, not per lookup) ──
+export function flattenDict(
+  dict: TranslationDict,
+  prefix = '',
+  out: Record<string, string> = {},
+): Record<string, string> {
+  for (const k of Object.keys(dict)) {
+    const v = dict[k];
+    if (v != null && typeof v === 'object') flattenDict(v, `${prefix}${k}.`, out);
+    else if (typeof v === 'string') out[`${prefix}${k}`] = v;
+  }
+  return out;
+}
+
+// ── Merge English under a locale so misses never need a second dictionary ──
+// Empty strings count as untranslated, same as the old `resolve(dict) || resolve(enDict)`.
+export function withFallback(
+  dict: Record<string, string>,
+  fallback: Record<string, string>,
+): Record<string, string> {
+  const out = { ...fallback };
+  for (const k of Object.keys(dict)) {
+    if (dict[k]) out[k] = dict[k];
+  }
+  return out;
+}
+
+// ── Rebuild a full locale map from the English bundle and a delta bundle ──
+export function applyDelta(base: FlatDict, delta: FlatDict): FlatDict {
+  return { ...base, ...delta };
+}
+
+// ── Flat lookup: fallback to the key itself ──
+export function lookup(dict: FlatDict, key: string): CompiledValue {
+  return dict[key] ?? key;
+}
+
+// ── Template compilation (bundles arrive pre-compiled; catalogs are compiled once at load) ──
+const PLACEHOLDER = /\{(\w+)\}/;
+
+export function compileTemplate(str: string): CompiledValue {
+  const parts = str.split(PLACEHOLDER);
+  return parts.length === 1 ? str : parts;
+}
+
+export function compileDict(dict: Record<string, string>): FlatDict {
+  const out: FlatDict = {};
+  for (const k of Object.keys(dict)) out[k] = compileTemplate(dict[k]);
+  return out;
+}
+
+// ── Format a compiled value: plain strings are returned untouched, no regex per call ──
+export function format(value: CompiledValue, params?: Record<string, string | number>): string {
+  if (typeof value === 'string') return value;
+  let out = value[0];
+  for (let i = 1; i < value.length; i += 2) {
+    const val = params?.[value[i]];
+    out += (val != null ? String(val) : `{${value[i]}}`) + value[i + 1];
+  }
+  return out;
+}
+
+// ── Interpolation: replace {name} placeholders (uncompiled strings) ──
+export function interpolate(str: string, params?: Record<string, string | number>): string {
+  if (!params) return str;
+  return str.replace(/\{(\w+)\}/g, (_, key) => {
+    const val = params[key];
+    return val != null ? String(val) : `{${key}}`;
+  });
+}
+
+// ── Route matching: which entry of routes.json a page is ──
+// Patterns use Next.js segments: /dashboard/jobs/[id], /docs/[...slug], /x/[[...slug]].
+// Static segments beat dynamic ones, so /dashboard/jobs/new wins over /dashboard/jobs/[id].
+function segmentScore(pattern: string[], path: string[]): number {
+  let score = 0;
+  for (let i = 0; i < pattern.length; i++) {
+    const seg = pattern[i];
+    if (seg.startsWith('[[...')) return i <= path.length ? score : -1;
+    if (seg.startsWith('[...')) return i < path.length ? score : -1;
+    if (i >= path.length) return -1;
+    if (seg.startsWith('[')) continue;
+    if (seg !== path[i]) return -1;
+    score += 1;
+  }
+  return pattern.length === path.length ? score : -1;
+}
+
+export function matchRoute(manifest: RouteManifest, pathname: string): RouteEntry | undefined {
+  const path = pathname.split('/').filter(Boolean);
+  let best: RouteEntry | undefined;
+  let bestScore = -1;
+  for (const pattern of Object.keys(manifest.routes)) {
+    const score = segmentScore(pattern.split('/').filter(Boolean), path);
+    if (score > bestScore) {
+      best = manifest.routes[pattern];
+      bestScore = score;
+    }
+  }
+  return best;
+}
+
+// ── Namespace chunks to load for a page; undefined = load the whole bundle ──
+// Falls back when the route is unknown, the locale has no chunks, or a
+// namespace the route needs has no chunk (older manifest, shaken away).
+export function routeNamespaces(
+  routes: RouteManifest | null,
+  manifest: BundleManifest,
+  locale: string,
+  pathname: string,
+): string[] | undefined {
+  const entry = routes ? matchRoute(routes, pathname) : undefined;
+  if (!entry || !manifest.locales.includes(locale)) return undefined;
+  return entry.namespaces.every(ns => manifest.namespaces[ns]?.[locale]) ? entry.namespaces : undefined;
+}
@@ -8,6 +8,7 @@
 
 import { createServerClient } from '@supabase/ssr';
 import { NextResponse, type NextRequest } from 'next/server';
+import { isPseudoLocale } from '@/lib/i18n-config';
 
 const CRM_ALLOWED_ROLES = ['owner', 'admin', 'office_manager', 'cpa', 'super_admin'];
 
@@ -101,7 +102,8 @@ export async function middleware(request: NextRequest) {
       // Role is valid — set locale cookie from user preference
       const userLocale = profile.preferred_locale || 'en';
       const currentLocale = request.cookies.get('NEXT_LOCALE')?.value;
-      if (userLocale !== currentLocale) {
+      // A pseudo-locale (en-XA, ar-XB) is set by hand for testing: leave it in place
+      if (userLocale !== currentLocale && !isPseudoLocale(currentLocale)) {
         supabaseResponse.cookies.set('NEXT_LOCALE', userLocale, {
           path: '/',
           maxAge: 60 * 60 * 24 * 365,
@@ -124,7 +126,7 @@ export async function middleware(request: NextRequest) {
 
 export const config = {
   matcher: [
-    // Match all routes except static files and API routes.
-    '/((?!_next/static|_next/image|favicon.ico|.*\\.(?:svg|png|jpg|jpeg|gif|webp)$).*)',
+    // Match all routes except static files, compiled locale bundles and API routes.
+    '/((?!_next/static|_next/image|favicon.ico|locales/|.*\\.(?:svg|png|jpg|jpeg|gif|webp)$).*)',
   ],
 };